@@ -3,8 +3,9 @@ Main Application
 """
 from flask import Flask
 from config import Config
+from models import RecordModel, CommentModel, job_runner
 # Import blueprints
-from routes import auth_bp, record_bp, comment_bp, report_bp
+from routes import auth_bp, record_bp, comment_bp, report_bp, job_bp
 
 
 def create_app():
@@ -19,6 +20,14 @@ def create_app():
     app.register_blueprint(record_bp)
     app.register_blueprint(comment_bp)
     app.register_blueprint(report_bp)
+    app.register_blueprint(job_bp)
+
+    # Indexes used by record listings, comment listing and cascading deletes
+    RecordModel().ensure_indexes()
+    CommentModel().ensure_indexes()
+
+    # Start background job workers
+    job_runner.start()
 
     return app
 
@@ -2,6 +2,7 @@
 Application configuration
 """
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,3 +14,11 @@ class Config:
     MONGODB_URI = os.getenv('MONGODB_URI')
     DEBUG = True
 
+    # Session cookie is not sent with cross-site POSTs (e.g. to /export-report)
+    SESSION_COOKIE_SAMESITE = 'Lax'
+
+    # Background PDF export
+    REPORT_CACHE_DIR = os.getenv('REPORT_CACHE_DIR',
+                                 os.path.join(tempfile.gettempdir(), 'smart_records_reports'))
+    PDF_MAX_PENDING = int(os.getenv('PDF_MAX_PENDING', '8'))
+
@@ -2,8 +2,16 @@
 Models package initialization
 """
 from .database import Database
+from .ids import to_object_id, id_filter, ids_filter
+from .values import Record, Comment
 from .user_model import UserModel
 from .record_model import RecordModel
 from .comment_model import CommentModel
+from .singleflight import SingleFlight, flights, coalesce
+from .job_runner import JobRunner, job_runner
 
-__all__ = ['Database', 'UserModel', 'RecordModel', 'CommentModel']
+__all__ = ['Database', 'to_object_id', 'id_filter', 'ids_filter',
+           'Record', 'Comment',
+           'UserModel', 'RecordModel', 'CommentModel',
+           'SingleFlight', 'flights', 'coalesce',
+           'JobRunner', 'job_runner']
@@ -1,18 +1,47 @@
 """
 Comment model for managing comments on records
 """
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime
 from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
 from .database import Database
+from .ids import id_filter, ids_filter, to_object_id
+from .job_runner import job_runner
+from .pagination import keyset_filter, sort_values, key_types, encode_cursor, decode_cursor
+from .singleflight import coalesce
+from .values import Comment
 
 
 class CommentModel:
 
+    # Newest first; _id breaks ties between comments posted in the same millisecond
+    THREAD_SORT = [('created_at', DESCENDING), ('_id', DESCENDING)]
+
+    # Comments per page of a thread
+    PAGE_SIZE = 20
+
+    # Order comments are read in by clients syncing changes (see list_changed_comments)
+    SYNC_SORT = [('updated_at', ASCENDING), ('_id', ASCENDING)]
+
     def __init__(self):
         self.db = Database()
 
-    def create_comment(self, record_id: str, user_id: str, content: str) -> tuple[bool, str]:
+    def ensure_indexes(self):
+        """Create the indexes used to list, count and purge comments"""
+        try:
+            # Threads by record (listing, counts, cascade deletes, orphan sweep)
+            self.db.comments.create_index([
+                ('record_id', ASCENDING), ('created_at', ASCENDING), ('_id', ASCENDING)
+            ])
+            # Comments by author (stats, recent comments)
+            self.db.comments.create_index([('user_id', ASCENDING), ('created_at', DESCENDING)])
+        except Exception as e:
+            print(f"Error creating comment indexes: {e}")
+
+    def create_comment(self, record_id: str, user_id: str, content: str,
+                       comment_id: Optional[str] = None) -> tuple[bool, str]:
         """
         Create a new comment on a record
 
@@ -20,26 +49,33 @@ class CommentModel:
             record_id: ID of the record being commented on
             user_id: ID of the user creating the comment
             content: Comment content
+            comment_id: ID chosen by the client (e.g. for a comment written
+                        offline); creating it again is then a no-op
 
         Returns:
             Tuple of (success: bool, message: str)
         """
         try:
             comment_doc = {
-                'record_id': record_id,
-                'user_id': user_id,
+                'record_id': to_object_id(record_id),
+                'user_id': to_object_id(user_id),
                 'content': content,
                 'created_at': datetime.utcnow(),
                 'updated_at': datetime.utcnow()
             }
+            if comment_id is not None:
+                comment_doc['_id'] = to_object_id(comment_id)
 
             self.db.comments.insert_one(comment_doc)
             return True, "Comment added successfully!"
 
+        except DuplicateKeyError:
+            # Only possible with a client-chosen ID: the comment already exists
+            return True, "Comment added successfully!"
         except Exception as e:
             return False, f"Error: {str(e)}"
 
-    def get_comments_by_record(self, record_id: str) -> List[Dict]:
+    def get_comments_by_record(self, record_id: str) -> List[Comment]:
         """
         Get all comments for a specific record
 
@@ -47,32 +83,120 @@ class CommentModel:
             record_id: Record ID
 
         Returns:
-            List of comment dictionaries
+            List of Comment rows (readable like the former dictionaries)
         """
         try:
-            cursor = self.db.comments.find({'record_id': record_id}).sort('created_at', -1)
+            cursor = self.db.comments.find({'record_id': id_filter(record_id)}).sort('created_at', -1)
+            docs = self._with_usernames(list(cursor))
+            return [Comment.from_doc(doc, doc['username']) for doc in docs]
 
-            comments = []
-            for comment in cursor:
-                # Get user info
-                user = self.db.users.find_one({'_id': ObjectId(comment['user_id'])})
-                username = user['username'] if user else 'Unknown'
+        except Exception as e:
+            print(f"Error getting comments: {e}")
+            return []
 
-                comments.append({
-                    'id': str(comment['_id']),
-                    'record_id': comment['record_id'],
-                    'user_id': comment['user_id'],
-                    'username': username,
-                    'content': comment['content'],
-                    'created_at': comment['created_at'].strftime('%Y-%m-%d %H:%M:%S'),
-                    'updated_at': comment['updated_at'].strftime('%Y-%m-%d %H:%M:%S')
-                })
+    def list_comments(self, record_id: str, after: Optional[str] = None,
+                      limit: int = PAGE_SIZE) -> tuple[List[Comment], Optional[str]]:
+        """
+        Get one page of a record's comments, newest first
 
-            return comments
+        Pages use keyset pagination on (created_at, _id), walking the
+        (record_id, created_at, _id) index backwards, so every page costs the
+        same however long the thread is.
+
+        Args:
+            record_id: Record ID
+            after: Cursor returned with the previous page
+            limit: Comments per page
+
+        Returns:
+            Tuple of (comments: list of Comment, next_cursor: str or None)
+        """
+        try:
+            query = {'record_id': id_filter(record_id)}
+            last_key = decode_cursor(after, 'comments', key_types(self.THREAD_SORT))
+            if last_key is not None:
+                query = {'$and': [query, keyset_filter(self.THREAD_SORT, last_key)]}
+
+            # One extra comment tells whether there is a next page
+            docs = list(self.db.comments.find(query).sort(self.THREAD_SORT).limit(limit + 1))
+            next_cursor = None
+            if len(docs) > limit:
+                docs = docs[:limit]
+                next_cursor = encode_cursor('comments', sort_values(docs[-1], self.THREAD_SORT))
+
+            docs = self._with_usernames(docs)
+            return [Comment.from_doc(doc, doc['username']) for doc in docs], next_cursor
 
         except Exception as e:
-            print(f"Error getting comments: {e}")
-            return []
+            print(f"Error listing comments: {e}")
+            return [], None
+
+    def list_changed_comments(self, record_ids: List[str], since: Optional[datetime] = None,
+                              after: Optional[str] = None,
+                              limit: int = 1000) -> tuple[List[Comment], Optional[str]]:
+        """
+        Get a page of the comments on some records changed since a point in time
+
+        Used by the desktop client to keep its local copy up to date. Without
+        `since` every comment is returned, in _id order. Errors are raised
+        rather than swallowed, so a failed read is never taken for "no changes".
+
+        Args:
+            record_ids: Records whose comments are wanted
+            since: Only comments with updated_at at or after this time
+            after: Cursor returned with the previous page
+            limit: Comments per page
+
+        Returns:
+            Tuple of (comments: list of Comment, next_cursor: str or None)
+        """
+        query = {'record_id': ids_filter(record_ids)}
+        if since is None:
+            sort_spec, tag = [('_id', ASCENDING)], 'sync_all'
+        else:
+            sort_spec, tag = self.SYNC_SORT, 'sync'
+            query['updated_at'] = {'$gte': since}
+
+        last_key = decode_cursor(after, tag, key_types(sort_spec))
+        if last_key is not None:
+            query = {'$and': [query, keyset_filter(sort_spec, last_key)]}
+
+        docs = list(self.db.comments.find(query).sort(sort_spec).limit(limit + 1))
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(tag, sort_values(docs[-1], sort_spec))
+
+        docs = self._with_usernames(docs)
+        return [Comment.from_doc(doc, doc['username']) for doc in docs], next_cursor
+
+    def list_comment_ids(self, record_ids: List[str]) -> List[str]:
+        """
+        Get the IDs of all comments on some records (errors are raised, see list_changed_comments)
+
+        Args:
+            record_ids: Record IDs
+
+        Returns:
+            Comment IDs as strings
+        """
+        return [str(doc['_id']) for doc in
+                self.db.comments.find({'record_id': ids_filter(record_ids)}, {'_id': 1})]
+
+    def get_comments_by_ids(self, comment_ids: List[str]) -> List[Comment]:
+        """
+        Get comments by ID (errors are raised, see list_changed_comments)
+
+        Args:
+            comment_ids: Comment IDs
+
+        Returns:
+            List of Comment
+        """
+        docs = list(self.db.comments.find(
+            {'_id': {'$in': [to_object_id(comment_id) for comment_id in comment_ids]}}))
+        docs = self._with_usernames(docs)
+        return [Comment.from_doc(doc, doc['username']) for doc in docs]
 
     def update_comment(self, comment_id: str, content: str, user_id: str) -> tuple[bool, str]:
         """
@@ -87,24 +211,20 @@ class CommentModel:
             Tuple of (success: bool, message: str)
         """
         try:
-            # Check if comment belongs to user
-            comment = self.db.comments.find_one({'_id': ObjectId(comment_id)})
-            if not comment:
-                return False, "Comment not found!"
-
-            if comment['user_id'] != user_id:
-                return False, "You can only edit your own comments!"
-
-            result = self.db.comments.update_one(
-                {'_id': ObjectId(comment_id)},
+            # Ownership is part of the filter: one round trip, no check-then-write race
+            comment = self.db.comments.find_one_and_update(
+                {'_id': ObjectId(comment_id), 'user_id': id_filter(user_id)},
                 {'$set': {
                     'content': content,
                     'updated_at': datetime.utcnow()
-                }}
+                }},
+                projection={'_id': 1}
             )
 
-            if result.modified_count > 0 or result.matched_count > 0:
+            if comment:
                 return True, "Comment updated successfully!"
+            elif self._exists(comment_id):
+                return False, "You can only edit your own comments!"
             else:
                 return False, "Comment not found!"
 
@@ -123,24 +243,107 @@ class CommentModel:
             Tuple of (success: bool, message: str)
         """
         try:
-            # Check if comment belongs to user
-            comment = self.db.comments.find_one({'_id': ObjectId(comment_id)})
-            if not comment:
-                return False, "Comment not found!"
-
-            if comment['user_id'] != user_id:
-                return False, "You can only delete your own comments!"
-
-            result = self.db.comments.delete_one({'_id': ObjectId(comment_id)})
+            # Ownership is part of the filter: one round trip, no check-then-write race
+            result = self.db.comments.delete_one(
+                {'_id': ObjectId(comment_id), 'user_id': id_filter(user_id)}
+            )
 
             if result.deleted_count > 0:
                 return True, "Comment deleted successfully!"
+            elif self._exists(comment_id):
+                return False, "You can only delete your own comments!"
             else:
                 return False, "Comment not found!"
 
         except Exception as e:
             return False, f"Error: {str(e)}"
 
+    def _exists(self, comment_id: str) -> bool:
+        """Check whether a comment exists (only used after a write matched nothing)"""
+        return self.db.comments.count_documents({'_id': ObjectId(comment_id)}, limit=1) > 0
+
+    def delete_comments_for_record(self, record_id: str, batch_size: int = 1000) -> int:
+        """
+        Delete every comment on a record in batches
+
+        Used for very large threads, so no single delete holds the
+        collection for long. Safe to re-run.
+
+        Args:
+            record_id: Record ID
+            batch_size: Comments deleted per batch
+
+        Returns:
+            Number of comments deleted
+        """
+        return self.delete_comments_for_records([record_id], batch_size)
+
+    def delete_comments_for_records(self, record_ids: List[str], batch_size: int = 1000) -> int:
+        """
+        Delete every comment on several records in batches (see delete_comments_for_record)
+
+        Args:
+            record_ids: Record IDs
+            batch_size: Comments deleted per batch
+
+        Returns:
+            Number of comments deleted
+        """
+        on_records = ids_filter(record_ids)
+        deleted = 0
+        while True:
+            batch = [c['_id'] for c in self.db.comments.find(
+                {'record_id': on_records}, {'_id': 1}).limit(batch_size)]
+            if not batch:
+                return deleted
+            deleted += self.db.comments.delete_many({'_id': {'$in': batch}}).deleted_count
+
+    def purge_orphans(self, batch_size: int = 1000, dry_run: bool = False) -> int:
+        """
+        Delete comments whose record no longer exists
+
+        Walks the distinct record IDs referenced by comments and checks them
+        against the records collection one batch at a time, so a sweep costs
+        two queries per batch rather than one per comment.
+
+        Args:
+            batch_size: Record IDs checked per batch
+            dry_run: Only count the orphaned comments
+
+        Returns:
+            Number of orphaned comments deleted (or found, for a dry run)
+        """
+        cursor = self.db.comments.aggregate(
+            [{'$group': {'_id': '$record_id'}}],
+            allowDiskUse=True,
+            batchSize=batch_size
+        )
+
+        purged = 0
+        batch = []
+        for item in cursor:
+            batch.append(item['_id'])
+            if len(batch) >= batch_size:
+                purged += self._purge_missing(batch, dry_run)
+                batch = []
+        if batch:
+            purged += self._purge_missing(batch, dry_run)
+        return purged
+
+    def _purge_missing(self, record_ids: list, dry_run: bool) -> int:
+        """Delete (or count) comments on the given records that no longer exist"""
+        # record_ids are the stored values, either ObjectIds or hex strings
+        object_ids = [to_object_id(rid) for rid in record_ids if ObjectId.is_valid(rid)]
+        existing = {r['_id'] for r in self.db.records.find({'_id': {'$in': object_ids}}, {'_id': 1})}
+        missing = [rid for rid in record_ids
+                   if not ObjectId.is_valid(rid) or to_object_id(rid) not in existing]
+        if not missing:
+            return 0
+
+        orphan_filter = {'record_id': {'$in': missing}}
+        if dry_run:
+            return self.db.comments.count_documents(orphan_filter)
+        return self.db.comments.delete_many(orphan_filter).deleted_count
 
     # Report functions
     def get_comment_count_by_record(self, record_id: str) -> int:
@@ -154,7 +357,7 @@ class CommentModel:
             Number of comments
         """
         try:
-            return self.db.comments.count_documents({'record_id': record_id})
+            return self.db.comments.count_documents({'record_id': id_filter(record_id)})
         except Exception as e:
             print(f"Error counting comments: {e}")
             return 0
@@ -170,7 +373,7 @@ class CommentModel:
             List of comment dictionaries
         """
         try:
-            cursor = self.db.comments.find({'user_id': user_id}).sort('created_at', -1)
+            cursor = self.db.comments.find({'user_id': id_filter(user_id)}).sort('created_at', -1)
 
             comments = []
             for comment in cursor:
@@ -180,7 +383,7 @@ class CommentModel:
 
                 comments.append({
                     'id': str(comment['_id']),
-                    'record_id': comment['record_id'],
+                    'record_id': str(comment['record_id']),
                     'record_title': record_title,
                     'content': comment['content'],
                     'created_at': comment['created_at'].strftime('%Y-%m-%d %H:%M:%S'),
@@ -193,6 +396,48 @@ class CommentModel:
             print(f"Error getting user comments: {e}")
             return []
 
+    def iter_comments_for_records(self, record_ids: List[str],
+                                  batch_size: int = 500) -> Iterator[dict]:
+        """
+        Stream the comments on a set of records, grouped by record
+
+        Usernames are resolved with one query per batch instead of one per
+        comment. Errors are raised rather than swallowed (see
+        RecordModel.iter_record_chunks).
+
+        Args:
+            record_ids: Record IDs whose comments to stream
+            batch_size: Comments fetched and resolved per batch
+
+        Yields:
+            Comment documents with an added 'username' field
+        """
+        cursor = (self.db.comments.find({'record_id': ids_filter(record_ids)})
+                  .sort([('record_id', 1), ('created_at', 1)])
+                  .batch_size(batch_size))
+
+        batch = []
+        for comment in cursor:
+            batch.append(comment)
+            if len(batch) >= batch_size:
+                yield from self._with_usernames(batch)
+                batch = []
+        if batch:
+            yield from self._with_usernames(batch)
+
+    def _with_usernames(self, comments: List[dict]) -> List[dict]:
+        """Attach 'username' to each comment using a single users query"""
+        if not comments:
+            return comments
+        user_ids = {to_object_id(c['user_id']) for c in comments}
+        users = self.db.users.find({'_id': {'$in': list(user_ids)}}, {'username': 1})
+        usernames = {u['_id']: u['username'] for u in users}
+
+        for comment in comments:
+            comment['username'] = usernames.get(to_object_id(comment['user_id']), 'Unknown')
+        return comments
+
+    @coalesce('comment_stats')
     def get_comment_stats(self, user_id: str) -> Dict:
         """
         Get comment statistics for a user
@@ -204,19 +449,21 @@ class CommentModel:
             Dictionary with comment statistics
         """
         try:
+            author = id_filter(user_id)
+
             # Total comments by user
-            total_comments = self.db.comments.count_documents({'user_id': user_id})
+            total_comments = self.db.comments.count_documents({'user_id': author})
 
             # Comments on user's records
-            user_records = list(self.db.records.find({'user_id': user_id}, {'_id': 1}))
-            record_ids = [str(r['_id']) for r in user_records]
+            user_records = list(self.db.records.find({'user_id': author}, {'_id': 1}))
+            on_records = ids_filter(r['_id'] for r in user_records)
 
             comments_on_records = self.db.comments.count_documents({
-                'record_id': {'$in': record_ids}
+                'record_id': on_records
             })
 
             # Recent comments
-            recent_comments = list(self.db.comments.find({'user_id': user_id})
+            recent_comments = list(self.db.comments.find({'user_id': author})
                                   .sort('created_at', -1).limit(5))
 
             recent_list = []
@@ -231,9 +478,9 @@ class CommentModel:
 
             # Comments per record
             pipeline = [
-                {'$match': {'record_id': {'$in': record_ids}}},
+                {'$match': {'record_id': on_records}},
                 {'$group': {
-                    '_id': '$record_id',
+                    '_id': {'$toString': '$record_id'},
                     'count': {'$sum': 1}
                 }},
                 {'$sort': {'count': -1}},
@@ -265,3 +512,102 @@ class CommentModel:
                 'recent_comments': [],
                 'top_commented_records': []
             }
+
+    def get_comment_stats_bulk(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get comment statistics for many users at once
+
+        Produces the same dictionaries as get_comment_stats with a fixed
+        number of queries per call. Requires MongoDB 5.2+ ($topN). Errors are
+        raised so batch jobs never render a report from empty stats.
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            Dictionary of {user_id: comment statistics}
+        """
+        stats = {user_id: {
+            'total_comments': 0,
+            'comments_on_my_records': 0,
+            'recent_comments': [],
+            'top_commented_records': []
+        } for user_id in user_ids}
+
+        # Comments written by each user, with their five most recent
+        totals_pipeline = [
+            {'$match': {'user_id': ids_filter(user_ids)}},
+            {'$group': {
+                '_id': {'$toString': '$user_id'},
+                'count': {'$sum': 1},
+                'recent': {'$topN': {
+                    'n': 5,
+                    'sortBy': {'created_at': -1},
+                    'output': {
+                        'id': {'$toString': '$_id'},
+                        'record_id': {'$toString': '$record_id'},
+                        'content': '$content',
+                        'created_at': '$created_at'
+                    }
+                }}
+            }}
+        ]
+        written = list(self.db.comments.aggregate(totals_pipeline))
+
+        # Titles and owners of the users' records
+        records = self.db.records.find({'user_id': ids_filter(user_ids)}, {'user_id': 1, 'title': 1})
+        owners = {}
+        titles = {}
+        for record in records:
+            owners[str(record['_id'])] = str(record['user_id'])
+            titles[str(record['_id'])] = record['title']
+
+        # Titles of records the recent comments were left on
+        recent_record_ids = {c['record_id'] for item in written for c in item['recent']}
+        missing = [ObjectId(rid) for rid in recent_record_ids - titles.keys()]
+        if missing:
+            for record in self.db.records.find({'_id': {'$in': missing}}, {'title': 1}):
+                titles[str(record['_id'])] = record['title']
+
+        for item in written:
+            user_stats = stats[item['_id']]
+            user_stats['total_comments'] = item['count']
+            user_stats['recent_comments'] = [{
+                'id': c['id'],
+                'record_title': titles.get(c['record_id'], 'Unknown'),
+                'content': c['content'][:50] + '...' if len(c['content']) > 50 else c['content'],
+                'created_at': c['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+            } for c in item['recent']]
+
+        # Comments per record, rolled up to the record owners
+        counts_pipeline = [
+            {'$match': {'record_id': ids_filter(owners)}},
+            {'$group': {'_id': {'$toString': '$record_id'}, 'count': {'$sum': 1}}}
+        ]
+        per_owner = {}
+        for item in self.db.comments.aggregate(counts_pipeline):
+            owner = owners[item['_id']]
+            stats[owner]['comments_on_my_records'] += item['count']
+            per_owner.setdefault(owner, []).append((item['count'], item['_id']))
+
+        for owner, counts in per_owner.items():
+            counts.sort(key=lambda c: c[0], reverse=True)
+            stats[owner]['top_commented_records'] = [{
+                'record_title': titles[record_id],
+                'comment_count': count
+            } for count, record_id in counts[:5]]
+
+        return stats
+
+
+@job_runner.register('purge_record_comments')
+def purge_record_comments_job(payload: dict) -> dict:
+    """Job: delete the comments of records deleted with very large threads"""
+    record_ids = payload.get('record_ids') or [payload['record_id']]
+    return {'deleted': CommentModel().delete_comments_for_records(record_ids)}
+
+
+@job_runner.register('purge_orphan_comments')
+def purge_orphan_comments_job(payload: dict) -> dict:
+    """Job: sweep comments left behind by records deleted before cascading"""
+    return {'deleted': CommentModel().purge_orphans(payload.get('batch_size', 1000))}
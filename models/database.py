@@ -6,11 +6,16 @@ Database connection manager
 - يستخدم نمط Singleton للتأكد من وجود اتصال واحد فقط بقاعدة البيانات
 - يوفر طرق للاتصال بقاعدة البيانات والوصول إلى المجموعات (Collections)
 """
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 from pymongo import MongoClient
 import os
 import ssl
 import certifi
 
+# Documents stay as the encoded bytes; fields are decoded on first access
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
 
 class Database:
     """MongoDB database connection manager"""
@@ -18,6 +23,7 @@ class Database:
     _instance = None
     _client = None
     _db = None
+    _transactions = None
 
     def __new__(cls):
         """Singleton pattern to ensure one database connection"""
@@ -64,7 +70,8 @@ class Database:
                 socketTimeoutMS=10000,
                 retryWrites=False
             )
-            self._db = self._client['smart_records_db']
+            # MONGODB_DB selects another database (e.g. for benchmarks)
+            self._db = self._client[os.getenv('MONGODB_DB', 'smart_records_db')]
 
             # Test connection
             try:
@@ -82,6 +89,13 @@ class Database:
             self._client = None
             self._db = None
 
+    @property
+    def client(self):
+        """Get MongoClient instance (for sessions and transactions)"""
+        if self._client is None:
+            self.connect()
+        return self._client
+
     @property
     def db(self):
         """Get database instance"""
@@ -104,6 +118,44 @@ class Database:
         """Get comments collection"""
         return self.db['comments']
 
+    @property
+    def jobs(self):
+        """Get background jobs collection"""
+        return self.db['jobs']
+
+    def raw(self, name: str):
+        """
+        Get a collection whose reads return RawBSONDocument instead of dict
+
+        Opt-in fast path for bulk scans and exports: pymongo hands back the
+        bytes it received without building dicts, documents can be written
+        out as they are (doc.raw), and len(doc.raw) is the wire size. Reading
+        any field decodes the whole document, so combine with a projection.
+
+        Args:
+            name: Collection name
+
+        Returns:
+            Collection with raw codec options
+        """
+        return self.db.get_collection(name, codec_options=RAW_CODEC_OPTIONS)
+
+    @property
+    def migrations(self):
+        """Get schema migration progress collection"""
+        return self.db['migrations']
+
+    @property
+    def supports_transactions(self) -> bool:
+        """Whether the server supports multi-document transactions (replica set or mongos)"""
+        if Database._transactions is None:
+            try:
+                hello = self.client.admin.command('hello')
+                Database._transactions = 'setName' in hello or hello.get('msg') == 'isdbgrid'
+            except Exception:
+                return False
+        return Database._transactions
+
     def close(self):
         """Close MongoDB connection"""
         if self._client:
@@ -0,0 +1,53 @@
+"""
+Foreign keys stored as ObjectId
+
+records.user_id, comments.record_id and comments.user_id used to be stored
+as hex strings. New documents store ObjectIds and
+scripts/migrate_object_ids.py converts existing ones in the background;
+until it has finished everywhere, queries match both forms.
+"""
+from typing import Iterable, Union
+from bson.objectid import ObjectId
+
+IdLike = Union[str, ObjectId]
+
+
+def to_object_id(value: IdLike) -> ObjectId:
+    """
+    Convert a hex string (or ObjectId) to an ObjectId
+
+    Raises:
+        bson.errors.InvalidId: If the value is not a valid ObjectId
+    """
+    return value if isinstance(value, ObjectId) else ObjectId(value)
+
+
+def id_filter(value: IdLike) -> dict:
+    """
+    Query condition matching a foreign key in either stored form
+
+    Args:
+        value: ID as hex string or ObjectId
+
+    Returns:
+        {'$in': [ObjectId, hex string]}
+    """
+    oid = to_object_id(value)
+    return {'$in': [oid, str(oid)]}
+
+
+def ids_filter(values: Iterable[IdLike]) -> dict:
+    """
+    Query condition matching any of several foreign keys in either stored form
+
+    Args:
+        values: IDs as hex strings or ObjectIds
+
+    Returns:
+        {'$in': [...]} with both forms of every ID
+    """
+    forms = []
+    for value in values:
+        oid = to_object_id(value)
+        forms.extend((oid, str(oid)))
+    return {'$in': forms}
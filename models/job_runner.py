@@ -0,0 +1,353 @@
+"""
+Background job runner
+
+Heavy work (cascading deletes, rebuilds, exports, imports) is enqueued as a
+document in the `jobs` collection and executed by a pool of worker threads,
+so Flask routes and the desktop app can return immediately.
+
+- Jobs survive restarts: anything queued, or running with an expired lease,
+  is picked up again by the next runner. A running job's lease is renewed
+  every third of its length, so only a worker that died (or lost the
+  database for a whole lease) has its job taken over; handlers must still
+  be safe to run again after such a takeover.
+- Higher priority runs first; equal priorities run in order of run_at.
+- Failed jobs are retried with exponential backoff up to max_attempts.
+  Takeovers count as attempts too: a job whose lease runs out with no
+  attempts left is marked failed, so a job that kills or hangs its worker
+  is not retried forever.
+- An idempotency key makes repeated enqueues return the existing job.
+"""
+import os
+import socket
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from .database import Database
+
+
+class JobRunner:
+    """Durable, priority-ordered job queue with an in-process worker pool"""
+
+    def __init__(self, workers: int = 2, poll_interval: float = 2.0,
+                 lease: timedelta = timedelta(minutes=10),
+                 backoff_base: float = 5.0, backoff_max: float = 600.0):
+        """
+        Initialize job runner
+
+        Args:
+            workers: Number of worker threads
+            poll_interval: Seconds between polls when the queue is empty
+            lease: How long a claimed job is reserved without a heartbeat before others may retry it
+            backoff_base: Delay in seconds before the first retry (doubles each time)
+            backoff_max: Upper bound for the retry delay in seconds
+        """
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._handlers: Dict[str, Callable[[dict], Any]] = {}
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    @property
+    def db(self):
+        """Database connection, resolved on first use so importing stays cheap"""
+        return Database()
+
+    def register(self, name: str, handler: Optional[Callable[[dict], Any]] = None):
+        """
+        Register a handler for a job name (usable as a decorator)
+
+        Handlers receive the job payload and may return a BSON-serializable
+        result. Raising an exception marks the attempt as failed.
+
+        Args:
+            name: Job name
+            handler: Function taking the payload dictionary
+        """
+        def decorator(fn):
+            self._handlers[name] = fn
+            return fn
+
+        if handler is not None:
+            return decorator(handler)
+        return decorator
+
+    def ensure_indexes(self):
+        """Create the indexes used to claim jobs and enforce idempotency"""
+        self.db.jobs.create_index([
+            ('status', ASCENDING), ('priority', DESCENDING), ('run_at', ASCENDING)
+        ])
+        self.db.jobs.create_index(
+            'idempotency_key',
+            unique=True,
+            partialFilterExpression={'idempotency_key': {'$type': 'string'}}
+        )
+
+    def enqueue(self, name: str, payload: Optional[dict] = None, priority: int = 0,
+                idempotency_key: Optional[str] = None, max_attempts: int = 3,
+                user_id: Optional[str] = None, delay: float = 0) -> tuple[bool, str, Optional[str]]:
+        """
+        Add a job to the queue
+
+        Args:
+            name: Registered job name
+            payload: Arguments for the handler
+            priority: Higher runs first
+            idempotency_key: If a job with this key exists, it is returned instead
+            max_attempts: Attempts before the job is marked failed
+            user_id: Owner of the job (for the status API)
+            delay: Seconds to wait before the job may run
+
+        Returns:
+            Tuple of (success: bool, message: str, job_id: str or None)
+        """
+        try:
+            if idempotency_key:
+                existing = self.db.jobs.find_one({'idempotency_key': idempotency_key}, {'_id': 1})
+                if existing:
+                    return True, "Job already enqueued", str(existing['_id'])
+
+            now = datetime.utcnow()
+            job_doc = {
+                'name': name,
+                'payload': payload or {},
+                'status': 'queued',
+                'priority': priority,
+                'attempts': 0,
+                'max_attempts': max_attempts,
+                'run_at': now + timedelta(seconds=delay),
+                'user_id': user_id,
+                'result': None,
+                'error': None,
+                'created_at': now,
+                'updated_at': now
+            }
+            if idempotency_key:
+                job_doc['idempotency_key'] = idempotency_key
+
+            try:
+                result = self.db.jobs.insert_one(job_doc)
+            except DuplicateKeyError:
+                # Lost a race with another enqueue using the same key
+                existing = self.db.jobs.find_one({'idempotency_key': idempotency_key}, {'_id': 1})
+                return True, "Job already enqueued", str(existing['_id'])
+
+            self._wakeup.set()
+            return True, "Job enqueued", str(result.inserted_id)
+
+        except Exception as e:
+            return False, f"Error: {str(e)}", None
+
+    def get_job(self, job_id: str, user_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Get the status of a job
+
+        Jobs are owned by the user_id they were enqueued with. Jobs enqueued
+        without one (e.g. from scripts) are system jobs: they are never
+        returned when a user_id is given, only to callers passing None.
+
+        Args:
+            job_id: Job ID
+            user_id: If given, only return the job when it belongs to this user
+
+        Returns:
+            Job status dictionary or None
+        """
+        try:
+            query = {'_id': ObjectId(job_id)}
+            if user_id is not None:
+                query['user_id'] = user_id
+
+            job = self.db.jobs.find_one(query)
+            if not job:
+                return None
+
+            return {
+                'id': str(job['_id']),
+                'name': job['name'],
+                'status': job['status'],
+                'attempts': job['attempts'],
+                'max_attempts': job['max_attempts'],
+                'result': job.get('result'),
+                'error': job.get('error'),
+                'created_at': job['created_at'].strftime('%Y-%m-%d %H:%M:%S'),
+                'updated_at': job['updated_at'].strftime('%Y-%m-%d %H:%M:%S')
+            }
+
+        except Exception as e:
+            print(f"Error getting job: {e}")
+            return None
+
+    def start(self):
+        """Start the worker threads (safe to call more than once)"""
+        with self._lock:
+            if self._threads:
+                return
+
+            try:
+                self.ensure_indexes()
+            except Exception as e:
+                print(f"⚠ Could not create job indexes: {str(e)[:100]}")
+
+            self._stopping.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker threads after their current job"""
+        with self._lock:
+            self._stopping.set()
+            self._wakeup.set()
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads = []
+
+    def _work(self):
+        """Worker loop: claim and run jobs until stopped"""
+        while not self._stopping.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                print(f"⚠ Job runner could not claim a job: {str(e)[:100]}")
+                job = None
+
+            if job is None:
+                try:
+                    self._fail_expired()
+                except Exception as e:
+                    print(f"⚠ Job runner could not fail expired jobs: {str(e)[:100]}")
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            try:
+                self._execute(job)
+            except Exception as e:
+                # Outcome not recorded: the job is retried once its lease runs out
+                print(f"⚠ Job runner could not record the outcome of job {job['_id']}: {str(e)[:100]}")
+
+    def _claim(self) -> Optional[dict]:
+        """Atomically claim the next runnable job, if any"""
+        now = datetime.utcnow()
+        # Unique per claim, so a worker only ever releases its own claim
+        token = f"{self._worker_id}:{uuid.uuid4().hex[:8]}"
+        return self.db.jobs.find_one_and_update(
+            {
+                '$or': [
+                    {'status': 'queued', 'run_at': {'$lte': now}},
+                    # Worker died mid-job: its lease has run out
+                    {'status': 'running', 'lease_until': {'$lt': now},
+                     '$expr': {'$lt': ['$attempts', '$max_attempts']}}
+                ],
+                'name': {'$in': list(self._handlers)}
+            },
+            {
+                '$set': {
+                    'status': 'running',
+                    'locked_by': token,
+                    'lease_until': now + self.lease,
+                    'updated_at': now
+                },
+                '$inc': {'attempts': 1}
+            },
+            sort=[('priority', DESCENDING), ('run_at', ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _fail_expired(self) -> int:
+        """
+        Mark running jobs whose lease ran out on their last attempt as failed
+
+        Returns:
+            Number of jobs failed
+        """
+        now = datetime.utcnow()
+        result = self.db.jobs.update_many(
+            {
+                'status': 'running',
+                'lease_until': {'$lt': now},
+                '$expr': {'$gte': ['$attempts', '$max_attempts']},
+                'name': {'$in': list(self._handlers)}
+            },
+            {
+                '$set': {
+                    'status': 'failed',
+                    'error': 'LeaseExpired: The worker stopped responding on the last attempt',
+                    'updated_at': now
+                },
+                '$unset': {'locked_by': '', 'lease_until': ''}
+            }
+        )
+        return result.modified_count
+
+    def _execute(self, job: dict):
+        """Run a claimed job, renewing its lease meanwhile, and record the outcome"""
+        handler = self._handlers[job['name']]
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, stop),
+                                     name=f'job-heartbeat-{job["_id"]}', daemon=True)
+        heartbeat.start()
+        try:
+            result = handler(job['payload'])
+            outcome = {'status': 'done', 'result': result, 'error': None}
+
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+            if job['attempts'] < job['max_attempts']:
+                delay = min(self.backoff_base * 2 ** (job['attempts'] - 1), self.backoff_max)
+                outcome = {
+                    'status': 'queued',
+                    'error': error,
+                    'run_at': datetime.utcnow() + timedelta(seconds=delay)
+                }
+            else:
+                traceback.print_exc()
+                outcome = {'status': 'failed', 'error': error}
+
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        self._finish(job, outcome)
+
+    def _heartbeat(self, job: dict, stop: threading.Event):
+        """Extend the lease of a running job until stop is set"""
+        interval = self.lease.total_seconds() / 3
+        while not stop.wait(interval):
+            try:
+                now = datetime.utcnow()
+                result = self.db.jobs.update_one(
+                    {'_id': job['_id'], 'locked_by': job['locked_by']},
+                    {'$set': {'lease_until': now + self.lease, 'updated_at': now}}
+                )
+                if result.matched_count == 0:
+                    print(f"⚠ Job {job['_id']} was taken over by another worker")
+                    return
+            except Exception as e:
+                # Retried next interval; the lease outlasts two missed renewals
+                print(f"⚠ Could not renew the lease of job {job['_id']}: {str(e)[:100]}")
+
+    def _finish(self, job: dict, fields: dict):
+        """Release a job this worker holds"""
+        fields['updated_at'] = datetime.utcnow()
+        self.db.jobs.update_one(
+            {'_id': job['_id'], 'locked_by': job['locked_by']},
+            {'$set': fields, '$unset': {'locked_by': '', 'lease_until': ''}}
+        )
+
+
+# Process-wide runner shared by the Flask app and the desktop app
+job_runner = JobRunner()
@@ -0,0 +1,111 @@
+"""
+Keyset (seek) pagination helpers
+
+Instead of skip/limit, the next page starts right after the last row of the
+previous one: the query adds "sort key > last key" and the server seeks to
+that point in the matching index. Each page therefore costs the same no
+matter how deep the user has paged.
+
+The sort must end with a unique field (normally _id) so rows with equal
+sort values are never skipped or repeated.
+
+Cursors come back from clients, so decode_cursor only accepts exactly one
+value of the expected type per sort field; anything else (a query operator
+such as {"$gt": ""}, a short list) is treated as no cursor.
+"""
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from bson import json_util
+from bson.objectid import ObjectId
+
+Sort = Sequence[Tuple[str, int]]
+
+# Types of the MongoDB fields used as sort keys
+KEY_TYPES = {
+    '_id': ObjectId,
+    'title': str,
+    'date_added': datetime,
+    'created_at': datetime,
+    'updated_at': datetime
+}
+
+
+def keyset_filter(sort: Sort, values: Sequence[Any]) -> dict:
+    """
+    Build the condition selecting rows after the given sort key values
+
+    For sort [(a, -1), (_id, -1)] and values [x, y] this is
+    {'$or': [{a: {'$lt': x}}, {a: x, _id: {'$lt': y}}]}.
+
+    Args:
+        sort: Sort specification as (field, direction) pairs
+        values: Values of the sort fields in the last row of the previous page
+
+    Returns:
+        Query condition
+    """
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        branch[field] = {'$gt' if direction > 0 else '$lt': values[i]}
+        branches.append(branch)
+    return {'$or': branches}
+
+
+def sort_values(doc, sort: Sort) -> List[Any]:
+    """Get the sort key of a row (a document or anything with .get)"""
+    return [doc.get(field) for field, _ in sort]
+
+
+def key_types(sort: Sort) -> List[type]:
+    """Get the expected value types of a MongoDB sort, for decode_cursor"""
+    return [KEY_TYPES[field] for field, _ in sort]
+
+
+def encode_cursor(tag: str, values: Sequence[Any]) -> str:
+    """
+    Encode a page cursor for use in URLs
+
+    Args:
+        tag: Identifies the sort the values belong to
+        values: Sort key values of the last row on the page
+
+    Returns:
+        URL-safe string
+    """
+    payload = json_util.dumps({'t': tag, 'v': list(values)})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], tag: str,
+                  types: Sequence[type]) -> Optional[List[Any]]:
+    """
+    Decode a page cursor made by encode_cursor
+
+    Args:
+        cursor: Cursor string (may be None or empty)
+        tag: Expected sort tag; cursors for another sort are ignored
+        types: Expected type of each sort key value (None is also accepted,
+            for rows missing a field)
+
+    Returns:
+        Sort key values, or None for the first page (or an invalid cursor)
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        if payload.get('t') != tag:
+            return None
+
+        values = payload['v']
+        if not isinstance(values, list) or len(values) != len(types):
+            return None
+        for value, expected in zip(values, types):
+            if value is not None and (isinstance(value, bool) or not isinstance(value, expected)):
+                return None
+        return values
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
@@ -1,19 +1,72 @@
 """
 Record model for CRUD operations on records
 """
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator
 from datetime import datetime, timedelta
 from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
 from .database import Database
+from .ids import id_filter, ids_filter, to_object_id
+from .pagination import keyset_filter, sort_values, key_types, encode_cursor, decode_cursor
+from .singleflight import coalesce
+from .values import Record
+from .job_runner import job_runner
 
 
 class RecordModel:
     """Record model for CRUD operations"""
 
+    # Records with more comments than this have them purged by a background job
+    LARGE_THREAD_COMMENTS = 5000
+
+    # Characters of the description sent for listings
+    PREVIEW_CHARS = 80
+
+    STATUSES = ('Active', 'Inactive', 'Completed')
+    CATEGORIES = ('General', 'Important', 'Personal', 'Work', 'Other')
+
+    # Listing sort options; each ends with _id so keyset pages are stable
+    SORTS = {
+        'newest': [('date_added', DESCENDING), ('_id', DESCENDING)],
+        'oldest': [('date_added', ASCENDING), ('_id', ASCENDING)],
+        'title': [('title', ASCENDING), ('_id', ASCENDING)]
+    }
+
+    # Order records are read in by clients syncing changes (see list_changed_records)
+    SYNC_SORT = [('updated_at', ASCENDING), ('_id', ASCENDING)]
+
+    # Equality filters a listing can combine (status, category, both or none)
+    FILTER_FIELDS = ((), ('status',), ('category',), ('status', 'category'))
+
+    # Most records a single bulk action may touch
+    MAX_BULK_RECORDS = 5000
+
     def __init__(self):
         self.db = Database()
 
-    def create_record(self, user_id: str, title: str, description: str, category: str) -> tuple[bool, str]:
+    def ensure_indexes(self):
+        """
+        Create one index per listing filter combination and sort key
+
+        Each index is user_id, then the equality filters, then the sort
+        fields, so a filtered and sorted page is a single index seek plus
+        `limit` entries. The date index also serves date ranges and, read
+        backwards, the newest-first sort.
+        """
+        try:
+            for fields in self.FILTER_FIELDS:
+                prefix = [('user_id', ASCENDING)] + [(field, ASCENDING) for field in fields]
+                self.db.records.create_index(prefix + [('date_added', ASCENDING), ('_id', ASCENDING)])
+                self.db.records.create_index(prefix + [('title', ASCENDING), ('_id', ASCENDING)])
+            # Changes since a point in time (desktop sync)
+            self.db.records.create_index([('user_id', ASCENDING)] + self.SYNC_SORT)
+        except Exception as e:
+            print(f"Error creating record indexes: {e}")
+
+    def create_record(self, user_id: str, title: str, description: str, category: str,
+                      record_id: Optional[str] = None) -> tuple[bool, str]:
         """
         Create a new record
 
@@ -22,27 +75,36 @@ class RecordModel:
             title: Record title
             description: Record description
             category: Record category
+            record_id: ID chosen by the client (e.g. for a record created
+                       offline); creating it again is then a no-op
 
         Returns:
             Tuple of (success: bool, message: str)
         """
         try:
+            now = datetime.utcnow()
             record_doc = {
-                'user_id': user_id,
+                'user_id': to_object_id(user_id),
                 'title': title,
                 'description': description,
                 'category': category,
-                'date_added': datetime.utcnow(),
+                'date_added': now,
+                'updated_at': now,
                 'status': 'Active'
             }
+            if record_id is not None:
+                record_doc['_id'] = to_object_id(record_id)
 
             self.db.records.insert_one(record_doc)
             return True, "Record created successfully!"
 
+        except DuplicateKeyError:
+            # Only possible with a client-chosen ID: the record already exists
+            return True, "Record created successfully!"
         except Exception as e:
             return False, f"Error: {str(e)}"
 
-    def read_all_records(self, user_id: Optional[str] = None) -> List[tuple]:
+    def read_all_records(self, user_id: Optional[str] = None) -> List[Record]:
         """
         Read all records for a user
 
@@ -50,30 +112,96 @@ class RecordModel:
             user_id: User ID to filter records (if None, returns all records)
 
         Returns:
-            List of tuples containing record data
+            List of Record rows (indexable like the former tuples)
         """
         try:
           
 
             cursor = self.db.records.find().sort('date_added', -1)
 
-            results = []
-            for record in cursor:
-                results.append((
-                    str(record['_id']),
-                    record['title'],
-                    record['description'],
-                    record['category'],
-                    record['date_added'].strftime('%Y-%m-%d %H:%M:%S'),
-                    record['status']
-                ))
-
-            return results
+            return [Record.from_doc(record) for record in cursor]
 
         except Exception as e:
             print(f"Error reading records: {e}")
             return []
 
+    def list_records(self, user_id: str, status: Optional[str] = None,
+                     category: Optional[str] = None, date_from: Optional[datetime] = None,
+                     date_to: Optional[datetime] = None, sort: str = 'newest',
+                     after: Optional[str] = None,
+                     limit: Optional[int] = 50) -> tuple[List[Record], Optional[str], int]:
+        """
+        List a user's records, filtered, sorted and paginated on the server
+
+        Only the listed fields are sent, and the description is truncated to
+        PREVIEW_CHARS with $substrCP; `truncated` tells the view whether to
+        add an ellipsis. Full text comes from read_record. Pages use
+        keyset pagination over the indexes from ensure_indexes.
+
+        Args:
+            user_id: Owner of the records
+            status: Only records with this status
+            category: Only records in this category
+            date_from: Only records added at or after this time
+            date_to: Only records added before this time
+            sort: Key of SORTS (unknown values fall back to 'newest')
+            after: Cursor returned with the previous page
+            limit: Records per page (None for all matching records)
+
+        Returns:
+            Tuple of (rows: list of Record, next_cursor: str or None,
+            bytes: BSON bytes received)
+        """
+        try:
+            sort_key = sort if sort in self.SORTS else 'newest'
+            sort_spec = self.SORTS[sort_key]
+
+            query = {'user_id': id_filter(user_id)}
+            if status:
+                query['status'] = status
+            if category:
+                query['category'] = category
+            if date_from or date_to:
+                query['date_added'] = {}
+                if date_from:
+                    query['date_added']['$gte'] = date_from
+                if date_to:
+                    query['date_added']['$lt'] = date_to
+
+            last_key = decode_cursor(after, sort_key, key_types(sort_spec))
+            if last_key is not None:
+                query = {'$and': [query, keyset_filter(sort_spec, last_key)]}
+
+            pipeline = [{'$match': query}, {'$sort': dict(sort_spec)}]
+            if limit:
+                # One extra row tells whether there is a next page
+                pipeline.append({'$limit': limit + 1})
+            pipeline.append({'$project': {
+                'title': 1,
+                'category': 1,
+                'date_added': 1,
+                'status': 1,
+                'description': {'$substrCP': ['$description', 0, self.PREVIEW_CHARS]},
+                'truncated': {'$gt': [{'$strLenCP': '$description'}, self.PREVIEW_CHARS]}
+            }})
+
+            # Raw documents expose their encoded size without re-encoding
+            rows = []
+            received = 0
+            last_doc = None
+            for doc in self.db.raw('records').aggregate(pipeline):
+                if limit and len(rows) == limit:
+                    next_cursor = encode_cursor(sort_key, sort_values(last_doc, sort_spec))
+                    return rows, next_cursor, received
+                received += len(doc.raw)
+                rows.append(Record.from_doc(doc))
+                last_doc = doc
+            return rows, None, received
+
+        except Exception as e:
+            print(f"Error listing records: {e}")
+            return [], None, 0
+
     def get_record_by_id(self, record_id: str) -> Optional[dict]:
         """
         Get a single record by ID
@@ -90,8 +218,32 @@ class RecordModel:
             print(f"Error getting record: {e}")
             return None
 
+    def read_record(self, record_id: str, user_id: Optional[str] = None) -> Optional[Record]:
+        """
+        Read a single record by ID, optionally only if it belongs to a user
+
+        A point lookup on the _id index, so the cost does not depend on
+        how many records exist. When user_id is given, records of other
+        users are reported as not found.
+
+        Args:
+            record_id: Record ID
+            user_id: Owner the record must belong to
+
+        Returns:
+            Record row (indexable like (id, title, description, category,
+            date_added, status)) or None
+        """
+        try:
+            doc = self.db.records.find_one(self._record_filter(record_id, user_id))
+            return Record.from_doc(doc) if doc else None
+
+        except Exception as e:
+            print(f"Error reading record: {e}")
+            return None
+
     def update_record(self, record_id: str, title: str, description: str,
-                     category: str, status: str) -> tuple[bool, str]:
+                     category: str, status: str, user_id: Optional[str] = None) -> tuple[bool, str]:
         """
         Update an existing record
 
@@ -101,50 +253,349 @@ class RecordModel:
             description: New description
             category: New category
             status: New status
+            user_id: ID of the user updating (for authorization); None skips the check
 
         Returns:
             Tuple of (success: bool, message: str)
         """
         try:
-            result = self.db.records.update_one(
-                {'_id': ObjectId(record_id)},
+            # Ownership is part of the filter: one round trip, no check-then-write race
+            record = self.db.records.find_one_and_update(
+                self._record_filter(record_id, user_id),
                 {'$set': {
                     'title': title,
                     'description': description,
                     'category': category,
-                    'status': status
-                }}
+                    'status': status,
+                    'updated_at': datetime.utcnow()
+                }},
+                projection={'_id': 1}
             )
 
-            if result.modified_count > 0 or result.matched_count > 0:
+            if record:
                 return True, "Record updated successfully!"
+            elif user_id is not None and self._exists(record_id):
+                return False, "You can only edit your own records!"
             else:
                 return False, "Record not found!"
 
         except Exception as e:
             return False, f"Error: {str(e)}"
 
-    def delete_record(self, record_id: str) -> tuple[bool, str]:
+    def delete_record(self, record_id: str,
+                      user_id: Optional[str] = None) -> tuple[bool, str, Optional[str]]:
         """
-        Delete a record
+        Delete a record and its comments
+
+        Comments go with a single delete_many, in the same transaction as the
+        record when the server supports transactions. Very large threads are
+        handed to a background job owned by user_id, so the caller does not
+        wait for them and can follow the job through the status API.
 
         Args:
             record_id: ID of the record to delete
+            user_id: ID of the user deleting (for authorization); None skips the check
 
         Returns:
-            Tuple of (success: bool, message: str)
+            Tuple of (success: bool, message: str, job_id: str or None)
         """
         try:
-            result = self.db.records.delete_one({'_id': ObjectId(record_id)})
+            record_filter = self._record_filter(record_id, user_id)
+            comment_filter = {'record_id': id_filter(record_id)}
+            job_id = None
+
+            # Bounded count: only need to know whether the thread is "large"
+            comment_count = self.db.comments.count_documents(
+                comment_filter, limit=self.LARGE_THREAD_COMMENTS + 1
+            )
+
+            if comment_count > self.LARGE_THREAD_COMMENTS:
+                result = self.db.records.delete_one(record_filter)
+                if result.deleted_count > 0:
+                    _, _, job_id = job_runner.enqueue(
+                        'purge_record_comments',
+                        {'record_id': record_id},
+                        idempotency_key=f'purge_record_comments:{record_id}',
+                        user_id=user_id
+                    )
+            elif self.db.supports_transactions:
+                with self.db.client.start_session() as db_session:
+                    result = db_session.with_transaction(
+                        lambda s: self._delete_with_comments(record_filter, comment_filter, s)
+                    )
+            else:
+                result = self._delete_with_comments(record_filter, comment_filter)
 
             if result.deleted_count > 0:
-                return True, "Record deleted successfully!"
+                return True, "Record deleted successfully!", job_id
+            elif user_id is not None and self._exists(record_id):
+                return False, "You can only delete your own records!", None
             else:
-                return False, "Record not found!"
+                return False, "Record not found!", None
 
+        except Exception as e:
+            return False, f"Error: {str(e)}", None
+
+    def _record_filter(self, record_id: str, user_id: Optional[str] = None) -> dict:
+        """Filter matching a record by ID, and by owner when user_id is given"""
+        query = {'_id': to_object_id(record_id)}
+        if user_id is not None:
+            query['user_id'] = id_filter(user_id)
+        return query
+
+    def _exists(self, record_id: str) -> bool:
+        """Check whether a record exists (only used after a write matched nothing)"""
+        return self.db.records.count_documents({'_id': to_object_id(record_id)}, limit=1) > 0
+
+    def _delete_with_comments(self, record_filter: dict, comment_filter: dict, db_session=None):
+        """Delete a record, then its comments if the record existed"""
+        result = self.db.records.delete_one(record_filter, session=db_session)
+        if result.deleted_count > 0:
+            self.db.comments.delete_many(comment_filter, session=db_session)
+        return result
+
+    def _owned_filter(self, record_ids: List[str], user_id: str) -> dict:
+        """
+        Filter matching the given records only if they belong to user_id
+
+        Raises:
+            ValueError: If no IDs, too many IDs or an invalid ID is given
+        """
+        if not record_ids:
+            raise ValueError("No records selected!")
+        if len(record_ids) > self.MAX_BULK_RECORDS:
+            raise ValueError(f"Select at most {self.MAX_BULK_RECORDS} records at a time!")
+        return {
+            '_id': {'$in': [to_object_id(record_id) for record_id in set(record_ids)]},
+            'user_id': id_filter(user_id)
+        }
+
+    def bulk_update_records(self, record_ids: List[str], user_id: str,
+                            status: Optional[str] = None,
+                            category: Optional[str] = None) -> tuple[bool, str]:
+        """
+        Set the status and/or category of many records in one update
+
+        Ownership is part of the update filter, so records of other users
+        are never touched (they are simply not counted).
+
+        Args:
+            record_ids: IDs of the records to update
+            user_id: ID of the user performing the update
+            status: New status (one of STATUSES)
+            category: New category (one of CATEGORIES)
+
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        try:
+            changes = {}
+            if status is not None:
+                if status not in self.STATUSES:
+                    return False, "Invalid status!"
+                changes['status'] = status
+            if category is not None:
+                if category not in self.CATEGORIES:
+                    return False, "Invalid category!"
+                changes['category'] = category
+            if not changes:
+                return False, "Nothing to update!"
+            changes['updated_at'] = datetime.utcnow()
+
+            result = self.db.records.update_many(
+                self._owned_filter(record_ids, user_id),
+                {'$set': changes}
+            )
+
+            if result.matched_count > 0:
+                return True, f"{result.matched_count} record(s) updated successfully!"
+            else:
+                return False, "No matching records found!"
+
+        except ValueError as e:
+            return False, str(e)
         except Exception as e:
             return False, f"Error: {str(e)}"
 
+    def bulk_delete_records(self, record_ids: List[str],
+                            user_id: str) -> tuple[bool, str, Optional[str]]:
+        """
+        Delete many records and their comments
+
+        Works like delete_record for a whole selection: one query finds the
+        selected records the user owns, then a single delete_many removes
+        them and another their comments (in one transaction when
+        supported, or through a background job for very large threads).
+
+        Args:
+            record_ids: IDs of the records to delete
+            user_id: ID of the user performing the delete
+
+        Returns:
+            Tuple of (success: bool, message: str, job_id: str or None);
+            job_id is the comment purge job of very large threads, owned by user_id
+        """
+        try:
+            owned = [r['_id'] for r in self.db.records.find(
+                self._owned_filter(record_ids, user_id), {'_id': 1})]
+            if not owned:
+                return False, "No matching records found!", None
+            job_id = None
+
+            record_filter = {'_id': {'$in': owned}}
+            comment_filter = {'record_id': ids_filter(owned)}
+
+            # Bounded count: only need to know whether the threads are "large"
+            comment_count = self.db.comments.count_documents(
+                comment_filter, limit=self.LARGE_THREAD_COMMENTS + 1
+            )
+
+            if comment_count > self.LARGE_THREAD_COMMENTS:
+                result = self.db.records.delete_many(record_filter)
+                _, _, job_id = job_runner.enqueue('purge_record_comments',
+                                                  {'record_ids': [str(oid) for oid in owned]},
+                                                  user_id=user_id)
+            elif self.db.supports_transactions:
+                with self.db.client.start_session() as db_session:
+                    result = db_session.with_transaction(
+                        lambda s: self._delete_many_with_comments(record_filter, comment_filter, s)
+                    )
+            else:
+                result = self._delete_many_with_comments(record_filter, comment_filter)
+
+            return True, f"{result.deleted_count} record(s) deleted successfully!", job_id
+
+        except ValueError as e:
+            return False, str(e), None
+        except Exception as e:
+            return False, f"Error: {str(e)}", None
+
+    def _delete_many_with_comments(self, record_filter: dict, comment_filter: dict, db_session=None):
+        """Delete records, then the comments on them"""
+        result = self.db.records.delete_many(record_filter, session=db_session)
+        self.db.comments.delete_many(comment_filter, session=db_session)
+        return result
+
+    def list_changed_records(self, user_id: str, since: Optional[datetime] = None,
+                             after: Optional[str] = None,
+                             limit: int = 1000) -> tuple[List[dict], Optional[str]]:
+        """
+        Get a page of a user's records changed since a point in time
+
+        Used by the desktop client to keep its local copy up to date. Without
+        `since` every record is returned, in _id order (this also covers
+        records written before updated_at existed). Errors are raised rather
+        than swallowed, so a failed read is never taken for "no changes".
+
+        Args:
+            user_id: Owner of the records
+            since: Only records with updated_at at or after this time
+            after: Cursor returned with the previous page
+            limit: Records per page
+
+        Returns:
+            Tuple of (record documents, next_cursor: str or None)
+        """
+        query = {'user_id': id_filter(user_id)}
+        if since is None:
+            sort_spec, tag = [('_id', ASCENDING)], 'sync_all'
+        else:
+            sort_spec, tag = self.SYNC_SORT, 'sync'
+            query['updated_at'] = {'$gte': since}
+
+        last_key = decode_cursor(after, tag, key_types(sort_spec))
+        if last_key is not None:
+            query = {'$and': [query, keyset_filter(sort_spec, last_key)]}
+
+        docs = list(self.db.records.find(query, {'user_id': 0}).sort(sort_spec).limit(limit + 1))
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(tag, sort_values(docs[-1], sort_spec))
+        return docs, next_cursor
+
+    def list_record_ids(self, user_id: str) -> List[str]:
+        """
+        Get the IDs of all of a user's records (errors are raised, see list_changed_records)
+
+        Args:
+            user_id: Owner of the records
+
+        Returns:
+            Record IDs as strings
+        """
+        return [str(doc['_id']) for doc in self.db.records.find({'user_id': id_filter(user_id)}, {'_id': 1})]
+
+    def get_records_by_ids(self, user_id: str, record_ids: List[str]) -> List[dict]:
+        """
+        Get some of a user's records by ID (errors are raised, see list_changed_records)
+
+        Args:
+            user_id: Owner of the records (others are not returned)
+            record_ids: Record IDs
+
+        Returns:
+            Record documents, like list_changed_records
+        """
+        return list(self.db.records.find(
+            {'_id': {'$in': [to_object_id(record_id) for record_id in record_ids]},
+             'user_id': id_filter(user_id)},
+            {'user_id': 0}
+        ))
+
+    def iter_record_chunks(self, user_id: str, chunk_size: int = 500,
+                           projection: Optional[dict] = None) -> Iterator[List[dict]]:
+        """
+        Stream a user's records oldest first, one chunk at a time
+
+        Only one chunk is held in memory, so this is safe for exports of
+        very large collections. Errors are raised rather than swallowed so a
+        partial export is never mistaken for a complete one.
+
+        Args:
+            user_id: User ID
+            chunk_size: Records per chunk (also used as the cursor batch size)
+            projection: Optional field projection
+
+        Yields:
+            Lists of record documents
+        """
+        cursor = (self.db.records.find({'user_id': id_filter(user_id)}, projection)
+                  .sort([('date_added', 1), ('_id', 1)])
+                  .batch_size(chunk_size))
+
+        chunk = []
+        for record in cursor:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def iter_raw_records(self, user_id: Optional[str] = None, projection: Optional[dict] = None,
+                         batch_size: int = 1000) -> Iterator[RawBSONDocument]:
+        """
+        Stream records as undecoded BSON, in _id order
+
+        For exports and other scans over very many documents: nothing is
+        decoded until a field is read, and doc.raw can be written out
+        directly. Errors are raised (see iter_record_chunks).
+
+        Args:
+            user_id: Only this user's records (if None, every record)
+            projection: Optional field projection
+            batch_size: Documents per server round trip
+
+        Yields:
+            RawBSONDocument per record
+        """
+        query = {'user_id': id_filter(user_id)} if user_id else {}
+        yield from (self.db.raw('records').find(query, projection)
+                    .sort('_id', 1)
+                    .batch_size(batch_size))
+
+    @coalesce('summary_stats')
     def get_summary_stats(self, user_id: str) -> Dict:
         """
         Get comprehensive summary statistics for a user's records
@@ -156,17 +607,19 @@ class RecordModel:
             Dictionary containing comprehensive statistics
         """
         try:
+            owner = id_filter(user_id)
+
             # Total counts
-            total = self.db.records.count_documents({'user_id': user_id})
+            total = self.db.records.count_documents({'user_id': owner})
 
             # Status breakdown
-            active = self.db.records.count_documents({'user_id': user_id, 'status': 'Active'})
-            inactive = self.db.records.count_documents({'user_id': user_id, 'status': 'Inactive'})
-            completed = self.db.records.count_documents({'user_id': user_id, 'status': 'Completed'})
+            active = self.db.records.count_documents({'user_id': owner, 'status': 'Active'})
+            inactive = self.db.records.count_documents({'user_id': owner, 'status': 'Inactive'})
+            completed = self.db.records.count_documents({'user_id': owner, 'status': 'Completed'})
 
             # Category breakdown
             category_pipeline = [
-                {'$match': {'user_id': user_id}},
+                {'$match': {'user_id': owner}},
                 {'$group': {'_id': '$category', 'count': {'$sum': 1}}}
             ]
             category_results = self.db.records.aggregate(category_pipeline)
@@ -179,17 +632,17 @@ class RecordModel:
             month_start = datetime(now.year, now.month, 1)
 
             today_count = self.db.records.count_documents({
-                'user_id': user_id,
+                'user_id': owner,
                 'date_added': {'$gte': today_start}
             })
 
             week_count = self.db.records.count_documents({
-                'user_id': user_id,
+                'user_id': owner,
                 'date_added': {'$gte': week_start}
             })
 
             month_count = self.db.records.count_documents({
-                'user_id': user_id,
+                'user_id': owner,
                 'date_added': {'$gte': month_start}
             })
 
@@ -197,7 +650,7 @@ class RecordModel:
             thirty_days_ago = now - timedelta(days=30)
             activity_pipeline = [
                 {'$match': {
-                    'user_id': user_id,
+                    'user_id': owner,
                     'date_added': {'$gte': thirty_days_ago}
                 }},
                 {'$group': {
@@ -215,10 +668,12 @@ class RecordModel:
             recent_activity = {item['_id']: item['count'] for item in activity_results}
 
             # Most recent and oldest records
-            recent_records = list(self.db.records.find({'user_id': user_id})
-                                 .sort('date_added', -1).limit(5))
-            oldest_records = list(self.db.records.find({'user_id': user_id})
-                                 .sort('date_added', 1).limit(5))
+            recent_records = list(self.db.records.find(
+                {'user_id': owner},
+                {'title': 1, 'category': 1, 'status': 1, 'date_added': 1}
+            ).sort('date_added', -1).limit(5))
+            oldest_records = list(self.db.records.find({'user_id': owner}, {'date_added': 1})
+                                 .sort('date_added', 1).limit(1))
 
             # Format recent records
             recent_list = [{
@@ -271,3 +726,121 @@ class RecordModel:
                 'date_range': {'first_record': None, 'last_record': None},
                 'generated_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
             }
+
+    def get_summary_stats_bulk(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get summary statistics for many users at once
+
+        Produces the same dictionaries as get_summary_stats, but each
+        aggregation covers the whole list of users, so the number of queries
+        does not grow with the number of users. Requires MongoDB 5.2+ ($topN).
+        Errors are raised so batch jobs never render a report from empty stats.
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            Dictionary of {user_id: statistics}
+        """
+        now = datetime.utcnow()
+        today_start = datetime(now.year, now.month, now.day)
+        week_start = today_start - timedelta(days=now.weekday())
+        month_start = datetime(now.year, now.month, 1)
+        thirty_days_ago = now - timedelta(days=30)
+
+        def count_if(condition):
+            return {'$sum': {'$cond': [condition, 1, 0]}}
+
+        stats = {user_id: {
+            'total': 0,
+            'status_breakdown': {'active': 0, 'inactive': 0, 'completed': 0},
+            'by_category': {},
+            'time_stats': {'today': 0, 'this_week': 0, 'this_month': 0},
+            'recent_activity': {},
+            'recent_records': [],
+            'date_range': {'first_record': None, 'last_record': None},
+            'generated_at': now.strftime('%Y-%m-%d %H:%M:%S')
+        } for user_id in user_ids}
+
+        # Counts, date range and most recent records per user
+        totals_pipeline = [
+            {'$match': {'user_id': ids_filter(user_ids)}},
+            {'$group': {
+                '_id': {'$toString': '$user_id'},
+                'total': {'$sum': 1},
+                'active': count_if({'$eq': ['$status', 'Active']}),
+                'inactive': count_if({'$eq': ['$status', 'Inactive']}),
+                'completed': count_if({'$eq': ['$status', 'Completed']}),
+                'today': count_if({'$gte': ['$date_added', today_start]}),
+                'this_week': count_if({'$gte': ['$date_added', week_start]}),
+                'this_month': count_if({'$gte': ['$date_added', month_start]}),
+                'first_record': {'$min': '$date_added'},
+                'last_record': {'$max': '$date_added'},
+                'recent': {'$topN': {
+                    'n': 5,
+                    'sortBy': {'date_added': -1},
+                    'output': {
+                        'id': {'$toString': '$_id'},
+                        'title': '$title',
+                        'category': '$category',
+                        'status': '$status',
+                        'date_added': '$date_added'
+                    }
+                }}
+            }}
+        ]
+        for item in self.db.records.aggregate(totals_pipeline):
+            user_stats = stats[item['_id']]
+            user_stats['total'] = item['total']
+            user_stats['status_breakdown'] = {
+                'active': item['active'],
+                'inactive': item['inactive'],
+                'completed': item['completed']
+            }
+            user_stats['time_stats'] = {
+                'today': item['today'],
+                'this_week': item['this_week'],
+                'this_month': item['this_month']
+            }
+            user_stats['date_range'] = {
+                'first_record': item['first_record'].strftime('%Y-%m-%d'),
+                'last_record': item['last_record'].strftime('%Y-%m-%d')
+            }
+            user_stats['recent_records'] = [{
+                'id': r['id'],
+                'title': r['title'],
+                'category': r['category'],
+                'status': r['status'],
+                'date': r['date_added'].strftime('%Y-%m-%d %H:%M:%S')
+            } for r in item['recent']]
+
+        # Category breakdown
+        category_pipeline = [
+            {'$match': {'user_id': ids_filter(user_ids)}},
+            {'$group': {
+                '_id': {'user_id': {'$toString': '$user_id'}, 'category': '$category'},
+                'count': {'$sum': 1}
+            }}
+        ]
+        for item in self.db.records.aggregate(category_pipeline):
+            stats[item['_id']['user_id']]['by_category'][item['_id']['category']] = item['count']
+
+        # Recent activity - records created in last 30 days grouped by user and day
+        activity_pipeline = [
+            {'$match': {
+                'user_id': ids_filter(user_ids),
+                'date_added': {'$gte': thirty_days_ago}
+            }},
+            {'$group': {
+                '_id': {
+                    'user_id': {'$toString': '$user_id'},
+                    'day': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$date_added'}}
+                },
+                'count': {'$sum': 1}
+            }},
+            {'$sort': {'_id.day': 1}}
+        ]
+        for item in self.db.records.aggregate(activity_pipeline):
+            stats[item['_id']['user_id']]['recent_activity'][item['_id']['day']] = item['count']
+
+        return stats
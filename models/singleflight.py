@@ -0,0 +1,121 @@
+"""
+Request coalescing (single-flight) for expensive calls
+
+When several threads ask for the same thing at the same time (a refresh storm,
+a double-clicked Export), only the first caller runs the computation. Everyone
+else waits for that call and receives the same result.
+
+Works for the Flask threaded server and for the desktop app's background
+workers, since both share the models from this package.
+"""
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """A computation in flight, shared by every caller with the same key"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._calls_total: Dict[str, int] = {}
+        self._executions: Dict[str, int] = {}
+
+    def do(self, key: tuple, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) unless a call with the same key is in flight
+
+        Args:
+            key: Hashable tuple; key[0] is the namespace used for metrics
+            fn: Function to execute
+            *args, **kwargs: Arguments passed to fn
+
+        Returns:
+            The result of fn, possibly computed by another thread
+        """
+        namespace = key[0]
+
+        with self._lock:
+            self._calls_total[namespace] = self._calls_total.get(namespace, 0) + 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._executions[namespace] = self._executions.get(namespace, 0) + 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the key before waking waiters so later callers recompute
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get coalescing metrics per namespace
+
+        Returns:
+            Dictionary of {namespace: {'calls', 'executions', 'saved', 'in_flight'}}
+        """
+        with self._lock:
+            in_flight: Dict[str, int] = {}
+            for key in self._calls:
+                in_flight[key[0]] = in_flight.get(key[0], 0) + 1
+
+            return {
+                namespace: {
+                    'calls': calls,
+                    'executions': self._executions.get(namespace, 0),
+                    'saved': calls - self._executions.get(namespace, 0),
+                    'in_flight': in_flight.get(namespace, 0)
+                }
+                for namespace, calls in self._calls_total.items()
+            }
+
+
+# Process-wide instance shared by models, routes and the desktop app
+flights = SingleFlight()
+
+
+def coalesce(namespace: str):
+    """
+    Decorator that coalesces concurrent calls to a model method
+
+    The model instance is left out of the key: every model shares the
+    Database singleton, so calls from different instances are equivalent.
+    Callers receive the same result object and must not mutate it.
+
+    Args:
+        namespace: Name used in the key and in the metrics
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (namespace, args, tuple(sorted(kwargs.items())))
+            return flights.do(key, method, self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,170 @@
+"""
+Compact value objects for listed records and comments
+
+Rows keep the raw ObjectIds and datetimes from MongoDB and only turn them
+into strings when a template or view actually reads them; the formatted
+value is then cached on the row. __slots__ keeps each row to a single small
+object instead of a tuple plus a handful of new strings.
+
+Record behaves like the (id, title, description, category, date_added,
+status) tuple returned before, and Comment like the comment dictionary,
+so existing templates and views keep working unchanged.
+"""
+from datetime import datetime
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class Record:
+    """A record row, indexable like (id, title, description, category, date_added, status)"""
+
+    __slots__ = ('_id', 'title', 'description', 'category', 'date_added', 'status',
+                 'truncated', '_id_text', '_date_text')
+
+    def __init__(self, _id, title: str, description: str, category: str,
+                 date_added: datetime, status: str, truncated: bool = False):
+        self._id = _id
+        self.title = title
+        self.description = description
+        self.category = category
+        self.date_added = date_added
+        self.status = status
+        # True when description is a server-side preview of a longer text
+        self.truncated = truncated
+        self._id_text = None
+        self._date_text = None
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> 'Record':
+        """Build a row from a records document (or a preview projection of one)"""
+        return cls(doc['_id'], doc['title'], doc['description'], doc['category'],
+                   doc['date_added'], doc['status'], doc.get('truncated', False))
+
+    @property
+    def id(self) -> str:
+        """Record ID as a hex string"""
+        if self._id_text is None:
+            self._id_text = str(self._id)
+        return self._id_text
+
+    @property
+    def date(self) -> str:
+        """date_added formatted as 'YYYY-MM-DD HH:MM:SS'"""
+        if self._date_text is None:
+            self._date_text = self.date_added.strftime(DATE_FORMAT)
+        return self._date_text
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += 6
+        if index == 0:
+            return self.id
+        if index == 1:
+            return self.title
+        if index == 2:
+            return self.description
+        if index == 3:
+            return self.category
+        if index == 4:
+            return self.date
+        if index == 5:
+            return self.status
+        raise IndexError('Record index out of range')
+
+    def __len__(self):
+        return 6
+
+    def __iter__(self):
+        yield self.id
+        yield self.title
+        yield self.description
+        yield self.category
+        yield self.date
+        yield self.status
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Record({self.id!r}, {self.title!r})"
+
+
+class Comment:
+    """A comment row, readable as attributes or like the comment dictionary"""
+
+    __slots__ = ('_id', '_record_id', '_user_id', 'username', 'content',
+                 'created', 'updated', '_id_text', '_created_text')
+
+    KEYS = ('id', 'record_id', 'user_id', 'username', 'content', 'created_at', 'updated_at')
+
+    def __init__(self, _id, record_id, user_id, username: str, content: str,
+                 created: datetime, updated: datetime):
+        self._id = _id
+        self._record_id = record_id
+        self._user_id = user_id
+        self.username = username
+        self.content = content
+        self.created = created
+        self.updated = updated
+        self._id_text = None
+        self._created_text = None
+
+    @classmethod
+    def from_doc(cls, doc: dict, username: str) -> 'Comment':
+        """Build a row from a comments document"""
+        return cls(doc['_id'], doc['record_id'], doc['user_id'], username,
+                   doc['content'], doc['created_at'], doc['updated_at'])
+
+    @property
+    def id(self) -> str:
+        """Comment ID as a hex string (read several times per rendered comment)"""
+        if self._id_text is None:
+            self._id_text = str(self._id)
+        return self._id_text
+
+    @property
+    def record_id(self) -> str:
+        return str(self._record_id)
+
+    @property
+    def user_id(self) -> str:
+        return str(self._user_id)
+
+    @property
+    def created_at(self) -> str:
+        """created_at formatted as 'YYYY-MM-DD HH:MM:SS'"""
+        if self._created_text is None:
+            self._created_text = self.created.strftime(DATE_FORMAT)
+        return self._created_text
+
+    @property
+    def updated_at(self) -> str:
+        """updated_at formatted as 'YYYY-MM-DD HH:MM:SS'"""
+        return self.updated.strftime(DATE_FORMAT)
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def to_dict(self) -> dict:
+        """Plain dictionary with formatted values (for JSON)"""
+        return {key: getattr(self, key) for key in self.KEYS}
+
+    def edited(self, content: str, updated: datetime) -> 'Comment':
+        """Copy of the comment with edited content (rows may be shared, so they are not changed)"""
+        return Comment(self._id, self._record_id, self._user_id, self.username,
+                       content, self.created, updated)
+
+    def __repr__(self):
+        return f"Comment({self.id!r}, {self.username!r})"
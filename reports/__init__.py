@@ -0,0 +1,8 @@
+"""
+Reports package
+PDF report rendering, generation and background export jobs
+
+Submodules are imported explicitly rather than re-exported here, so that
+importing pdf_render (as batch worker processes do) does not create any
+models or database connections.
+"""
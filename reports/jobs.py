@@ -0,0 +1,209 @@
+"""
+Background PDF export jobs
+
+Exports run as jobs of the durable job runner (models/job_runner.py)
+instead of inside the request, and finished PDFs are cached on disk by a
+fingerprint of the statistics they were rendered from. Exporting unchanged
+data again is just a file read.
+
+Full-appendix exports list every record and comment, which the statistics
+do not cover, so they are rendered straight to a per-job file instead.
+Every file is removed by a delayed cleanup job: full-appendix files JOB_TTL
+after they are written, cached files CACHE_TTL after (their fingerprint
+includes the day, so they are not reused after that anyway).
+
+The export handlers are registered by the ReportJobManager that the web app
+creates, so only web processes claim export jobs and the PDFs end up on the
+disk that serves the downloads (the desktop app runs the same job runner
+but never creates a manager).
+"""
+import os
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+from typing import Optional
+from models import job_runner
+from .pdf_report import record_model, comment_model, export_pdf_report
+from .pdf_render import build_pdf_report, report_fingerprint
+
+
+class ReportExportError(Exception):
+    """An export failed with a message meant for the user"""
+
+
+class ReportJobManager:
+    """Queues PDF exports on the job runner and caches the resulting files"""
+
+    JOB_NAME = 'pdf_export'
+    CLEANUP_JOB_NAME = 'pdf_export_cleanup'
+
+    # Exports run before maintenance jobs such as comment purges
+    PRIORITY = 10
+
+    # Full-appendix files are removed this long after they are written
+    JOB_TTL = timedelta(hours=1)
+
+    # Cached (fingerprinted) files are removed this long after they are written
+    CACHE_TTL = timedelta(days=1)
+
+    def __init__(self, cache_dir: str, max_pending: int = 8, runner=job_runner):
+        """
+        Initialize job manager and register the export handlers
+
+        Args:
+            cache_dir: Directory for cached PDF files
+            max_pending: Maximum queued plus running exports before refusing new ones
+            runner: JobRunner the exports run on
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._sweep()
+
+        self.max_pending = max_pending
+        self.runner = runner
+        runner.register(self.JOB_NAME, self._run)
+        runner.register(self.CLEANUP_JOB_NAME, self._remove_file)
+
+    def submit(self, user_id: str, username: str,
+               full_appendix: bool = False) -> tuple[bool, str, Optional[str]]:
+        """
+        Queue a PDF export
+
+        A user with the same kind of export already queued or running gets
+        that job back.
+
+        Args:
+            user_id: User ID
+            username: Username for display in report
+            full_appendix: Include the listing of every record and comment
+
+        Returns:
+            Tuple of (success: bool, message: str, job_id: str or None)
+        """
+        try:
+            jobs = self.runner.db.jobs
+            active = {'name': self.JOB_NAME, 'status': {'$in': ['queued', 'running']}}
+
+            existing = jobs.find_one({**active, 'user_id': user_id,
+                                      'payload.full_appendix': full_appendix}, {'_id': 1})
+            if existing:
+                return True, "Report is already being generated", str(existing['_id'])
+
+            if jobs.count_documents(active, limit=self.max_pending) >= self.max_pending:
+                return False, "Too many reports are being generated. Please try again shortly.", None
+
+            success, message, job_id = self.runner.enqueue(
+                self.JOB_NAME,
+                {'user_id': user_id, 'username': username, 'full_appendix': full_appendix},
+                priority=self.PRIORITY,
+                max_attempts=2,
+                user_id=user_id
+            )
+            if not success:
+                return False, message, None
+            return True, "Report queued", job_id
+
+        except Exception as e:
+            return False, f"Error: {str(e)}", None
+
+    def get(self, job_id: str, user_id: str) -> Optional[dict]:
+        """
+        Get the state of an export owned by user_id
+
+        Args:
+            job_id: Job ID
+            user_id: ID of the user asking (for authorization)
+
+        Returns:
+            Dictionary with id, status, message, path, cached and username,
+            or None if not found (or its file has been removed)
+        """
+        job = self.runner.get_job(job_id, user_id)
+        if not job or job['name'] != self.JOB_NAME:
+            return None
+
+        result = job['result'] or {}
+        if job['status'] == 'done' and not os.path.exists(result.get('path') or ''):
+            return None
+
+        if job['status'] == 'done':
+            message = "PDF generated successfully"
+        elif job['status'] == 'failed':
+            # Stored as "ExceptionType: message"
+            message = (job['error'] or "Error generating PDF").split(': ', 1)[-1]
+        elif job['status'] == 'running':
+            message = "Generating report"
+        else:
+            message = "Report queued"
+
+        return {
+            'id': job['id'],
+            'status': job['status'],
+            'message': message,
+            'path': result.get('path'),
+            'cached': result.get('cached', False),
+            'username': result.get('username')
+        }
+
+    def _run(self, payload: dict) -> dict:
+        """Job: render (or reuse) the PDF of an export"""
+        user_id, username = payload['user_id'], payload['username']
+
+        if payload['full_appendix']:
+            return self._run_full(user_id, username)
+
+        try:
+            record_stats = record_model.get_summary_stats(user_id)
+            comment_stats = comment_model.get_comment_stats(user_id)
+            fingerprint = report_fingerprint(username, record_stats, comment_stats)
+            path = os.path.join(self.cache_dir, f'{fingerprint}.pdf')
+
+            cached = os.path.exists(path)
+            if not cached:
+                pdf_bytes = build_pdf_report(username, record_stats, comment_stats)
+
+                # Write to a temp file first so readers never see a partial PDF
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.part')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(pdf_bytes)
+                os.replace(tmp_path, path)
+                self._schedule_removal(path, self.CACHE_TTL)
+
+        except ImportError:
+            raise ReportExportError("reportlab library not installed. Run: pip install reportlab")
+
+        return {'path': path, 'cached': cached, 'username': username}
+
+    def _run_full(self, user_id: str, username: str) -> dict:
+        """Stream a full-appendix report to its own file"""
+        path = os.path.join(self.cache_dir, f'full-{uuid.uuid4().hex}.pdf')
+        success, message = export_pdf_report(user_id, username, path, full_appendix=True)
+        if not success:
+            raise ReportExportError(message)
+
+        # Full-appendix files belong to one job; fingerprinted files are shared
+        self._schedule_removal(path, self.JOB_TTL)
+        return {'path': path, 'cached': False, 'username': username}
+
+    def _sweep(self):
+        """Remove files older than CACHE_TTL that no cleanup job covers (e.g. crashed writes)"""
+        cutoff = time.time() - self.CACHE_TTL.total_seconds()
+        for entry in os.scandir(self.cache_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _schedule_removal(self, path: str, ttl: timedelta):
+        """Queue the cleanup job removing a written file once ttl has passed"""
+        self.runner.enqueue(self.CLEANUP_JOB_NAME, {'path': path}, delay=ttl.total_seconds())
+
+    def _remove_file(self, payload: dict) -> dict:
+        """Job: remove an expired report file"""
+        path = payload['path']
+        if os.path.exists(path):
+            os.remove(path)
+            return {'removed': True}
+        return {'removed': False}
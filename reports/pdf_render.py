@@ -0,0 +1,330 @@
+"""
+PDF report rendering
+Lays out the analytics report with reportlab from already fetched data.
+
+Nothing here touches the database, so it is safe to call from worker
+processes (see scripts/batch_reports.py).
+"""
+import hashlib
+import json
+from functools import lru_cache
+from io import BytesIO
+from typing import Iterable, Optional
+
+# Rows per appendix table; tables split across pages by themselves
+APPENDIX_CHUNK_ROWS = 100
+
+# Rows listed per appendix section. reportlab's canvas keeps every finished
+# page until save(), about 0.45 KB per row with page compression, so this
+# caps a full-appendix export at roughly 10 MB
+APPENDIX_MAX_ROWS = 10000
+
+
+def report_fingerprint(username: str, record_stats: dict, comment_stats: dict) -> str:
+    """
+    Fingerprint the data a report is rendered from
+
+    Only the day of the generation timestamp is included (the report
+    prints the date, not the time), so unchanged data maps to the same
+    fingerprint for the rest of the day and a cached PDF never shows an
+    outdated "Generated on" date.
+
+    Args:
+        username: Username shown in the report
+        record_stats: Result of RecordModel.get_summary_stats
+        comment_stats: Result of CommentModel.get_comment_stats
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {
+        'username': username,
+        'generated_on': generated_on(record_stats),
+        'records': {k: v for k, v in record_stats.items() if k != 'generated_at'},
+        'comments': comment_stats
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def generated_on(record_stats: dict) -> str:
+    """Date part ('YYYY-MM-DD') of the statistics' generated_at timestamp"""
+    return record_stats['generated_at'].split(' ')[0]
+
+
+def build_pdf_report(username: str, record_stats: dict, comment_stats: dict) -> bytes:
+    """
+    Render the summary PDF report from already fetched statistics
+
+    Args:
+        username: Username for display in report
+        record_stats: Result of RecordModel.get_summary_stats
+        comment_stats: Result of CommentModel.get_comment_stats
+
+    Returns:
+        PDF file contents
+
+    Raises:
+        ImportError: If reportlab is not installed
+    """
+    buffer = BytesIO()
+    write_pdf_report(buffer, username, record_stats, comment_stats)
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+
+    return pdf_bytes
+
+
+def write_pdf_report(output, username: str, record_stats: dict, comment_stats: dict,
+                     appendix: Optional[Iterable] = None):
+    """
+    Render the PDF report to a file path or binary file object
+
+    Appendix flowables are pulled lazily while pages are laid out, so only
+    a few appendix tables exist at any time. The finished pages are still
+    held (compressed) by the canvas until the file is saved, so memory
+    grows with the page count; appendix_flowables caps the listing at
+    APPENDIX_MAX_ROWS rows per section to bound it.
+
+    Args:
+        output: File path or writable binary file object
+        username: Username for display in report
+        record_stats: Result of RecordModel.get_summary_stats
+        comment_stats: Result of CommentModel.get_comment_stats
+        appendix: Optional iterable of flowables (see appendix_flowables)
+
+    Raises:
+        ImportError: If reportlab is not installed
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+
+    # Compress pages for long appendices: the canvas keeps page data until save
+    if appendix is None:
+        doc = SimpleDocTemplate(output, pagesize=letter)
+    else:
+        doc = _streaming_doc_template()(output, appendix, pagesize=letter, pageCompression=1)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+
+    heading_style = section_heading_style()
+
+    # Title
+    elements.append(Paragraph("Smart Records System", title_style))
+    elements.append(Paragraph(f"Analytics Report for {username}", styles['Heading2']))
+    elements.append(Paragraph(f"Generated on: {generated_on(record_stats)}", styles['Normal']))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Overview Section
+    elements.append(Paragraph("Overview", heading_style))
+    overview_data = [
+        ['Metric', 'Value'],
+        ['Total Records', str(record_stats['total'])],
+        ['Active Records', str(record_stats['status_breakdown']['active'])],
+        ['Completed Records', str(record_stats['status_breakdown']['completed'])],
+        ['Inactive Records', str(record_stats['status_breakdown']['inactive'])],
+        ['Total Comments', str(comment_stats['total_comments'])],
+        ['Comments on My Records', str(comment_stats['comments_on_my_records'])],
+    ]
+
+    if record_stats['date_range']['first_record']:
+        overview_data.append(['First Record Date', record_stats['date_range']['first_record']])
+    if record_stats['date_range']['last_record']:
+        overview_data.append(['Last Record Date', record_stats['date_range']['last_record']])
+
+    overview_table = Table(overview_data, colWidths=[3*inch, 3*inch])
+    overview_table.setStyle(table_style())
+    elements.append(overview_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Time-based Statistics
+    elements.append(Paragraph("Recent Activity", heading_style))
+    time_data = [
+        ['Period', 'Records Created'],
+        ['Today', str(record_stats['time_stats']['today'])],
+        ['This Week', str(record_stats['time_stats']['this_week'])],
+        ['This Month', str(record_stats['time_stats']['this_month'])],
+    ]
+    time_table = Table(time_data, colWidths=[3*inch, 3*inch])
+    time_table.setStyle(table_style())
+    elements.append(time_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Category Breakdown
+    if record_stats['by_category']:
+        elements.append(Paragraph("Records by Category", heading_style))
+        category_data = [['Category', 'Count']]
+        for category, count in sorted(record_stats['by_category'].items()):
+            category_data.append([category, str(count)])
+
+        category_table = Table(category_data, colWidths=[3*inch, 3*inch])
+        category_table.setStyle(table_style())
+        elements.append(category_table)
+        elements.append(Spacer(1, 0.3*inch))
+
+    # Top Commented Records
+    if comment_stats['top_commented_records']:
+        elements.append(Paragraph("Most Commented Records", heading_style))
+        commented_data = [['Record Title', 'Comments']]
+        for item in comment_stats['top_commented_records']:
+            title = item['record_title'][:40] + '...' if len(item['record_title']) > 40 else item['record_title']
+            commented_data.append([title, str(item['comment_count'])])
+
+        commented_table = Table(commented_data, colWidths=[4*inch, 2*inch])
+        commented_table.setStyle(table_style())
+        elements.append(commented_table)
+        elements.append(Spacer(1, 0.3*inch))
+
+    # Recent Records
+    if record_stats['recent_records']:
+        elements.append(Paragraph("Recent Records (Last 5)", heading_style))
+        recent_data = [['Title', 'Category', 'Status', 'Date']]
+        for record in record_stats['recent_records']:
+            title = record['title'][:30] + '...' if len(record['title']) > 30 else record['title']
+            recent_data.append([
+                title,
+                record['category'],
+                record['status'],
+                record['date'].split(' ')[0]
+            ])
+
+        recent_table = Table(recent_data, colWidths=[2.2*inch, 1.5*inch, 1.3*inch, 1.5*inch])
+        recent_table.setStyle(table_style(header_font_size=10, body_font_size=9))
+        elements.append(recent_table)
+
+    if appendix is not None:
+        elements.append(PageBreak())
+
+    # Build PDF
+    doc.build(elements)
+
+    if appendix is not None and not doc.exhausted:
+        raise RuntimeError("PDF build stopped before the end of the appendix")
+
+
+@lru_cache(maxsize=None)
+def _streaming_doc_template():
+    """
+    Document template that pulls flowables from an iterator while it lays out pages
+
+    Uses the documented DocTemplate hooks: filterFlowables runs before each
+    flowable is handled and handle_flowable consumes the front of the list,
+    so topping up the list given to build() in both keeps only a short
+    window of flowables in memory instead of the whole document. (Both
+    hooks also see reportlab's internal lists, which are left alone.)
+    Finished pages are not covered: the canvas keeps them until save().
+    """
+    from reportlab.platypus import SimpleDocTemplate
+
+    class StreamingDocTemplate(SimpleDocTemplate):
+        # Flowables kept queued ahead (keepWithNext looks past the first one)
+        LOOKAHEAD = 3
+
+        def __init__(self, output, tail: Iterable, **kwargs):
+            super().__init__(output, **kwargs)
+            self._tail = iter(tail)
+            self._flowables = None
+            self.exhausted = False
+
+        def build(self, flowables, *args, **kwargs):
+            self._flowables = flowables
+            self.top_up(flowables)
+            super().build(flowables, *args, **kwargs)
+
+        def top_up(self, flowables: list):
+            if flowables is not self._flowables:
+                return
+            while not self.exhausted and len(flowables) < self.LOOKAHEAD:
+                try:
+                    flowables.append(next(self._tail))
+                except StopIteration:
+                    self.exhausted = True
+
+        def filterFlowables(self, flowables):
+            self.top_up(flowables)
+            super().filterFlowables(flowables)
+
+        def handle_flowable(self, flowables):
+            super().handle_flowable(flowables)
+            # Refill before the build loop checks whether anything is left
+            self.top_up(flowables)
+
+    return StreamingDocTemplate
+
+
+@lru_cache(maxsize=None)
+def table_style(header_font_size: int = 12, body_font_size: int = 10):
+    """Shared table style, built once per font size pair and reused by every table"""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2a2a2a')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), header_font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), body_font_size),
+    ])
+
+
+@lru_cache(maxsize=None)
+def section_heading_style():
+    """Section heading style"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    return ParagraphStyle(
+        'CustomHeading',
+        parent=getSampleStyleSheet()['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#2a2a2a'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+
+
+@lru_cache(maxsize=None)
+def cell_style():
+    """Wrapping paragraph style for long appendix cells"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    return ParagraphStyle('AppendixCell', parent=getSampleStyleSheet()['Normal'],
+                          fontSize=8, leading=10)
+
+
+def appendix_table(header: list, rows: list, col_widths: list):
+    """Build one appendix table chunk with a repeating header row"""
+    from reportlab.platypus import Table
+
+    table = Table([header] + rows, colWidths=col_widths, repeatRows=1)
+    table.setStyle(table_style(header_font_size=9, body_font_size=8))
+    return table
+
+
+def escape_text(text: str) -> str:
+    """Escape text for use inside a reportlab Paragraph"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def clip_text(text: str, limit: int) -> str:
+    """Clip very long text so a single cell cannot exceed a page"""
+    return text[:limit] + '...' if len(text) > limit else text
@@ -0,0 +1,177 @@
+"""
+PDF report generation
+Fetches report data and renders it with reportlab (see pdf_render.py)
+"""
+import os
+import tempfile
+from typing import Iterator
+from models import RecordModel, CommentModel, flights
+from .pdf_render import (APPENDIX_CHUNK_ROWS, APPENDIX_MAX_ROWS, build_pdf_report, write_pdf_report,
+                         section_heading_style, cell_style, appendix_table, escape_text, clip_text)
+
+record_model = RecordModel()
+comment_model = CommentModel()
+
+# Records fetched from the cursor per round trip for the appendix
+APPENDIX_FETCH_SIZE = 500
+
+
+def generate_pdf_report(user_id: str, username: str) -> tuple[bool, str, bytes]:
+    """
+    Generate the summary PDF report of user statistics including comments
+
+    The summary has a fixed number of sections, so it is returned in
+    memory; concurrent exports for the same user share a single render.
+    Reports with the full appendix grow with the listing and are written
+    to a file instead (see export_pdf_report).
+
+    Args:
+        user_id: User ID
+        username: Username for display in report
+
+    Returns:
+        Tuple of (success: bool, message: str, pdf_bytes: bytes)
+    """
+    return flights.do(('pdf_report', user_id, username), _render_pdf_report, user_id, username)
+
+
+def _render_pdf_report(user_id: str, username: str) -> tuple[bool, str, bytes]:
+    """Fetch statistics and build the summary PDF report; see generate_pdf_report"""
+    try:
+        # Get statistics
+        record_stats = record_model.get_summary_stats(user_id)
+        comment_stats = comment_model.get_comment_stats(user_id)
+
+        pdf_bytes = build_pdf_report(username, record_stats, comment_stats)
+        return True, "PDF generated successfully", pdf_bytes
+
+    except ImportError:
+        return False, "reportlab library not installed. Run: pip install reportlab", b''
+    except Exception as e:
+        return False, f"Error generating PDF: {str(e)}", b''
+
+
+def export_pdf_report(user_id: str, username: str, path: str,
+                      full_appendix: bool = False) -> tuple[bool, str]:
+    """
+    Write a PDF report straight to a file
+
+    The PDF is streamed to a temporary file next to `path` and moved into
+    place when complete, so `path` never holds a partial PDF. Memory grows
+    with the page count (reportlab keeps finished pages until the file is
+    saved) and is bounded by the appendix row cap, see appendix_flowables.
+
+    Args:
+        user_id: User ID
+        username: Username for display in report
+        path: Destination file
+        full_appendix: Append a listing of every record and comment
+
+    Returns:
+        Tuple of (success: bool, message: str)
+    """
+    tmp_path = None
+    try:
+        record_stats = record_model.get_summary_stats(user_id)
+        comment_stats = comment_model.get_comment_stats(user_id)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.part')
+        with os.fdopen(fd, 'wb') as f:
+            appendix = appendix_flowables(user_id) if full_appendix else None
+            write_pdf_report(f, username, record_stats, comment_stats, appendix)
+        os.replace(tmp_path, path)
+        tmp_path = None
+
+        return True, "PDF generated successfully"
+
+    except ImportError:
+        return False, "reportlab library not installed. Run: pip install reportlab"
+    except Exception as e:
+        return False, f"Error generating PDF: {str(e)}"
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def appendix_flowables(user_id: str) -> Iterator:
+    """
+    Generate the full record and comment listing for a user's report
+
+    Records are read from a cursor in chunks and turned into fixed-size
+    tables as the document is laid out; nothing is collected up front.
+    A second pass over the record IDs streams the comments on them. Each
+    section lists at most APPENDIX_MAX_ROWS rows and then says it was cut
+    short (the full data is available from scripts/export_records.py).
+
+    Args:
+        user_id: User ID
+
+    Yields:
+        reportlab flowables
+    """
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph
+
+    heading_style = section_heading_style()
+    text_style = cell_style()
+
+    yield Paragraph("Appendix A: All Records", heading_style)
+    header = ['Title', 'Category', 'Status', 'Date Added']
+    projection = {'title': 1, 'category': 1, 'status': 1, 'date_added': 1}
+    rows = []
+    listed, truncated = 0, False
+    for chunk in record_model.iter_record_chunks(user_id, APPENDIX_FETCH_SIZE, projection):
+        for record in chunk:
+            if listed >= APPENDIX_MAX_ROWS:
+                truncated = True
+                break
+            listed += 1
+            rows.append([
+                Paragraph(escape_text(record['title']), text_style),
+                record['category'],
+                record['status'],
+                record['date_added'].strftime('%Y-%m-%d %H:%M')
+            ])
+            if len(rows) >= APPENDIX_CHUNK_ROWS:
+                yield appendix_table(header, rows, [3*inch, 1.2*inch, 1*inch, 1.3*inch])
+                rows = []
+        if truncated:
+            break
+    if rows:
+        yield appendix_table(header, rows, [3*inch, 1.2*inch, 1*inch, 1.3*inch])
+        rows = []
+    if truncated:
+        yield _truncated_note('records', text_style)
+
+    yield Paragraph("Appendix B: All Comments on My Records", heading_style)
+    header = ['Record', 'Author', 'Date', 'Comment']
+    listed, truncated = 0, False
+    for chunk in record_model.iter_record_chunks(user_id, APPENDIX_FETCH_SIZE, {'title': 1}):
+        titles = {str(r['_id']): r['title'] for r in chunk}
+        for comment in comment_model.iter_comments_for_records(list(titles)):
+            if listed >= APPENDIX_MAX_ROWS:
+                truncated = True
+                break
+            listed += 1
+            rows.append([
+                Paragraph(escape_text(titles.get(str(comment['record_id']), 'Unknown')), text_style),
+                comment['username'],
+                comment['created_at'].strftime('%Y-%m-%d %H:%M'),
+                Paragraph(escape_text(clip_text(comment['content'], 1000)), text_style)
+            ])
+            if len(rows) >= APPENDIX_CHUNK_ROWS:
+                yield appendix_table(header, rows, [1.6*inch, 1*inch, 1.1*inch, 2.8*inch])
+                rows = []
+        if truncated:
+            break
+    if rows:
+        yield appendix_table(header, rows, [1.6*inch, 1*inch, 1.1*inch, 2.8*inch])
+    if truncated:
+        yield _truncated_note('comments', text_style)
+
+
+def _truncated_note(kind: str, style):
+    """Note ending an appendix section that hit APPENDIX_MAX_ROWS"""
+    from reportlab.platypus import Paragraph
+
+    return Paragraph(f"Only the first {APPENDIX_MAX_ROWS:,} {kind} are listed.", style)
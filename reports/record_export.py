@@ -0,0 +1,86 @@
+"""
+Record export writers
+Stream records to BSON, JSON Lines or CSV one document at a time.
+
+Writers take RawBSONDocument (see Database.raw) or plain dicts. With raw
+documents the BSON writer copies the received bytes straight to the file
+without decoding anything; the JSON Lines and CSV writers decode each
+(projected) document once, when its first field is read.
+"""
+import csv
+import io
+from typing import BinaryIO, Iterable, Mapping
+
+import bson
+from bson import json_util
+from bson.raw_bson import RawBSONDocument
+
+# Fields exported for each record, in CSV column order (after the ID)
+EXPORT_FIELDS = ('title', 'description', 'category', 'status', 'date_added')
+EXPORT_PROJECTION = {field: 1 for field in EXPORT_FIELDS}
+
+
+def write_bson(docs: Iterable[Mapping], output: BinaryIO) -> int:
+    """
+    Write documents as concatenated BSON (readable by bsondump and mongorestore)
+
+    Returns:
+        Number of documents written
+    """
+    count = 0
+    for doc in docs:
+        output.write(doc.raw if isinstance(doc, RawBSONDocument) else bson.encode(doc))
+        count += 1
+    return count
+
+
+def write_jsonl(docs: Iterable[Mapping], output: BinaryIO) -> int:
+    """
+    Write documents as Extended JSON, one per line
+
+    Returns:
+        Number of documents written
+    """
+    count = 0
+    for doc in docs:
+        line = json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS)
+        output.write(line.encode('utf-8'))
+        output.write(b'\n')
+        count += 1
+    return count
+
+
+def write_csv(docs: Iterable[Mapping], output: BinaryIO) -> int:
+    """
+    Write documents as CSV with an id column followed by EXPORT_FIELDS
+
+    Returns:
+        Number of documents written
+    """
+    text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(('id',) + EXPORT_FIELDS)
+
+    count = 0
+    for doc in docs:
+        writer.writerow((
+            str(doc['_id']),
+            doc.get('title', ''),
+            doc.get('description', ''),
+            doc.get('category', ''),
+            doc.get('status', ''),
+            doc['date_added'].strftime('%Y-%m-%d %H:%M:%S') if doc.get('date_added') else ''
+        ))
+        count += 1
+
+    # Hand the underlying file back to the caller
+    text.flush()
+    text.detach()
+    return count
+
+
+WRITERS = {
+    'bson': write_bson,
+    'jsonl': write_jsonl,
+    'csv': write_csv
+}
@@ -1,9 +1,27 @@
-from flask import Blueprint, request, redirect, url_for, session, flash, jsonify
-from models import CommentModel
+from flask import Blueprint, request, redirect, url_for, session, flash, jsonify, render_template
+from models import CommentModel, RecordModel
 from .auth_routes import login_required
 
 comment_bp = Blueprint('comment', __name__)
 comment_model = CommentModel()
+record_model = RecordModel()
+
+
+@comment_bp.route('/comments/<record_id>')
+@login_required
+def list_comments(record_id):
+    """Get the next page of a record's comments (for "Load more")"""
+    if not record_model.read_record(record_id, session.get('user_id')):
+        return jsonify({'error': 'Record not found'}), 404
+
+    comments, next_cursor = comment_model.list_comments(record_id, after=request.args.get('after'))
+
+    return jsonify({
+        'comments': [comment.to_dict() for comment in comments],
+        'html': ''.join(render_template('_comment.html', comment=comment, record_id=record_id)
+                        for comment in comments),
+        'next_cursor': next_cursor
+    })
 
 
 @comment_bp.route('/add/<record_id>', methods=['POST'])
@@ -0,0 +1,20 @@
+"""
+Background job routes
+"""
+from flask import Blueprint, session, jsonify
+from models import job_runner
+from .auth_routes import login_required
+
+job_bp = Blueprint('job', __name__)
+
+
+@job_bp.route('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    """Poll the status of a background job owned by the current user"""
+    job = job_runner.get_job(job_id, session.get('user_id'))
+
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return jsonify(job)
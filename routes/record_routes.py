@@ -1,7 +1,8 @@
 """
 Record routes for CRUD operations
 """
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+from datetime import datetime, timedelta
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, make_response
 from models import RecordModel, CommentModel
 from .auth_routes import login_required
 
@@ -10,14 +11,56 @@ record_model = RecordModel()
 comment_model = CommentModel()
 
 
+def parse_date(value):
+    """Parse a YYYY-MM-DD query parameter, or None if missing or invalid"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d') if value else None
+    except ValueError:
+        return None
+
+
 @record_bp.route('/dashboard')
 @login_required
 def dashboard():
     user_id = session.get('user_id')
     username = session.get('username')
-    records = record_model.read_all_records(user_id)
 
-    return render_template('index.html', username=username, records=records)
+    # Filters and sort from the query string, e.g. /dashboard?status=Active&sort=oldest
+    filters = {
+        'status': request.args.get('status') if request.args.get('status') in RecordModel.STATUSES else '',
+        'category': request.args.get('category') if request.args.get('category') in RecordModel.CATEGORIES else '',
+        'date_from': request.args.get('date_from', '') if parse_date(request.args.get('date_from')) else '',
+        'date_to': request.args.get('date_to', '') if parse_date(request.args.get('date_to')) else '',
+        'sort': request.args.get('sort') if request.args.get('sort') in RecordModel.SORTS else 'newest'
+    }
+    date_to = parse_date(filters['date_to'])
+
+    records, next_cursor, received = record_model.list_records(
+        user_id,
+        status=filters['status'] or None,
+        category=filters['category'] or None,
+        date_from=parse_date(filters['date_from']),
+        # The "to" date is inclusive
+        date_to=date_to + timedelta(days=1) if date_to else None,
+        sort=filters['sort'],
+        after=request.args.get('after')
+    )
+
+    response = make_response(render_template(
+        'index.html',
+        username=username,
+        records=records,
+        filters=filters,
+        # Non-empty filters, carried over into the paging links
+        filter_args={key: value for key, value in filters.items() if value},
+        statuses=RecordModel.STATUSES,
+        categories=RecordModel.CATEGORIES,
+        next_cursor=next_cursor,
+        paged=bool(request.args.get('after'))
+    ))
+    # BSON bytes read from MongoDB for this listing
+    response.headers['X-Listing-Bytes'] = str(received)
+    return response
 
 
 @record_bp.route('/add', methods=['GET', 'POST'])
@@ -64,7 +107,8 @@ def edit_record(record_id):
             flash('All fields are required!', 'error')
             return redirect(url_for('record.edit_record', record_id=record_id))
 
-        success, message = record_model.update_record(record_id, title, description, category, status)
+        success, message = record_model.update_record(record_id, title, description, category, status,
+                                                      user_id)
 
         if success:
             flash(message, 'success')
@@ -74,12 +118,7 @@ def edit_record(record_id):
             return redirect(url_for('record.edit_record', record_id=record_id))
 
     # Get record details
-    records = record_model.read_all_records(user_id)
-    record = None
-    for r in records:
-        if r[0] == record_id:
-            record = r
-            break
+    record = record_model.read_record(record_id, user_id)
 
     if not record:
         flash('Record not found!', 'error')
@@ -91,16 +130,51 @@ def edit_record(record_id):
 @record_bp.route('/delete/<record_id>', methods=['POST'])
 @login_required
 def delete_record(record_id):
-    success, message = record_model.delete_record(record_id)
+    success, message, job_id = record_model.delete_record(record_id, session.get('user_id'))
 
     if success:
-        flash(message, 'success')
+        flash(_with_job(message, job_id), 'success')
     else:
         flash(message, 'error')
 
     return redirect(url_for('record.dashboard'))
 
 
+def _with_job(message: str, job_id):
+    """Point to the status of a background comment purge started by a delete"""
+    if not job_id:
+        return message
+    return f"{message} Comments are being removed in the background ({url_for('job.job_status', job_id=job_id)})."
+
+
+@record_bp.route('/records/bulk', methods=['POST'])
+@login_required
+def bulk_records():
+    """Apply one action (status, category or delete) to the selected records"""
+    user_id = session.get('user_id')
+    record_ids = request.form.getlist('record_ids')
+    action = request.form.get('action')
+    value = request.form.get('value') or None
+
+    if action == 'status':
+        success, message = record_model.bulk_update_records(record_ids, user_id, status=value)
+    elif action == 'category':
+        success, message = record_model.bulk_update_records(record_ids, user_id, category=value)
+    elif action == 'delete':
+        success, message, job_id = record_model.bulk_delete_records(record_ids, user_id)
+        message = _with_job(message, job_id)
+    else:
+        success, message = False, 'Unknown action!'
+
+    flash(message, 'success' if success else 'error')
+
+    # Back to the same filtered listing
+    filters = {key: request.form.get(f'filter_{key}')
+               for key in ('status', 'category', 'date_from', 'date_to', 'sort')
+               if request.form.get(f'filter_{key}')}
+    return redirect(url_for('record.dashboard', **filters))
+
+
 @record_bp.route('/view/<record_id>')
 @login_required
 def view_record(record_id):
@@ -108,31 +182,17 @@ def view_record(record_id):
     user_id = session.get('user_id')
     username = session.get('username')
 
-    # Get record details
-    record_doc = record_model.get_record_by_id(record_id)
+    # Get record details (only if it belongs to the user)
+    record = record_model.read_record(record_id, user_id)
 
-    if not record_doc:
+    if not record:
         flash('Record not found!', 'error')
         return redirect(url_for('record.dashboard'))
 
-    # Check if record belongs to user
-    if record_doc['user_id'] != user_id:
-        flash('You do not have permission to view this record!', 'error')
-        return redirect(url_for('record.dashboard'))
-
-    # Format record
-    record = (
-        str(record_doc['_id']),
-        record_doc['title'],
-        record_doc['description'],
-        record_doc['category'],
-        record_doc['date_added'].strftime('%Y-%m-%d %H:%M:%S'),
-        record_doc['status']
-    )
-
-    # Get comments for this record
-    comments = comment_model.get_comments_by_record(record_id)
-    comment_count = len(comments)
+    # First page of comments; the rest is fetched by "Load more"
+    comments, next_cursor = comment_model.list_comments(record_id)
+    comment_count = comment_model.get_comment_count_by_record(record_id)
 
-    return render_template('view_record.html', record=record, comments=comments,
-                         comment_count=comment_count, username=username)
+    return render_template('view_record.html', record=record, record_id=record_id,
+                         comments=comments, comment_count=comment_count,
+                         next_cursor=next_cursor, username=username)
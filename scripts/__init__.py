@@ -0,0 +1,5 @@
+"""
+Command line maintenance scripts
+
+Run from the project root, e.g. python -m scripts.batch_reports --help
+"""
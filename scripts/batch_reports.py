@@ -0,0 +1,195 @@
+"""
+Batch PDF report generation for every user
+
+Fans report rendering out across a process pool. The parent process reads
+users in chunks and fetches their statistics in bulk (a fixed number of
+queries per chunk); workers only lay out PDFs and never touch the database.
+
+Output goes to a directory with a manifest.json describing every report.
+Re-running with the same --out resumes: users already marked done whose file
+still exists are skipped. Use --force to regenerate everything.
+
+Usage (from the project root):
+    python -m scripts.batch_reports --out reports_2026_10
+    python -m scripts.batch_reports --out reports_2026_10 --workers 8 --chunk-size 100
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from reports.pdf_render import build_pdf_report
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def render_report(out_dir: str, user_id: str, username: str,
+                  record_stats: dict, comment_stats: dict) -> tuple[str, bool, str, str]:
+    """
+    Render one user's report to out_dir (runs in a worker process)
+
+    Returns:
+        Tuple of (user_id, success, message, filename)
+    """
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', username)
+    filename = f'report_{safe_name}_{user_id}.pdf'
+    path = os.path.join(out_dir, filename)
+
+    try:
+        pdf_bytes = build_pdf_report(username, record_stats, comment_stats)
+
+        # Write under a temporary name so an interrupted run never leaves a partial PDF
+        tmp_path = path + '.part'
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+
+        return user_id, True, "PDF generated successfully", filename
+
+    except ImportError:
+        return user_id, False, "reportlab library not installed. Run: pip install reportlab", filename
+    except Exception as e:
+        return user_id, False, f"Error generating PDF: {str(e)}", filename
+
+
+def load_manifest(out_dir: str) -> dict:
+    """Load the manifest from a previous run, or start a new one"""
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'started_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'), 'reports': {}}
+
+
+def save_manifest(out_dir: str, manifest: dict):
+    """Write the manifest atomically"""
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest['updated_at'] = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    with open(path + '.part', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.part', path)
+
+
+def is_done(out_dir: str, entry: dict) -> bool:
+    """Check whether a manifest entry refers to a finished report on disk"""
+    return (entry.get('status') == 'done'
+            and os.path.exists(os.path.join(out_dir, entry['file'])))
+
+
+def iter_user_chunks(db, chunk_size: int):
+    """Yield lists of (user_id, username) from the users collection"""
+    chunk = []
+    for user in db.users.find({}, {'username': 1}).sort('_id', 1).batch_size(chunk_size):
+        chunk.append((str(user['_id']), user['username']))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(out_dir: str, workers: int, chunk_size: int, force: bool) -> int:
+    """
+    Generate reports for every user
+
+    Returns:
+        Number of failed reports
+    """
+    from models import Database, RecordModel, CommentModel
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    entries = manifest['reports']
+
+    db = Database()
+    record_model = RecordModel()
+    comment_model = CommentModel()
+
+    total = db.users.count_documents({})
+    done = skipped = failed = 0
+    started = time.time()
+
+    def record_result(future):
+        nonlocal done, failed
+        user_id, success, message, filename = future.result()
+        entries[user_id].update({
+            'status': 'done' if success else 'failed',
+            'message': message,
+            'file': filename,
+            'finished_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        })
+        done += 1
+        if not success:
+            failed += 1
+
+        processed = done + skipped
+        rate = done / max(time.time() - started, 1e-6)
+        mark = '✓' if success else '✕'
+        print(f"{mark} [{processed}/{total}] {entries[user_id]['username']} "
+              f"({rate:.1f} reports/s){'' if success else ' - ' + message}")
+
+    print(f"Generating reports for {total} users with {workers} workers → {out_dir}")
+
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in iter_user_chunks(db, chunk_size):
+            todo = [(user_id, username) for user_id, username in chunk
+                    if force or not is_done(out_dir, entries.get(user_id, {}))]
+            skipped += len(chunk) - len(todo)
+            if not todo:
+                continue
+
+            user_ids = [user_id for user_id, _ in todo]
+            record_stats = record_model.get_summary_stats_bulk(user_ids)
+            comment_stats = comment_model.get_comment_stats_bulk(user_ids)
+
+            for user_id, username in todo:
+                entries[user_id] = {'username': username, 'status': 'queued'}
+                pending.add(pool.submit(render_report, out_dir, user_id, username,
+                                        record_stats[user_id], comment_stats[user_id]))
+
+            # Keep the pool busy while fetching the next chunk, but bound the backlog
+            while len(pending) > workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record_result(future)
+            save_manifest(out_dir, manifest)
+
+        for future in wait(pending).done:
+            record_result(future)
+
+    save_manifest(out_dir, manifest)
+
+    elapsed = time.time() - started
+    print()
+    print(f"✓ {done - failed} generated, {skipped} skipped (already done), "
+          f"{failed} failed in {elapsed:.1f}s")
+    return failed
+
+
+def main():
+    """Parse arguments and run the batch"""
+    parser = argparse.ArgumentParser(description="Generate a PDF report for every user")
+    parser.add_argument('--out', required=True, help="Output directory (also used to resume)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument('--chunk-size', type=int, default=100,
+                        help="Users whose stats are fetched per bulk query (default: 100)")
+    parser.add_argument('--force', action='store_true',
+                        help="Regenerate reports already marked done in the manifest")
+    args = parser.parse_args()
+
+    load_dotenv()
+    failed = run(args.out, args.workers, args.chunk_size, args.force)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
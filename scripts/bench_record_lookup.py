@@ -0,0 +1,157 @@
+"""
+Benchmark single-record lookups at scale
+
+Seeds a database with --records records (1,000,000 by default, spread over
+--users owners) unless it already holds that many, then times:
+
+- RecordModel.read_record(record_id, user_id): the owner-checked point
+  lookup used by the view, edit and delete routes
+- the former edit-page path: read_all_records() plus a linear scan for the
+  ID (only --scan-samples times, as each one reads the whole collection)
+
+The lookup's query plan is checked for collection scans. The script exits
+with status 1 if it finds one or if the p95 latency exceeds --max-p95-ms,
+so it can be used as a regression check.
+
+Always point it at a scratch database:
+    MONGODB_DB=smart_records_bench python -m scripts.bench_record_lookup
+    MONGODB_DB=smart_records_bench python -m scripts.bench_record_lookup --records 100000 --scan-samples 0
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bson.objectid import ObjectId
+from dotenv import load_dotenv
+
+SEED_BATCH = 10000
+
+
+def seed(db, total: int, users: int):
+    """Insert synthetic records until the collection holds `total`"""
+    existing = db.records.estimated_document_count()
+    if existing >= total:
+        print(f"✓ {existing} records already present, skipping seed")
+        return
+
+    owners = [ObjectId() for _ in range(users)]
+    start = datetime.utcnow() - timedelta(days=365)
+    started = time.time()
+    inserted = existing
+    print(f"→ Seeding {total - existing} records for {users} users")
+
+    while inserted < total:
+        count = min(SEED_BATCH, total - inserted)
+        db.records.insert_many([{
+            'user_id': owners[(inserted + i) % users],
+            'title': f'Benchmark record {inserted + i}',
+            'description': 'Lorem ipsum dolor sit amet. ' * 8,
+            'category': ('General', 'Important', 'Personal', 'Work', 'Other')[(inserted + i) % 5],
+            'date_added': start + timedelta(seconds=inserted + i),
+            'status': ('Active', 'Inactive', 'Completed')[(inserted + i) % 3]
+        } for i in range(count)], ordered=False)
+        inserted += count
+        print(f"  {inserted}/{total} ({(inserted - existing) / max(time.time() - started, 1e-6):.0f} docs/s)")
+
+
+def uses_collscan(plan: dict) -> bool:
+    """Check a query plan tree for a collection scan stage"""
+    if plan.get('stage') == 'COLLSCAN':
+        return True
+    children = plan.get('inputStages', []) + [plan[key] for key in ('inputStage', 'queryPlan') if key in plan]
+    return any(uses_collscan(child) for child in children)
+
+
+def percentiles(timings: list) -> str:
+    """Format median and p95 of a list of millisecond timings"""
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return f"median {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms"
+
+
+def run(records: int, users: int, samples: int, scan_samples: int, max_p95_ms: float) -> bool:
+    """
+    Seed, benchmark and check the lookup
+
+    Returns:
+        True if the lookup passed the regression checks
+    """
+    from models import Database, RecordModel, id_filter
+
+    db = Database()
+    record_model = RecordModel()
+
+    seed(db, records, users)
+    record_model.ensure_indexes()
+
+    sample = list(db.records.aggregate([
+        {'$sample': {'size': samples}},
+        {'$project': {'user_id': 1}}
+    ]))
+    targets = [(str(doc['_id']), str(doc['user_id'])) for doc in sample]
+    total = db.records.estimated_document_count()
+    print(f"\nBenchmarking against {total} records ({len(targets)} lookups)")
+
+    # Owner-checked point lookup
+    timings = []
+    for record_id, user_id in targets:
+        started = time.perf_counter()
+        record = record_model.read_record(record_id, user_id)
+        timings.append((time.perf_counter() - started) * 1000)
+        if record is None or record[0] != record_id:
+            print(f"✕ read_record returned the wrong result for {record_id}")
+            return False
+    lookup_p95 = sorted(timings)[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"read_record:            {percentiles(timings)}")
+
+    # Former edit-page path: read everything, then search in Python
+    if scan_samples:
+        timings = []
+        for record_id, _ in targets[:scan_samples]:
+            started = time.perf_counter()
+            next((r for r in record_model.read_all_records() if r[0] == record_id), None)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"read_all_records+scan:  {percentiles(timings)}")
+
+    # Query plan must not scan the collection
+    record_id, user_id = targets[0]
+    plan = db.records.find({'_id': ObjectId(record_id), 'user_id': id_filter(user_id)}).explain()
+    collscan = uses_collscan(plan['queryPlanner']['winningPlan'])
+
+    passed = not collscan and lookup_p95 <= max_p95_ms
+    print()
+    print(f"{'✓' if not collscan else '✕'} query plan {'scans the collection' if collscan else 'uses an index'}")
+    print(f"{'✓' if lookup_p95 <= max_p95_ms else '✕'} p95 {lookup_p95:.2f} ms (limit {max_p95_ms} ms)")
+    return passed
+
+
+def main():
+    """Parse arguments and run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark owner-checked record lookups")
+    parser.add_argument('--records', type=int, default=1000000,
+                        help="Records to seed the database with (default: 1000000)")
+    parser.add_argument('--users', type=int, default=1000,
+                        help="Owners the seeded records are spread over (default: 1000)")
+    parser.add_argument('--samples', type=int, default=500,
+                        help="Lookups to time (default: 500)")
+    parser.add_argument('--scan-samples', type=int, default=3,
+                        help="Full-scan lookups to time for comparison, 0 to skip (default: 3)")
+    parser.add_argument('--max-p95-ms', type=float, default=10.0,
+                        help="Fail if the lookup p95 exceeds this (default: 10)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    if os.getenv('MONGODB_DB', 'smart_records_db') == 'smart_records_db':
+        parser.error("set MONGODB_DB to a scratch database; this script inserts test data")
+
+    passed = run(args.records, args.users, args.samples, args.scan_samples, args.max_p95_ms)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Export records to a file
+
+Streams records in _id order through Database.raw, so documents are never
+turned into dicts unless a field has to be read, and only one cursor batch
+is held in memory. BSON output is a straight copy of the bytes received.
+
+--decoded runs the same export through the regular dict cursor, for
+comparing throughput and peak memory.
+
+Usage (from the project root):
+    python -m scripts.export_records --out records.bson
+    python -m scripts.export_records --out records.csv --format csv --user <user_id>
+    python -m scripts.export_records --out records.bson --decoded
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from reports.record_export import EXPORT_PROJECTION, WRITERS
+
+
+def run(out_path: str, fmt: str, user_id: str, batch_size: int, decoded: bool) -> int:
+    """
+    Export records to out_path
+
+    Returns:
+        Number of records written
+    """
+    from models import Database, RecordModel, id_filter
+
+    # BSON copies whole documents; the text formats only need the exported fields
+    projection = None if fmt == 'bson' else EXPORT_PROJECTION
+
+    if decoded:
+        query = {'user_id': id_filter(user_id)} if user_id else {}
+        docs = Database().records.find(query, projection).sort('_id', 1).batch_size(batch_size)
+    else:
+        docs = RecordModel().iter_raw_records(user_id, projection, batch_size)
+
+    started = time.time()
+    tmp_path = out_path + '.part'
+    with open(tmp_path, 'wb') as output:
+        count = WRITERS[fmt](docs, output)
+    os.replace(tmp_path, out_path)
+    elapsed = time.time() - started
+
+    # ru_maxrss is in kilobytes on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"✓ {count} records → {out_path} in {elapsed:.1f}s "
+          f"({count / max(elapsed, 1e-6):.0f} records/s, peak RSS {peak_mb:.0f} MB, "
+          f"{'decoded' if decoded else 'raw'} path)")
+    return count
+
+
+def main():
+    """Parse arguments and run the export"""
+    parser = argparse.ArgumentParser(description="Export records to BSON, JSON Lines or CSV")
+    parser.add_argument('--out', required=True, help="Output file")
+    parser.add_argument('--format', choices=sorted(WRITERS), default='bson',
+                        help="Output format (default: bson)")
+    parser.add_argument('--user', help="Only export this user's records")
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help="Documents per cursor batch (default: 1000)")
+    parser.add_argument('--decoded', action='store_true',
+                        help="Use the regular dict cursor instead of raw BSON (for comparison)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    run(args.out, args.format, args.user, args.batch_size, args.decoded)
+
+
+if __name__ == '__main__':
+    main()
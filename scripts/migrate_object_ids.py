@@ -0,0 +1,222 @@
+"""
+Convert string foreign keys to ObjectIds
+
+records.user_id, comments.record_id and comments.user_id were stored as hex
+strings. This rewrites them to native ObjectIds in batches of --batch-size
+documents, walking each collection in _id order. Progress is saved in the
+`migrations` collection after every batch, so an interrupted run resumes
+where it stopped. The models read both forms, so the app can keep running
+while this runs.
+
+Index sizes and query latency are measured before the first batch and after
+the last one and printed side by side. WiredTiger reuses freed index pages
+rather than returning them to the OS; run `compact` on the collections to
+see the smaller indexes on disk.
+
+Usage (from the project root):
+    python -m scripts.migrate_object_ids
+    python -m scripts.migrate_object_ids --batch-size 500 --pause 0.1
+    python -m scripts.migrate_object_ids --measure
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bson.objectid import ObjectId
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+
+MIGRATION_ID = 'object_id_foreign_keys'
+FIELDS = [('records', 'user_id'), ('comments', 'record_id'), ('comments', 'user_id')]
+
+
+def index_sizes(db) -> dict:
+    """Get {collection: {index name: bytes}} for the migrated collections"""
+    sizes = {}
+    for collection in sorted({collection for collection, _ in FIELDS}):
+        stats = db.db.command('collStats', collection)
+        sizes[collection] = stats.get('indexSizes', {})
+    return sizes
+
+
+def query_latency(db, samples: int) -> dict:
+    """
+    Time the foreign key lookups the app runs most often
+
+    Returns:
+        {query label: {'median_ms', 'p95_ms'}}
+    """
+    from models import id_filter
+
+    user_ids = [u['_id'] for u in db.users.find({}, {'_id': 1}).limit(samples)]
+    record_ids = [r['_id'] for r in db.records.find({}, {'_id': 1}).limit(samples)]
+
+    queries = {
+        'records by user': (user_ids, lambda uid: list(
+            db.records.find({'user_id': id_filter(uid)}, {'_id': 1}))),
+        'comments by record': (record_ids, lambda rid: db.comments.count_documents(
+            {'record_id': id_filter(rid)})),
+        'comments by user': (user_ids, lambda uid: db.comments.count_documents(
+            {'user_id': id_filter(uid)}))
+    }
+
+    latency = {}
+    for label, (ids, query) in queries.items():
+        timings = []
+        for value in ids:
+            started = time.perf_counter()
+            query(value)
+            timings.append((time.perf_counter() - started) * 1000)
+        if timings:
+            timings.sort()
+            latency[label] = {
+                'median_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3)
+            }
+    return latency
+
+
+def measure(db, samples: int) -> dict:
+    """Take a snapshot of index sizes and query latency"""
+    return {
+        'taken_at': datetime.utcnow(),
+        'index_sizes': index_sizes(db),
+        'latency': query_latency(db, samples)
+    }
+
+
+def migrate_field(db, collection: str, field: str, batch_size: int, pause: float) -> int:
+    """
+    Rewrite one string foreign key field to ObjectIds, resuming saved progress
+
+    Returns:
+        Number of documents converted by this run
+    """
+    coll = db.db[collection]
+    # Scan without building dicts: each batch document only needs _id and field
+    raw_coll = db.raw(collection)
+    state = db.migrations.find_one({'_id': MIGRATION_ID}) or {}
+    progress = state.get('progress', {}).get(collection, {}).get(field, {})
+    if progress.get('done'):
+        print(f"✓ {collection}.{field} already migrated")
+        return 0
+
+    last_id = progress.get('last_id')
+    remaining = coll.count_documents({field: {'$type': 'string'}})
+    prefix = f'progress.{collection}.{field}'
+    converted = 0
+    started = time.time()
+    print(f"→ {collection}.{field}: {remaining} documents to convert")
+
+    while True:
+        query = {field: {'$type': 'string'}}
+        if last_id is not None:
+            query['_id'] = {'$gt': last_id}
+        batch = list(raw_coll.find(query, {field: 1}).sort('_id', 1).limit(batch_size))
+        if not batch:
+            break
+
+        # Match on the old value too, so a concurrent edit is never overwritten
+        ops = [UpdateOne({'_id': doc['_id'], field: doc[field]},
+                         {'$set': {field: ObjectId(doc[field])}})
+               for doc in batch if ObjectId.is_valid(doc[field])]
+        invalid = len(batch) - len(ops)
+        modified = coll.bulk_write(ops, ordered=False).modified_count if ops else 0
+
+        converted += modified
+        last_id = batch[-1]['_id']
+        db.migrations.update_one(
+            {'_id': MIGRATION_ID},
+            {
+                '$set': {f'{prefix}.last_id': last_id, 'updated_at': datetime.utcnow()},
+                '$inc': {f'{prefix}.converted': modified, f'{prefix}.invalid': invalid}
+            },
+            upsert=True
+        )
+
+        rate = converted / max(time.time() - started, 1e-6)
+        print(f"  {converted}/{remaining} converted ({rate:.0f} docs/s)"
+              f"{f', {invalid} invalid skipped' if invalid else ''}")
+        if pause:
+            time.sleep(pause)
+
+    db.migrations.update_one(
+        {'_id': MIGRATION_ID},
+        {'$set': {f'{prefix}.done': True, 'updated_at': datetime.utcnow()}},
+        upsert=True
+    )
+    print(f"✓ {collection}.{field}: {converted} converted in {time.time() - started:.1f}s")
+    return converted
+
+
+def print_comparison(before: dict, after: dict):
+    """Print index sizes and latency before and after the migration"""
+    print()
+    print(f"{'Index':<45} {'Before':>12} {'After':>12}")
+    for collection, sizes in after['index_sizes'].items():
+        for name, size in sizes.items():
+            old = before['index_sizes'].get(collection, {}).get(name)
+            old_text = f"{old / 1024:.1f} KiB" if old is not None else '-'
+            print(f"{collection + '.' + name:<45} {old_text:>12} {size / 1024:>8.1f} KiB")
+
+    print()
+    print(f"{'Query (median / p95 ms)':<45} {'Before':>12} {'After':>12}")
+    for label, timing in after['latency'].items():
+        old = before['latency'].get(label)
+        old_text = f"{old['median_ms']:.2f}/{old['p95_ms']:.2f}" if old else '-'
+        print(f"{label:<45} {old_text:>12} {timing['median_ms']:.2f}/{timing['p95_ms']:.2f}")
+
+
+def run(batch_size: int, pause: float, samples: int, measure_only: bool):
+    """Migrate every field, measuring before and after"""
+    from models import Database
+
+    db = Database()
+
+    if measure_only:
+        snapshot = measure(db, samples)
+        print_comparison(snapshot, snapshot)
+        return
+
+    # Keep the first "before" snapshot across resumed runs
+    state = db.migrations.find_one({'_id': MIGRATION_ID}) or {}
+    before = state.get('before')
+    if before is None:
+        before = measure(db, samples)
+        db.migrations.update_one({'_id': MIGRATION_ID}, {'$set': {'before': before}}, upsert=True)
+
+    for collection, field in FIELDS:
+        migrate_field(db, collection, field, batch_size, pause)
+
+    after = measure(db, samples)
+    db.migrations.update_one(
+        {'_id': MIGRATION_ID},
+        {'$set': {'after': after, 'finished_at': datetime.utcnow()}}
+    )
+    print_comparison(before, after)
+
+
+def main():
+    """Parse arguments and run the migration"""
+    parser = argparse.ArgumentParser(description="Store foreign keys as ObjectIds")
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help="Documents converted per batch (default: 1000)")
+    parser.add_argument('--pause', type=float, default=0,
+                        help="Seconds to sleep between batches to limit load (default: 0)")
+    parser.add_argument('--samples', type=int, default=50,
+                        help="Lookups timed per query when measuring (default: 50)")
+    parser.add_argument('--measure', action='store_true',
+                        help="Only print current index sizes and query latency")
+    args = parser.parse_args()
+
+    load_dotenv()
+    run(args.batch_size, args.pause, args.samples, args.measure)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Remove comments whose record no longer exists
+
+Records deleted before deletes cascaded (or while a purge job was still
+pending) can leave comments behind. This sweep finds and deletes them in
+batches; it is safe to run repeatedly.
+
+Usage (from the project root):
+    python -m scripts.purge_orphan_comments --dry-run
+    python -m scripts.purge_orphan_comments --batch-size 500
+    python -m scripts.purge_orphan_comments --enqueue
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+
+def main():
+    """Parse arguments and run the sweep"""
+    parser = argparse.ArgumentParser(description="Delete comments left behind by deleted records")
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help="Record IDs checked per batch (default: 1000)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Only count the orphaned comments")
+    parser.add_argument('--enqueue', action='store_true',
+                        help="Queue the sweep as a background job instead of running it here")
+    args = parser.parse_args()
+
+    load_dotenv()
+    from models import CommentModel, job_runner
+
+    if args.enqueue:
+        success, message, job_id = job_runner.enqueue(
+            'purge_orphan_comments', {'batch_size': args.batch_size}, priority=-1
+        )
+        print(f"{'✓' if success else '✕'} {message}{f' ({job_id})' if job_id else ''}")
+        sys.exit(0 if success else 1)
+
+    started = time.time()
+    count = CommentModel().purge_orphans(args.batch_size, dry_run=args.dry_run)
+    verb = "found" if args.dry_run else "deleted"
+    print(f"✓ {count} orphaned comments {verb} in {time.time() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
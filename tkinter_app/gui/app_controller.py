@@ -2,11 +2,15 @@
 Main application controller
 Manages window, views, navigation, and state
 """
+import importlib
 import tkinter as tk
 from tkinter import messagebox
 import platform
 from gui.theme import Theme
+from gui.task_runner import TaskRunner
 from gui.widgets.notification import Notification
+from utils.data_service import DataService
+from utils.local_store import LocalStore
 from utils.session import SessionManager
 
 
@@ -14,8 +18,29 @@ class AppController(tk.Tk):
     """
     Main application window and controller
     Manages view switching, session state, and navigation
+
+    Views are built the first time they are shown, so startup only pays for
+    the login screen.
     """
 
+    # View name -> (module, class); imported and built on first show_view
+    VIEWS = {
+        'login': ('gui.views.login_view', 'LoginView'),
+        'signup': ('gui.views.signup_view', 'SignupView'),
+        'dashboard': ('gui.views.dashboard_view', 'DashboardView'),
+        'add_record': ('gui.views.add_record_view', 'AddRecordView'),
+        'edit_record': ('gui.views.edit_record_view', 'EditRecordView'),
+        'view_record': ('gui.views.view_record_view', 'ViewRecordView'),
+        'reports': ('gui.views.reports_view', 'ReportsView')
+    }
+
+    # Built one per idle moment after login, most used first
+    PREWARM_VIEWS = ('view_record', 'edit_record', 'add_record')
+
+    # Heavy or rarely used views, torn down a while after the user leaves them
+    EVICTABLE_VIEWS = ('reports', 'signup')
+    EVICT_AFTER_MS = 120000
+
     def __init__(self):
         super().__init__()
 
@@ -33,6 +58,19 @@ class AppController(tk.Tk):
         # Initialize session manager
         self.session = SessionManager()
 
+        # Worker threads for database calls (results come back via after())
+        self.tasks = TaskRunner(self)
+
+        # Cached record and comment access shared by the views, backed by a
+        # local copy of the user's data when the cache file can be opened
+        try:
+            store = LocalStore()
+        except Exception as e:
+            print(f"⚠ Local cache unavailable, working online only: {e}")
+            store = None
+        self.data = DataService(self.tasks, store)
+        self._online = True
+
         # Create notification system
         self.notification = Notification(self)
 
@@ -43,11 +81,11 @@ class AppController(tk.Tk):
         self.container = tk.Frame(self, bg=Theme.BG_LIGHT)
         self.container.pack(fill='both', expand=True)
 
-        # Dictionary to store views
+        # Views built so far, by name
         self.views = {}
-
-        # Initialize all views
-        self._initialize_views()
+        self.current_view = None
+        self._evict_jobs = {}
+        self._prewarm_job = None
 
         # Configure keyboard shortcuts
         self._setup_keyboard_shortcuts()
@@ -104,25 +142,65 @@ class AppController(tk.Tk):
             accelerator="Ctrl+R" if platform.system() != 'Darwin' else "Cmd+R"
         )
 
-    def _initialize_views(self):
-        """Initialize all application views"""
-        # Import views here to avoid circular imports
-        from gui.views.login_view import LoginView
-        from gui.views.signup_view import SignupView
-        from gui.views.dashboard_view import DashboardView
-        from gui.views.add_record_view import AddRecordView
-        from gui.views.edit_record_view import EditRecordView
-        from gui.views.view_record_view import ViewRecordView
-        from gui.views.reports_view import ReportsView
-
-        # Create view instances
-        self.views['login'] = LoginView(self.container, self)
-        self.views['signup'] = SignupView(self.container, self)
-        self.views['dashboard'] = DashboardView(self.container, self)
-        self.views['add_record'] = AddRecordView(self.container, self)
-        self.views['edit_record'] = EditRecordView(self.container, self)
-        self.views['view_record'] = ViewRecordView(self.container, self)
-        self.views['reports'] = ReportsView(self.container, self)
+    def get_view(self, view_name: str):
+        """
+        Get a view, building it on first use
+
+        Args:
+            view_name: Key of VIEWS
+
+        Returns:
+            The view instance
+        """
+        view = self.views.get(view_name)
+        if view is None:
+            # Imported here: avoids circular imports and keeps startup light
+            module_name, class_name = self.VIEWS[view_name]
+            view_class = getattr(importlib.import_module(module_name), class_name)
+            view = self.views[view_name] = view_class(self.container, self)
+        return view
+
+    def evict_view(self, view_name: str):
+        """
+        Destroy a view's widgets to reclaim memory (rebuilt when shown again)
+
+        Args:
+            view_name: Key of VIEWS
+        """
+        job = self._evict_jobs.pop(view_name, None)
+        if job is not None:
+            self.after_cancel(job)
+
+        view = self.views.get(view_name)
+        if view is None or view is self.current_view:
+            return
+        self.tasks.cancel(view)
+        del self.views[view_name]
+        view.destroy()
+
+    def _schedule_eviction(self, view_name: str):
+        """Evict a view if the user has not come back to it after EVICT_AFTER_MS"""
+        if view_name in self.EVICTABLE_VIEWS and view_name not in self._evict_jobs:
+            self._evict_jobs[view_name] = self.after(
+                self.EVICT_AFTER_MS, lambda: self.evict_view(view_name)
+            )
+
+    def _prewarm(self, remaining=None):
+        """Build the likely next views one at a time while the app is idle"""
+        if remaining is None:
+            remaining = [name for name in self.PREWARM_VIEWS if name not in self.views]
+        self._prewarm_job = None
+        if not remaining or not self.session.is_authenticated:
+            return
+
+        self.get_view(remaining[0])
+        if remaining[1:]:
+            self._prewarm_job = self.after_idle(lambda: self._prewarm(remaining[1:]))
+
+    def _cancel_prewarm(self):
+        if self._prewarm_job is not None:
+            self.after_cancel(self._prewarm_job)
+            self._prewarm_job = None
 
     def _setup_keyboard_shortcuts(self):
         """Setup keyboard shortcuts"""
@@ -171,16 +249,28 @@ class AppController(tk.Tk):
             self.show_notification("Please login to access this page", 'error')
             return
 
-        if view_name in self.views:
-            # Hide all views
-            for view in self.views.values():
-                view.hide()
+        if view_name in self.VIEWS:
+            view = self.get_view(view_name)
+            job = self._evict_jobs.pop(view_name, None)
+            if job is not None:
+                self.after_cancel(job)
+
+            # Hide the current view; results still loading for it are no longer wanted
+            previous = self.current_view
+            if previous is not None and previous is not view:
+                self.tasks.cancel(previous)
+                previous.hide()
+                self._schedule_eviction(self._view_name(previous))
 
             # Show target view
-            view = self.views[view_name]
+            self.current_view = view
             view.show()
             view.refresh(**kwargs)
 
+    def _view_name(self, view):
+        """Get the name a built view is registered under"""
+        return next((name for name, built in self.views.items() if built is view), None)
+
     def login(self, user_id: str, username: str):
         """
         Handle successful login
@@ -193,6 +283,34 @@ class AppController(tk.Tk):
         self.show_view('dashboard')
         self.show_notification(f"Welcome back, {username}!", 'success')
 
+        # Keep the local copy of the user's data in sync from now on
+        self._online = True
+        self.data.start_sync(user_id, username, self._on_synced)
+
+        # Build the views the user is likely to open next once the dashboard is up
+        self._cancel_prewarm()
+        self._prewarm_job = self.after_idle(self._prewarm)
+
+    def _on_synced(self, result: dict):
+        """Report a background sync and let the current view show what changed"""
+        if result['online'] != self._online:
+            self._online = result['online']
+            if self._online:
+                self.show_notification("Back online", 'success')
+            else:
+                self.show_notification("Working offline: changes will sync when connected", 'info')
+
+        if result['pushed']:
+            self.show_notification(f"Synced {result['pushed']} offline change(s)", 'success')
+        if result['rejected']:
+            self.show_notification(
+                f"{len(result['rejected'])} offline change(s) could not be saved: {result['rejected'][0]}",
+                'error'
+            )
+
+        if (result['changed'] or result['pushed']) and self.current_view is not None:
+            self.current_view.on_data_changed()
+
     def logout(self):
         """Handle logout"""
         if self.session.is_authenticated:
@@ -202,7 +320,13 @@ class AppController(tk.Tk):
             )
             if result:
                 self.session.logout()
+                self.data.clear()
                 self.show_view('login')
+                # Drop every view holding the previous user's data
+                self._cancel_prewarm()
+                for name in list(self.views):
+                    if name != 'login':
+                        self.evict_view(name)
                 self.show_notification("Logged out successfully", 'success')
         else:
             self.show_view('login')
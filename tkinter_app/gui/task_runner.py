@@ -0,0 +1,182 @@
+"""
+Background task runner for the desktop app
+Runs blocking model calls (MongoDB queries) on worker threads so the Tk event
+loop never waits for the database
+
+Tk widgets may only be touched from the main thread, so workers put their
+results on a queue and the main loop drains it with after(). Each view is an
+"owner" of its tasks: AppController.show_view cancels the tasks of the view
+being left, and a newer task under the same owner and key replaces an older
+one, so a slow query can never overwrite fresher data.
+
+Writes are submitted with cancellable=False: they are never replaced or
+dropped, only their callbacks are skipped once the owner is cancelled, and
+shutdown() waits for them.
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TaskRunner:
+    """Thread pool for model calls with results delivered on the Tk thread"""
+
+    def __init__(self, root, workers: int = 4, poll_ms: int = 16, budget_ms: float = 8.0):
+        """
+        Initialize task runner
+
+        Args:
+            root: Tk root window (used for after())
+            workers: Number of worker threads
+            poll_ms: Interval between queue checks while tasks are pending (about one frame)
+            budget_ms: Time spent delivering results per check before yielding to Tk
+        """
+        self.root = root
+        self.poll_ms = poll_ms
+        self.budget_ms = budget_ms
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ui-task')
+        self._results = queue.SimpleQueue()
+        # owner -> generation, bumped by cancel()
+        self._generations: Dict[Any, int] = {}
+        # (owner, key) -> (token of the newest task, its future)
+        self._latest: Dict[Tuple[Any, Hashable], Tuple[int, Any]] = {}
+        # token -> future of writes that have not been delivered yet
+        self._writes: Dict[int, Any] = {}
+        self._next_token = 0
+        self._pending = 0
+        self._poll_id = None
+
+    def submit(self, owner, fn: Callable, *args, key: Hashable = None,
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               cancellable: bool = True, **kwargs) -> int:
+        """
+        Run fn(*args, **kwargs) on a worker thread
+
+        The callbacks run on the Tk thread, and only if the task is still
+        current: not cancelled for its owner, and not replaced by a newer
+        task with the same owner and key.
+
+        Args:
+            owner: Object the task belongs to (normally the view)
+            fn: Blocking function to run
+            key: Tasks with the same owner and key replace each other
+            on_success: Called with the return value
+            on_error: Called with the exception if fn raises
+            cancellable: False for writes, which always run to completion
+                (key is then ignored; callbacks still need a live owner)
+
+        Returns:
+            Token identifying the task
+        """
+        self._next_token += 1
+        token = self._next_token
+        generation = self._generations.get(owner, 0)
+
+        if cancellable:
+            previous = self._latest.get((owner, key))
+            if previous is not None:
+                # Not started yet: drop it; already running: its result is ignored
+                previous[1].cancel()
+
+        def work():
+            try:
+                result = (True, fn(*args, **kwargs))
+            except Exception as e:
+                result = (False, e)
+            self._results.put((owner, key, token, generation, cancellable,
+                               result, on_success, on_error))
+
+        future = self._executor.submit(work)
+        future.add_done_callback(self._on_done)
+        if cancellable:
+            self._latest[(owner, key)] = (token, future)
+        else:
+            self._writes[token] = future
+        self._pending += 1
+        self._schedule_poll()
+        return token
+
+    def cancel(self, owner):
+        """
+        Discard every pending result of an owner (e.g. when its view is hidden)
+
+        Its reads are dropped if they have not started; its writes still run.
+        """
+        self._generations[owner] = self._generations.get(owner, 0) + 1
+        for (task_owner, key), (_, future) in list(self._latest.items()):
+            if task_owner is owner:
+                future.cancel()
+                del self._latest[(task_owner, key)]
+
+    def is_busy(self, owner, key: Hashable = None) -> bool:
+        """Check whether an owner has a current task for a key"""
+        return (owner, key) in self._latest
+
+    def shutdown(self):
+        """
+        Stop accepting tasks and wait for pending writes
+
+        Reads that have not started are dropped; running ones finish in the background.
+        """
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        for _, future in self._latest.values():
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
+        writes = [future for future in self._writes.values() if not future.done()]
+        if writes:
+            print(f"Waiting for {len(writes)} pending save(s)...")
+            wait(writes)
+
+    def _on_done(self, future):
+        """Account for tasks that were cancelled before they started"""
+        if future.cancelled():
+            self._results.put(None)
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Deliver finished results until the time budget for this frame is spent"""
+        self._poll_id = None
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        while time.perf_counter() < deadline:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if item is not None:
+                self._deliver(*item)
+
+        if self._pending > 0:
+            self._schedule_poll()
+
+    def _deliver(self, owner, key, token, generation, cancellable, result, on_success, on_error):
+        """Run a task's callback if it is still current"""
+        if not cancellable:
+            self._writes.pop(token, None)
+        if self._generations.get(owner, 0) != generation:
+            return
+        if cancellable:
+            latest = self._latest.get((owner, key))
+            if latest is None or latest[0] != token:
+                return
+            del self._latest[(owner, key)]
+
+        ok, value = result
+        try:
+            if ok:
+                if on_success is not None:
+                    on_success(value)
+            elif on_error is not None:
+                on_error(value)
+            else:
+                print(f"Error in background task: {value}")
+        except Exception as e:
+            print(f"Error handling background task result: {e}")
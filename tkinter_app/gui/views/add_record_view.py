@@ -4,16 +4,10 @@ Replaces templates/add.html
 """
 import tkinter as tk
 from tkinter import ttk
-import sys
-import os
-
-# Add parent directory to path for models import
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
 from gui.views.base_view import BaseView
 from gui.theme import Theme
 from utils.validators import validate_record_form
-from models import RecordModel
 
 
 class AddRecordView(BaseView):
@@ -24,7 +18,6 @@ class AddRecordView(BaseView):
 
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        self.record_model = RecordModel()
         self._build_ui()
 
     def _build_ui(self):
@@ -130,13 +123,13 @@ class AddRecordView(BaseView):
         button_frame = tk.Frame(form_frame, bg=Theme.BG_WHITE)
         button_frame.pack(fill='x')
 
-        save_btn = ttk.Button(
+        self.save_btn = ttk.Button(
             button_frame,
             text="Save Record",
             style='Success.TButton',
             command=self._handle_save
         )
-        save_btn.pack(side='left', fill='x', expand=True, padx=(0, 5))
+        self.save_btn.pack(side='left', fill='x', expand=True, padx=(0, 5))
 
         back_btn = ttk.Button(
             button_frame,
@@ -158,18 +151,37 @@ class AddRecordView(BaseView):
             self.show_notification(message, 'error')
             return
 
-        # Create record
-        user_id = self.get_session().user_id
-        success, message = self.record_model.create_record(user_id, title, description, category)
+        # Create record (on a worker thread)
+        self.save_btn.configure(state='disabled')
+        self.run_async(
+            self.get_data().create_record,
+            self.get_session().user_id,
+            title,
+            description,
+            category,
+            cancellable=False,
+            on_success=self._on_created,
+            on_error=self._on_create_failed
+        )
 
+    def _on_created(self, result):
+        """Report the outcome of creating the record"""
+        self.save_btn.configure(state='normal')
+        success, message = result
         if success:
             self.show_notification(message, 'success')
             self.navigate_to('dashboard')
         else:
             self.show_notification(message, 'error')
 
+    def _on_create_failed(self, error):
+        """Re-enable the form after a failed save"""
+        self.save_btn.configure(state='normal')
+        self.show_notification(f"Error: {error}", 'error')
+
     def refresh(self, **kwargs):
         """Clear form when view is shown"""
+        self.save_btn.configure(state='normal')
         self.title_entry.delete(0, tk.END)
         self.desc_text.delete('1.0', tk.END)
         self.category_var.set('General')
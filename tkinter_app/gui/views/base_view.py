@@ -42,6 +42,13 @@ class BaseView(tk.Frame, ABC):
         """
         pass
 
+    def on_data_changed(self):
+        """
+        Called while this view is shown when a background sync changed the user's data
+        Override in child classes that should pick up the changes
+        """
+        pass
+
     def show_notification(self, message: str, msg_type: str = 'info'):
         """
         Show notification toast message
@@ -53,10 +60,58 @@ class BaseView(tk.Frame, ABC):
         if hasattr(self.controller, 'show_notification'):
             self.controller.show_notification(message, msg_type)
 
+    def run_async(self, fn, *args, key=None, on_success=None, on_error=None,
+                  cancellable=True, **kwargs):
+        """
+        Run a blocking call (e.g. a model query) off the Tk event thread
+
+        The callbacks run on the Tk thread, and are skipped if the user has
+        left this view or a newer call with the same key was made meanwhile.
+
+        Args:
+            fn: Function to run on a worker thread
+            key: Calls with the same key replace each other (latest wins)
+            on_success: Called with the result
+            on_error: Called with the exception (default: error notification)
+            cancellable: Pass False for writes, which must complete even if
+                the user leaves the view (they are never replaced either)
+            *args, **kwargs: Arguments for fn
+        """
+        if on_error is None:
+            action = "load data" if cancellable else "save changes"
+            on_error = lambda e: self.show_notification(f"Could not {action}: {e}", 'error')
+        return self.controller.tasks.submit(
+            self, fn, *args, key=key, on_success=on_success, on_error=on_error,
+            cancellable=cancellable, **kwargs
+        )
+
+    def show_loading(self, container, text: str = "Loading..."):
+        """
+        Replace a container's contents with a loading placeholder
+
+        Args:
+            container: Frame to clear
+            text: Placeholder text
+        """
+        for widget in container.winfo_children():
+            widget.destroy()
+
+        tk.Label(
+            container,
+            text=text,
+            font=Theme.FONT_BODY,
+            fg=Theme.TEXT_SECONDARY,
+            bg=container.cget('bg')
+        ).pack(pady=40)
+
     def get_session(self):
         """Get session manager from controller"""
         return self.controller.session
 
+    def get_data(self):
+        """Get the shared data service from controller"""
+        return self.controller.data
+
     def navigate_to(self, view_name: str, **kwargs):
         """
         Navigate to another view
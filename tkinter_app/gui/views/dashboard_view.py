@@ -4,6 +4,7 @@ Replaces templates/index.html
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
+from datetime import datetime, timedelta
 import sys
 import os
 
@@ -22,9 +23,21 @@ class DashboardView(BaseView):
     Main screen after login
     """
 
+    ALL = 'All'
+    SORT_LABELS = {'Newest first': 'newest', 'Oldest first': 'oldest', 'Title A–Z': 'title'}
+
+    # A row must stay selected this long before its details are prefetched,
+    # so moving through rows with the arrow keys does not query every one
+    PREFETCH_DELAY_MS = 150
+
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        self.record_model = RecordModel()
+        self.data_table = None
+        # Whose records the table shows (another user's rows are never kept while loading)
+        self.loaded_user_id = None
+        # Filters of the rows shown; same filters again means an in-place update
+        self.loaded_filters = None
+        self._prefetch_job = None
         self._build_ui()
 
     def _build_ui(self):
@@ -86,12 +99,104 @@ class DashboardView(BaseView):
         )
         add_btn.pack(side='right')
 
+        self._build_filters(toolbar_frame)
+
         # Records table container
         self.table_container = tk.Frame(content_frame, bg=Theme.BG_WHITE)
         self.table_container.pack(fill='both', expand=True)
 
-        # This will be populated in _create_table() or _show_empty_state()
-        self._create_table()
+        # Populated in _create_table() or _show_empty_state() once records load
+        self.show_loading(self.table_container, "Loading records...")
+
+    def _build_filters(self, toolbar_frame):
+        """Build the status/category/date/sort filter controls (filtered on the server)"""
+        filter_frame = tk.Frame(toolbar_frame, bg=Theme.BG_LIGHT)
+        filter_frame.pack(side='left', padx=(20, 0))
+
+        def add_label(text):
+            tk.Label(
+                filter_frame,
+                text=text,
+                font=Theme.FONT_SMALL,
+                fg=Theme.TEXT_SECONDARY,
+                bg=Theme.BG_LIGHT
+            ).pack(side='left', padx=(10, 4))
+
+        def add_combo(variable, values, width):
+            combo = ttk.Combobox(
+                filter_frame,
+                textvariable=variable,
+                values=values,
+                state='readonly',
+                width=width,
+                font=Theme.FONT_SMALL
+            )
+            combo.pack(side='left')
+            combo.bind('<<ComboboxSelected>>', lambda e: self.refresh())
+
+        def add_date_entry():
+            entry = ttk.Entry(filter_frame, width=11, font=Theme.FONT_SMALL)
+            entry.pack(side='left')
+            entry.bind('<Return>', lambda e: self.refresh())
+            return entry
+
+        add_label("Status")
+        self.status_filter = tk.StringVar(value=self.ALL)
+        add_combo(self.status_filter, [self.ALL] + list(RecordModel.STATUSES), 10)
+
+        add_label("Category")
+        self.category_filter = tk.StringVar(value=self.ALL)
+        add_combo(self.category_filter, [self.ALL] + list(RecordModel.CATEGORIES), 10)
+
+        add_label("From")
+        self.date_from_entry = add_date_entry()
+        add_label("To")
+        self.date_to_entry = add_date_entry()
+
+        add_label("Sort")
+        self.sort_filter = tk.StringVar(value='Newest first')
+        add_combo(self.sort_filter, list(self.SORT_LABELS), 12)
+
+        # Searches the loaded rows in memory (no query per keystroke)
+        add_label("Search")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(filter_frame, textvariable=self.search_var, width=16,
+                                 font=Theme.FONT_SMALL)
+        search_entry.pack(side='left')
+        search_entry.bind('<KeyRelease>', lambda e: self._handle_search())
+
+    def _handle_search(self):
+        """Filter the shown records as the user types"""
+        if self._has_table():
+            self.data_table.set_filter(self.search_var.get())
+
+    def _get_filters(self):
+        """
+        Read the filter controls
+
+        Returns:
+            Keyword arguments for RecordModel.list_records, or None if a date is invalid
+        """
+        dates = []
+        for entry in (self.date_from_entry, self.date_to_entry):
+            text = entry.get().strip()
+            try:
+                dates.append(datetime.strptime(text, '%Y-%m-%d') if text else None)
+            except ValueError:
+                self.show_notification("Dates must be in YYYY-MM-DD format", 'error')
+                return None
+        date_from, date_to = dates
+
+        status = self.status_filter.get()
+        category = self.category_filter.get()
+        return {
+            'status': None if status == self.ALL else status,
+            'category': None if category == self.ALL else category,
+            'date_from': date_from,
+            # The "to" date is inclusive
+            'date_to': date_to + timedelta(days=1) if date_to else None,
+            'sort': self.SORT_LABELS.get(self.sort_filter.get(), 'newest')
+        }
 
     def _create_table(self):
         """Create records table"""
@@ -113,8 +218,11 @@ class DashboardView(BaseView):
             ('status', 'Status', 100)
         ]
 
-        self.data_table = DataTable(table_frame, columns, height=20)
+        # Click a heading to sort the loaded records
+        self.data_table = DataTable(table_frame, columns, height=20, selectmode='extended',
+                                    virtual=True, sortable=True)
         self.data_table.pack(fill='both', expand=True)
+        self.data_table.set_filter(self.search_var.get(), immediate=True)
 
         # Action buttons frame (below table)
         self.actions_frame = tk.Frame(table_frame, bg=Theme.BG_WHITE)
@@ -151,6 +259,43 @@ class DashboardView(BaseView):
         delete_btn.pack(side='left', padx=5)
         self.delete_btn = delete_btn
 
+        # Bulk actions on the whole selection (Shift/Ctrl-click to select several)
+        self.bulk_status_var = tk.StringVar(value=RecordModel.STATUSES[0])
+        self.bulk_category_var = tk.StringVar(value=RecordModel.CATEGORIES[0])
+        self.bulk_widgets = []
+
+        for variable, values, field in (
+            (self.bulk_status_var, RecordModel.STATUSES, 'status'),
+            (self.bulk_category_var, RecordModel.CATEGORIES, 'category')
+        ):
+            combo = ttk.Combobox(
+                self.actions_frame,
+                textvariable=variable,
+                values=list(values),
+                state='disabled',
+                width=11,
+                font=Theme.FONT_SMALL
+            )
+            combo.pack(side='right', padx=(5, 0))
+            button = ttk.Button(
+                self.actions_frame,
+                text=f"Set {field}",
+                style='Primary.TButton',
+                command=lambda f=field, v=variable: self._handle_bulk_update(f, v.get()),
+                state='disabled'
+            )
+            button.pack(side='right', padx=(15, 0))
+            self.bulk_widgets.extend([combo, button])
+
+        self.selection_label = tk.Label(
+            self.actions_frame,
+            text="",
+            font=Theme.FONT_SMALL,
+            fg=Theme.TEXT_SECONDARY,
+            bg=Theme.BG_WHITE
+        )
+        self.selection_label.pack(side='left', padx=10)
+
         # Enable buttons when row is selected
         self.data_table.bind_selection(self._on_selection_changed)
 
@@ -159,11 +304,47 @@ class DashboardView(BaseView):
 
     def _on_selection_changed(self):
         """Enable/disable action buttons based on selection"""
-        selected = self.data_table.get_selected()
-        state = 'normal' if selected else 'disabled'
-        self.view_btn.configure(state=state)
-        self.edit_btn.configure(state=state)
-        self.delete_btn.configure(state=state)
+        count = self.data_table.get_selection_count()
+        single_state = 'normal' if count == 1 else 'disabled'
+        self.view_btn.configure(state=single_state)
+        self.edit_btn.configure(state=single_state)
+        self.delete_btn.configure(state='normal' if count else 'disabled')
+
+        for widget in self.bulk_widgets:
+            if isinstance(widget, ttk.Combobox):
+                widget.configure(state='readonly' if count else 'disabled')
+            else:
+                widget.configure(state='normal' if count else 'disabled')
+        self.selection_label.configure(text=f"{count} selected" if count > 1 else "")
+
+        # Load the selected record's details so opening it is instant
+        if self._prefetch_job is not None:
+            self.after_cancel(self._prefetch_job)
+            self._prefetch_job = None
+        if count == 1:
+            self._prefetch_job = self.after(self.PREFETCH_DELAY_MS, self._prefetch_selected)
+
+    def _prefetch_selected(self):
+        """Prefetch the details of the selected record"""
+        self._prefetch_job = None
+        record_id = self.data_table.get_selected_id(id_column=0) if self._has_table() else None
+        user_id = self.get_session().user_id
+        if record_id and user_id:
+            self.get_data().prefetch(str(record_id), user_id)
+
+    def _handle_bulk_update(self, field, value):
+        """Set status or category on every selected record with one update"""
+        record_ids = [str(record_id) for record_id in self.data_table.get_selected_ids(id_column=0)]
+        if not record_ids:
+            return
+
+        self.run_async(
+            self.get_data().bulk_update_records,
+            record_ids, self.get_session().user_id,
+            cancellable=False,
+            on_success=self._on_write_done,
+            **{field: value}
+        )
 
     def _handle_view(self):
         """Handle view button click"""
@@ -178,27 +359,37 @@ class DashboardView(BaseView):
             self.navigate_to('edit_record', record_id=str(record_id))
 
     def _handle_delete(self):
-        """Handle delete button click"""
-        record_id = self.data_table.get_selected_id(id_column=0)
-        if not record_id:
+        """Handle delete button click (one or many selected records)"""
+        record_ids = [str(record_id) for record_id in self.data_table.get_selected_ids(id_column=0)]
+        if not record_ids:
             return
 
         # Confirmation dialog
         result = messagebox.askyesno(
             "Confirm Delete",
-            "Are you sure you want to delete this record?"
+            "Are you sure you want to delete this record?" if len(record_ids) == 1
+            else f"Are you sure you want to delete {len(record_ids)} records?"
         )
 
         if result:
-            success, message = self.record_model.delete_record(str(record_id))
-            if success:
-                self.show_notification(message, 'success')
-                self.refresh()
+            if len(record_ids) == 1:
+                delete, target = self.get_data().delete_record, record_ids[0]
             else:
-                self.show_notification(message, 'error')
+                delete, target = self.get_data().bulk_delete_records, record_ids
+            self.run_async(delete, target, self.get_session().user_id,
+                           cancellable=False, on_success=self._on_write_done)
+
+    def _on_write_done(self, result):
+        """Report the outcome of an update or delete and reload on success"""
+        success, message = result
+        if success:
+            self.show_notification(message, 'success')
+            self.refresh()
+        else:
+            self.show_notification(message, 'error')
 
-    def _show_empty_state(self):
-        """Show empty state when no records"""
+    def _show_empty_state(self, filtered=False):
+        """Show empty state when no records (or none matching the filters)"""
         # Clear container
         for widget in self.table_container.winfo_children():
             widget.destroy()
@@ -219,7 +410,7 @@ class DashboardView(BaseView):
         # Message
         message_label = tk.Label(
             empty_container,
-            text="No records yet",
+            text="No matching records" if filtered else "No records yet",
             font=Theme.FONT_HEADING,
             fg=Theme.TEXT_PRIMARY,
             bg=Theme.BG_WHITE
@@ -241,16 +432,49 @@ class DashboardView(BaseView):
         if not user_id:
             return
 
-        # Get all records for user
-        records = self.record_model.read_all_records(user_id)
+        filters = self._get_filters()
+        if filters is None:
+            return
+
+        # Keep showing this user's current rows while reloading; placeholder otherwise
+        if user_id != self.loaded_user_id or not self._has_table():
+            self.show_loading(self.table_container, "Loading records...")
+            self.loaded_user_id = None
+
+        # Get all matching records for user (on a worker thread)
+        self.run_async(
+            self.get_data().list_records, user_id,
+            key='records',
+            on_success=lambda result: self._show_records(user_id, result[0], filters),
+            limit=None, **filters
+        )
+
+    def on_data_changed(self):
+        """Reload the listing after a sync (only the differences are applied)"""
+        self.refresh()
 
+    def _has_table(self):
+        """Check whether the records table is currently built"""
+        return self.data_table is not None and self.data_table.winfo_exists()
+
+    def _show_records(self, user_id, records, filters):
+        """Show loaded records, or the empty state"""
+        same_listing = (user_id == self.loaded_user_id and filters == self.loaded_filters
+                        and self._has_table())
+        self.loaded_user_id = user_id
+        self.loaded_filters = filters
         if not records or len(records) == 0:
             # Show empty state
-            self._show_empty_state()
+            filtered = any(value for key, value in filters.items() if key != 'sort')
+            self._show_empty_state(filtered)
         else:
-            # Show table
-            if not hasattr(self, 'data_table'):
+            # Show table (the empty state destroys it)
+            if not self._has_table():
                 self._create_table()
 
-            # Populate table
-            self.data_table.set_data(records)
+            # Populate table; a reload of the same listing only applies the
+            # differences, keeping selection and scroll position
+            if same_listing:
+                self.data_table.update_rows(records)
+            else:
+                self.data_table.set_data(records)
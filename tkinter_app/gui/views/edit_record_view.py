@@ -4,16 +4,10 @@ Replaces templates/edit.html
 """
 import tkinter as tk
 from tkinter import ttk
-import sys
-import os
-
-# Add parent directory to path for models import
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
 from gui.views.base_view import BaseView
 from gui.theme import Theme
 from utils.validators import validate_record_form
-from models import RecordModel
 
 
 class EditRecordView(BaseView):
@@ -24,7 +18,6 @@ class EditRecordView(BaseView):
 
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        self.record_model = RecordModel()
         self.current_record_id = None
         self._build_ui()
 
@@ -152,13 +145,13 @@ class EditRecordView(BaseView):
         button_frame = tk.Frame(form_frame, bg=Theme.BG_WHITE)
         button_frame.pack(fill='x')
 
-        update_btn = ttk.Button(
+        self.update_btn = ttk.Button(
             button_frame,
             text="Update Record",
             style='Primary.TButton',
             command=self._handle_update
         )
-        update_btn.pack(side='left', fill='x', expand=True, padx=(0, 5))
+        self.update_btn.pack(side='left', fill='x', expand=True, padx=(0, 5))
 
         back_btn = ttk.Button(
             button_frame,
@@ -184,21 +177,36 @@ class EditRecordView(BaseView):
             self.show_notification(message, 'error')
             return
 
-        # Update record
-        success, message = self.record_model.update_record(
+        # Update record (on a worker thread)
+        self.update_btn.configure(state='disabled')
+        self.run_async(
+            self.get_data().update_record,
             self.current_record_id,
             title,
             description,
             category,
-            status
+            status,
+            self.get_session().user_id,
+            cancellable=False,
+            on_success=self._on_updated,
+            on_error=self._on_update_failed
         )
 
+    def _on_updated(self, result):
+        """Report the outcome of the update"""
+        self.update_btn.configure(state='normal')
+        success, message = result
         if success:
             self.show_notification(message, 'success')
             self.navigate_to('dashboard')
         else:
             self.show_notification(message, 'error')
 
+    def _on_update_failed(self, error):
+        """Re-enable the form after a failed update"""
+        self.update_btn.configure(state='normal')
+        self.show_notification(f"Error: {error}", 'error')
+
     def refresh(self, **kwargs):
         """Load record data when view is shown"""
         record_id = kwargs.get('record_id')
@@ -208,8 +216,20 @@ class EditRecordView(BaseView):
 
         self.current_record_id = record_id
 
-        # Get record data
-        record = self.record_model.read_record(record_id)
+        # Clear the previous record and wait for this one before allowing saves
+        self.title_entry.delete(0, tk.END)
+        self.desc_text.delete('1.0', tk.END)
+        self.update_btn.configure(state='disabled')
+
+        # Get record data (on a worker thread)
+        self.run_async(
+            self.get_data().get_record, record_id, self.get_session().user_id,
+            key='record',
+            on_success=self._on_record_loaded
+        )
+
+    def _on_record_loaded(self, record):
+        """Fill the form with the loaded record"""
         if not record:
             self.show_notification("Record not found", 'error')
             self.navigate_to('dashboard')
@@ -225,5 +245,6 @@ class EditRecordView(BaseView):
 
         self.category_var.set(record[3])
         self.status_var.set(record[5])
+        self.update_btn.configure(state='normal')
 
         self.title_entry.focus()
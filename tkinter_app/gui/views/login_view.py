@@ -13,7 +13,6 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from gui.views.base_view import BaseView
 from gui.theme import Theme
 from utils.validators import validate_login_form
-from models import UserModel
 
 
 class LoginView(BaseView):
@@ -24,7 +23,6 @@ class LoginView(BaseView):
 
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        self.user_model = UserModel()
         self._build_ui()
 
     def _build_ui(self):
@@ -100,14 +98,14 @@ class LoginView(BaseView):
         self.password_entry.bind('<Return>', lambda e: self._handle_login())
 
         # Sign In button
-        signin_btn = ttk.Button(
+        self.signin_btn = ttk.Button(
             form_container,
             text="Sign In",
             style='Primary.TButton',
             command=self._handle_login,
             width=40
         )
-        signin_btn.pack(pady=(0, 20))
+        self.signin_btn.pack(pady=(0, 20))
 
         # Signup link
         signup_frame = tk.Frame(form_container, bg=Theme.BG_WHITE)
@@ -144,9 +142,23 @@ class LoginView(BaseView):
             self.show_notification(message, 'error')
             return
 
-        # Authenticate user
-        success, user_id, message = self.user_model.authenticate_user(username, password)
+        # Ignore Enter/clicks while a login is already being checked
+        if self.controller.tasks.is_busy(self, 'login'):
+            return
+
+        # Authenticate user (on a worker thread: password hashing and a query;
+        # falls back to the local store when MongoDB cannot be reached)
+        self.signin_btn.configure(text="Signing in...", state='disabled')
+        self.run_async(
+            self.get_data().authenticate, username, password,
+            key='login',
+            on_success=lambda result: self._on_login_result(username, *result),
+            on_error=self._on_login_error
+        )
 
+    def _on_login_result(self, username, success, user_id, message):
+        """Finish login once the credentials have been checked"""
+        self.signin_btn.configure(text="Sign In", state='normal')
         if success:
             # Login successful
             self.controller.login(user_id, username)
@@ -155,8 +167,14 @@ class LoginView(BaseView):
             self.show_notification(message, 'error')
             self.password_entry.delete(0, tk.END)
 
+    def _on_login_error(self, error):
+        """Re-enable the form after the login check failed"""
+        self.signin_btn.configure(text="Sign In", state='normal')
+        self.show_notification(f"Could not sign in: {error}", 'error')
+
     def refresh(self, **kwargs):
         """Clear form when view is shown"""
+        self.signin_btn.configure(text="Sign In", state='normal')
         self.username_entry.delete(0, tk.END)
         self.password_entry.delete(0, tk.END)
         self.username_entry.focus()
@@ -29,6 +29,13 @@ class ReportsView(BaseView):
         self.record_model = RecordModel()
         self.comment_model = CommentModel()
         self.stats = None
+        # Widgets updated on refresh, created with the first statistics
+        self.value_labels = {}
+        self.date_label = None
+        self.status_chart = None
+        self.category_chart = None
+        self.date_range_card = None
+        self.date_range_labels = None
         self._build_ui()
 
     def _build_ui(self):
@@ -82,14 +89,11 @@ class ReportsView(BaseView):
         scrollbar.pack(side='right', fill='y', pady=(0, 20))
 
     def _build_content(self):
-        """Build reports content"""
-        # Clear content
+        """Build reports content (once; refresh only updates it)"""
+        # Clear loading placeholder
         for widget in self.content_frame.winfo_children():
             widget.destroy()
 
-        if not self.stats:
-            return
-
         # Title section
         title_section = tk.Frame(self.content_frame, bg=Theme.BG_LIGHT)
         title_section.pack(fill='x', pady=(0, 20))
@@ -112,19 +116,18 @@ class ReportsView(BaseView):
         export_btn.pack(side='right')
 
         # Generated date
-        date_label = tk.Label(
+        self.date_label = tk.Label(
             self.content_frame,
-            text=f"Generated on: {self.stats['generated_at']}",
             font=Theme.FONT_BODY,
             fg=Theme.TEXT_SECONDARY,
             bg=Theme.BG_LIGHT
         )
-        date_label.pack(anchor='w', pady=(0, 20))
+        self.date_label.pack(anchor='w', pady=(0, 20))
 
         # Overview cards
         self._build_overview_cards()
 
-        # Charts section
+        # Charts section (rendered in the background; they fill in when ready)
         self._build_charts()
 
         # Time stats
@@ -133,6 +136,28 @@ class ReportsView(BaseView):
         # Date range
         self._build_date_range()
 
+    def _update_content(self):
+        """Show the current statistics in the existing widgets"""
+        stats = self.stats
+        self.date_label.configure(text=f"Generated on: {stats['generated_at']}")
+
+        values = {
+            'total': stats['total'],
+            'active': stats['status_breakdown']['active'],
+            'completed': stats['status_breakdown']['completed'],
+            'inactive': stats['status_breakdown']['inactive'],
+            'total_comments': stats['comments']['total_comments'],
+            'comments_on_my_records': stats['comments']['comments_on_my_records'],
+            'today': stats['time_stats']['today'],
+            'this_week': stats['time_stats']['this_week'],
+            'this_month': stats['time_stats']['this_month']
+        }
+        for name, value in values.items():
+            self.value_labels[name].configure(text=str(value))
+
+        self._update_charts()
+        self._update_date_range()
+
     def _build_overview_cards(self):
         """Build overview statistics cards"""
         # Card container
@@ -147,7 +172,7 @@ class ReportsView(BaseView):
         self._create_stat_card(
             cards_frame, 0, 0,
             "Total Records",
-            str(self.stats['total']),
+            'total',
             Theme.TEXT_PRIMARY
         )
 
@@ -155,7 +180,7 @@ class ReportsView(BaseView):
         self._create_stat_card(
             cards_frame, 0, 1,
             "Active",
-            str(self.stats['status_breakdown']['active']),
+            'active',
             Theme.SUCCESS_TEXT
         )
 
@@ -163,7 +188,7 @@ class ReportsView(BaseView):
         self._create_stat_card(
             cards_frame, 0, 2,
             "Completed",
-            str(self.stats['status_breakdown']['completed']),
+            'completed',
             Theme.INFO_TEXT
         )
 
@@ -171,7 +196,7 @@ class ReportsView(BaseView):
         self._create_stat_card(
             cards_frame, 0, 3,
             "Inactive",
-            str(self.stats['status_breakdown']['inactive']),
+            'inactive',
             Theme.TEXT_SECONDARY
         )
 
@@ -185,19 +210,24 @@ class ReportsView(BaseView):
         self._create_stat_card(
             comment_cards_frame, 0, 0,
             "My Comments",
-            str(self.stats['comments']['total_comments']),
+            'total_comments',
             Theme.PURPLE_TEXT
         )
 
         self._create_stat_card(
             comment_cards_frame, 0, 1,
             "Comments on My Records",
-            str(self.stats['comments']['comments_on_my_records']),
+            'comments_on_my_records',
             Theme.INDIGO
         )
 
-    def _create_stat_card(self, parent, row, col, title, value, color):
-        """Create a single stat card"""
+    def _create_stat_card(self, parent, row, col, title, name, color):
+        """
+        Create a single stat card
+
+        Args:
+            name: Key of the card's value label in self.value_labels
+        """
         card = tk.Frame(
             parent,
             bg=Theme.BG_WHITE,
@@ -217,12 +247,12 @@ class ReportsView(BaseView):
 
         value_label = tk.Label(
             card,
-            text=value,
             font=(Theme.FONT_FAMILY, 32, 'bold'),
             fg=color,
             bg=Theme.BG_WHITE
         )
         value_label.pack(pady=(0, 15))
+        self.value_labels[name] = value_label
 
     def _build_charts(self):
         """Build charts section"""
@@ -233,9 +263,15 @@ class ReportsView(BaseView):
         charts_frame.columnconfigure(1, weight=1)
 
         # Status distribution (doughnut chart)
-        status_chart = ChartWidget(charts_frame, figsize=(5, 4))
-        status_chart.grid(row=0, column=0, padx=(0, 10), sticky='nsew')
+        self.status_chart = ChartWidget(charts_frame, figsize=(5, 4))
+        self.status_chart.grid(row=0, column=0, padx=(0, 10), sticky='nsew')
+
+        # Category distribution (bar chart)
+        self.category_chart = ChartWidget(charts_frame, figsize=(5, 4))
+        self.category_chart.grid(row=0, column=1, padx=(10, 0), sticky='nsew')
 
+    def _update_charts(self):
+        """Plot the current statistics (the charts update their figures in place)"""
         labels = ['Active', 'Completed', 'Inactive']
         sizes = [
             self.stats['status_breakdown']['active'],
@@ -244,23 +280,24 @@ class ReportsView(BaseView):
         ]
         colors = [Theme.SUCCESS, Theme.INFO, Theme.TEXT_LIGHT]
 
-        status_chart.plot_doughnut(labels, sizes, colors, "Status Distribution")
-
-        # Category distribution (bar chart)
-        category_chart = ChartWidget(charts_frame, figsize=(5, 4))
-        category_chart.grid(row=0, column=1, padx=(10, 0), sticky='nsew')
+        if sum(sizes):
+            self.status_chart.plot_doughnut(labels, sizes, colors, "Status Distribution")
+        else:
+            self.status_chart.clear()
 
         if self.stats['by_category']:
             categories = list(self.stats['by_category'].keys())
             values = list(self.stats['by_category'].values())
 
-            category_chart.plot_bar(
+            self.category_chart.plot_bar(
                 categories,
                 values,
                 Theme.SUCCESS,
                 "Category Distribution",
                 ylabel="Count"
             )
+        else:
+            self.category_chart.clear()
 
     def _build_time_stats(self):
         """Build time-based statistics"""
@@ -273,82 +310,93 @@ class ReportsView(BaseView):
         self._create_stat_card(
             time_frame, 0, 0,
             "Today",
-            str(self.stats['time_stats']['today']),
+            'today',
             Theme.TEXT_PRIMARY
         )
 
         self._create_stat_card(
             time_frame, 0, 1,
             "This Week",
-            str(self.stats['time_stats']['this_week']),
+            'this_week',
             Theme.TEXT_PRIMARY
         )
 
         self._create_stat_card(
             time_frame, 0, 2,
             "This Month",
-            str(self.stats['time_stats']['this_month']),
+            'this_month',
             Theme.TEXT_PRIMARY
         )
 
     def _build_date_range(self):
-        """Build date range section"""
-        if self.stats['date_range']['first_record']:
-            date_card = tk.Frame(
-                self.content_frame,
-                bg=Theme.BG_WHITE,
-                relief='solid',
-                borderwidth=1
-            )
-            date_card.pack(fill='x', pady=(0, 20))
-
-            content = tk.Frame(date_card, bg=Theme.BG_WHITE)
-            content.pack(fill='x', padx=20, pady=15)
-
-            tk.Label(
-                content,
-                text="First Record",
-                font=Theme.FONT_BODY_BOLD,
-                fg=Theme.TEXT_PRIMARY,
-                bg=Theme.BG_WHITE
-            ).pack(side='left')
-
-            tk.Label(
-                content,
-                text=self.stats['date_range']['first_record'],
-                font=Theme.FONT_BODY,
-                fg=Theme.TEXT_SECONDARY,
-                bg=Theme.BG_WHITE
-            ).pack(side='left', padx=(10, 20))
-
-            tk.Label(
-                content,
-                text="→",
-                font=Theme.FONT_BODY,
-                fg=Theme.TEXT_SECONDARY,
-                bg=Theme.BG_WHITE
-            ).pack(side='left', padx=(0, 20))
-
-            tk.Label(
-                content,
-                text="Latest Record",
-                font=Theme.FONT_BODY_BOLD,
-                fg=Theme.TEXT_PRIMARY,
-                bg=Theme.BG_WHITE
-            ).pack(side='left')
-
-            tk.Label(
-                content,
-                text=self.stats['date_range']['last_record'],
-                font=Theme.FONT_BODY,
-                fg=Theme.TEXT_SECONDARY,
-                bg=Theme.BG_WHITE
-            ).pack(side='left', padx=(10, 0))
+        """Build date range section (shown once there are records)"""
+        self.date_range_card = tk.Frame(
+            self.content_frame,
+            bg=Theme.BG_WHITE,
+            relief='solid',
+            borderwidth=1
+        )
+
+        content = tk.Frame(self.date_range_card, bg=Theme.BG_WHITE)
+        content.pack(fill='x', padx=20, pady=15)
+
+        tk.Label(
+            content,
+            text="First Record",
+            font=Theme.FONT_BODY_BOLD,
+            fg=Theme.TEXT_PRIMARY,
+            bg=Theme.BG_WHITE
+        ).pack(side='left')
+
+        first_label = tk.Label(
+            content,
+            font=Theme.FONT_BODY,
+            fg=Theme.TEXT_SECONDARY,
+            bg=Theme.BG_WHITE
+        )
+        first_label.pack(side='left', padx=(10, 20))
+
+        tk.Label(
+            content,
+            text="→",
+            font=Theme.FONT_BODY,
+            fg=Theme.TEXT_SECONDARY,
+            bg=Theme.BG_WHITE
+        ).pack(side='left', padx=(0, 20))
+
+        tk.Label(
+            content,
+            text="Latest Record",
+            font=Theme.FONT_BODY_BOLD,
+            fg=Theme.TEXT_PRIMARY,
+            bg=Theme.BG_WHITE
+        ).pack(side='left')
+
+        last_label = tk.Label(
+            content,
+            font=Theme.FONT_BODY,
+            fg=Theme.TEXT_SECONDARY,
+            bg=Theme.BG_WHITE
+        )
+        last_label.pack(side='left', padx=(10, 0))
+
+        self.date_range_labels = (first_label, last_label)
+
+    def _update_date_range(self):
+        """Show or hide the date range for the current statistics"""
+        date_range = self.stats['date_range']
+        if date_range['first_record']:
+            first_label, last_label = self.date_range_labels
+            first_label.configure(text=date_range['first_record'])
+            last_label.configure(text=date_range['last_record'])
+            self.date_range_card.pack(fill='x', pady=(0, 20))
+        else:
+            self.date_range_card.pack_forget()
 
     def _handle_export_pdf(self):
         """Handle PDF export button click"""
         # Import PDF generation function
-        from routes.report_routes import generate_pdf_report
+        from reports.pdf_report import export_pdf_report
 
         user_id = self.get_session().user_id
         username = self.get_session().username
@@ -361,17 +409,11 @@ class ReportsView(BaseView):
         )
 
         if filename:
-            # Generate PDF
-            success, message, pdf_bytes = generate_pdf_report(user_id, username)
+            # Generate the PDF straight into the chosen file
+            success, message = export_pdf_report(user_id, username, filename)
 
             if success:
-                # Save PDF
-                try:
-                    with open(filename, 'wb') as f:
-                        f.write(pdf_bytes)
-                    self.show_notification("PDF exported successfully", 'success')
-                except Exception as e:
-                    self.show_notification(f"Error saving PDF: {str(e)}", 'error')
+                self.show_notification("PDF exported successfully", 'success')
             else:
                 self.show_notification(message, 'error')
 
@@ -381,12 +423,25 @@ class ReportsView(BaseView):
         if not user_id:
             return
 
-        # Get statistics
+        if self.stats is None:
+            self.show_loading(self.content_frame, "Loading reports...")
+
+        # Get statistics (on a worker thread)
+        self.run_async(self._load_stats, user_id, key='stats', on_success=self._on_stats_loaded)
+
+    def _load_stats(self, user_id):
+        """Fetch record and comment statistics (runs on a worker thread)"""
         record_stats = self.record_model.get_summary_stats(user_id)
         comment_stats = self.comment_model.get_comment_stats(user_id)
 
         # Combine stats
-        self.stats = {**record_stats, 'comments': comment_stats}
+        return {**record_stats, 'comments': comment_stats}
+
+    def _on_stats_loaded(self, stats):
+        """Show loaded statistics"""
+        self.stats = stats
 
-        # Build content
-        self._build_content()
+        # Build content the first time, then only update it
+        if self.status_chart is None:
+            self._build_content()
+        self._update_content()
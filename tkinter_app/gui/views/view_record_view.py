@@ -5,16 +5,12 @@ Shows record details and comments
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
-import sys
-import os
-
-# Add parent directory to path for models import
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+from datetime import datetime
 
 from gui.views.base_view import BaseView
 from gui.theme import Theme
+from gui.widgets.comment_list import CommentList
 from utils.validators import validate_comment
-from models import RecordModel, CommentModel
 
 
 class ViewRecordView(BaseView):
@@ -28,10 +24,11 @@ class ViewRecordView(BaseView):
 
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        self.record_model = RecordModel()
-        self.comment_model = CommentModel()
         self.current_record_id = None
         self.current_record = None
+        self.comment_count = 0
+        self.comments_cursor = None
+        self.load_more_frame = None
         self._build_ui()
 
     def _build_ui(self):
@@ -86,6 +83,17 @@ class ViewRecordView(BaseView):
 
         # Content will be built in refresh()
 
+    def _on_loaded(self, result):
+        """Build the page from loaded data"""
+        if result is None:
+            self.show_notification("Record not found", 'error')
+            self.navigate_to('dashboard')
+            return
+
+        self.current_record, comments, cursor, self.comment_count = result
+        self._build_record_details()
+        self._show_comments(comments, cursor)
+
     def _build_record_details(self):
         """Build record details section"""
         # Clear content
@@ -195,16 +203,14 @@ class ViewRecordView(BaseView):
         comments_header = tk.Frame(comments_card, bg=Theme.BG_GRAY)
         comments_header.pack(fill='x', padx=20, pady=15)
 
-        comments_count = len(self.comment_model.get_comments_for_record(self.current_record_id))
-
-        comments_title = tk.Label(
+        self.comments_title = tk.Label(
             comments_header,
-            text=f"Comments ({comments_count})",
+            text=f"Comments ({self.comment_count})",
             font=Theme.FONT_SUBHEADING,
             fg=Theme.TEXT_PRIMARY,
             bg=Theme.BG_GRAY
         )
-        comments_title.pack(side='left')
+        self.comments_title.pack(side='left')
 
         # Add comment form
         add_comment_frame = tk.Frame(comments_card, bg=Theme.BG_WHITE)
@@ -237,105 +243,94 @@ class ViewRecordView(BaseView):
         )
         add_comment_btn.pack(anchor='w')
 
-        # Comments list
+        # Comments list (only the comments in view are drawn)
         self.comments_list_frame = tk.Frame(comments_card, bg=Theme.BG_WHITE)
         self.comments_list_frame.pack(fill='both', padx=20, pady=(0, 20))
 
-        self._populate_comments()
-
-    def _populate_comments(self):
-        """Populate comments list"""
-        # Clear comments list
-        for widget in self.comments_list_frame.winfo_children():
-            widget.destroy()
-
-        # Get comments
-        comments = self.comment_model.get_comments_for_record(self.current_record_id)
-
-        if not comments:
-            no_comments_label = tk.Label(
-                self.comments_list_frame,
-                text="No comments yet",
-                font=Theme.FONT_BODY,
-                fg=Theme.TEXT_SECONDARY,
-                bg=Theme.BG_WHITE
-            )
-            no_comments_label.pack(pady=20)
-            return
-
-        # Display each comment
-        for comment in comments:
-            self._create_comment_widget(comment)
-
-    def _create_comment_widget(self, comment):
-        """Create widget for a single comment"""
-        comment_frame = tk.Frame(
+        self.comment_list = CommentList(
             self.comments_list_frame,
-            bg=Theme.BG_LIGHT,
-            relief='solid',
-            borderwidth=1
+            can_modify=lambda comment: comment['user_id'] == self.get_session().user_id,
+            on_edit=self._handle_edit_comment,
+            on_delete=self._handle_delete_comment
         )
-        comment_frame.pack(fill='x', pady=(0, 10))
-
-        # Comment header
-        header_frame = tk.Frame(comment_frame, bg=Theme.BG_LIGHT)
-        header_frame.pack(fill='x', padx=15, pady=(10, 5))
-
-        username_label = tk.Label(
-            header_frame,
-            text=comment['username'],
-            font=Theme.FONT_BODY_BOLD,
-            fg=Theme.TEXT_PRIMARY,
-            bg=Theme.BG_LIGHT
+        self.comment_list.pack(fill='x', pady=(0, 10))
+
+    def _load_new_comments(self):
+        """Read the first page again and merge comments not shown yet into the list"""
+        # Own key, so a pending "Load more" and a merge never replace each other
+        record_id = self.current_record_id
+        self.run_async(
+            self.get_data().list_comments, record_id,
+            key='comments-new',
+            on_success=lambda page: self._merge_comments(record_id, *page)
         )
-        username_label.pack(side='left')
 
-        timestamp_text = comment['created_at']
-        if comment['updated_at'] != comment['created_at']:
-            timestamp_text += " (edited)"
+    def on_data_changed(self):
+        """Show comments a sync brought in"""
+        if self.current_record_id:
+            self._load_new_comments()
 
-        timestamp_label = tk.Label(
-            header_frame,
-            text=timestamp_text,
-            font=Theme.FONT_SMALL,
-            fg=Theme.TEXT_SECONDARY,
-            bg=Theme.BG_LIGHT
-        )
-        timestamp_label.pack(side='left', padx=(10, 0))
-
-        # Comment content
-        content_label = tk.Label(
-            comment_frame,
-            text=comment['content'],
-            font=Theme.FONT_BODY,
-            fg=Theme.TEXT_PRIMARY,
-            bg=Theme.BG_LIGHT,
-            wraplength=1100,
-            justify='left',
-            anchor='w'
+    def _merge_comments(self, record_id, comments, cursor, count=None):
+        """Add newly posted comments above the ones shown (loaded pages are kept)"""
+        if record_id != self.current_record_id:
+            return
+        self.comment_list.insert_comments(comments)
+        if count is not None:
+            self._set_comment_count(count)
+
+    def _set_comment_count(self, count):
+        self.comment_count = count
+        self.comments_title.configure(text=f"Comments ({count})")
+
+    def _show_comments(self, comments, cursor, count=None):
+        """Replace the comments list with the first page of comments"""
+        if count is not None:
+            self._set_comment_count(count)
+        self.comments_cursor = cursor
+        self.comment_list.set_comments(comments)
+        self._update_load_more()
+
+    def _load_more_comments(self):
+        """Fetch the next page of comments"""
+        self.load_more_button.configure(text="Loading...", state='disabled')
+        record_id = self.current_record_id
+        self.run_async(
+            self.get_data().list_comments, record_id,
+            key='comments-more',
+            on_success=lambda page: self._append_comments(record_id, *page),
+            on_error=self._on_load_more_failed,
+            after=self.comments_cursor
         )
-        content_label.pack(fill='x', padx=15, pady=(0, 10))
-
-        # Action buttons (only for comment owner)
-        if comment['user_id'] == self.get_session().user_id:
-            actions_frame = tk.Frame(comment_frame, bg=Theme.BG_LIGHT)
-            actions_frame.pack(fill='x', padx=15, pady=(0, 10))
-
-            edit_btn = ttk.Button(
-                actions_frame,
-                text="Edit",
-                style='Info.TButton',
-                command=lambda c=comment: self._handle_edit_comment(c)
-            )
-            edit_btn.pack(side='left', padx=(0, 5))
 
-            delete_btn = ttk.Button(
-                actions_frame,
-                text="Delete",
-                style='Danger.TButton',
-                command=lambda c=comment: self._handle_delete_comment(c)
+    def _append_comments(self, record_id, comments, cursor, count=None):
+        """Append a page of comments below the ones already shown"""
+        if record_id != self.current_record_id:
+            return
+        self.comments_cursor = cursor
+        self.comment_list.append_comments(comments)
+        self._update_load_more()
+
+    def _on_load_more_failed(self, error):
+        """Let the user try loading the next page again"""
+        self.show_notification(f"Could not load data: {error}", 'error')
+        self._update_load_more()
+
+    def _update_load_more(self):
+        """Show the "Load more" button below the list while pages remain"""
+        if self.load_more_frame is not None:
+            self.load_more_frame.destroy()
+            self.load_more_frame = None
+
+        if self.comments_cursor:
+            self.load_more_frame = tk.Frame(self.comments_list_frame, bg=Theme.BG_WHITE)
+            self.load_more_frame.pack(fill='x', pady=(0, 10))
+            self.load_more_button = ttk.Button(
+                self.load_more_frame,
+                text="Load more comments",
+                style='Secondary.TButton',
+                command=self._load_more_comments
             )
-            delete_btn.pack(side='left')
+            self.load_more_button.pack()
 
     def _handle_add_comment(self):
         """Handle add comment button click"""
@@ -347,14 +342,21 @@ class ViewRecordView(BaseView):
             self.show_notification(message, 'error')
             return
 
-        # Add comment
+        # Add comment (on a worker thread)
         user_id = self.get_session().user_id
-        success, message = self.comment_model.add_comment(self.current_record_id, user_id, content)
+        self.run_async(
+            self.get_data().create_comment, self.current_record_id, user_id, content,
+            cancellable=False,
+            on_success=self._on_comment_added
+        )
 
+    def _on_comment_added(self, result):
+        """Report the outcome of adding a comment"""
+        success, message = result
         if success:
             self.show_notification(message, 'success')
             self.new_comment_text.delete('1.0', tk.END)
-            self._populate_comments()
+            self._load_new_comments()
         else:
             self.show_notification(message, 'error')
 
@@ -383,11 +385,19 @@ class ViewRecordView(BaseView):
                 messagebox.showerror("Validation Error", message)
                 return
 
-            success, message = self.comment_model.edit_comment(comment['id'], new_content)
+            self.run_async(
+                self.get_data().update_comment,
+                self.current_record_id, comment['id'], new_content, self.get_session().user_id,
+                cancellable=False,
+                on_success=lambda result: on_saved(result, new_content)
+            )
+
+        def on_saved(result, new_content):
+            success, message = result
             if success:
                 self.show_notification(message, 'success')
                 dialog.destroy()
-                self._populate_comments()
+                self.comment_list.update_comment(comment.edited(new_content, datetime.utcnow()))
             else:
                 messagebox.showerror("Error", message)
 
@@ -402,12 +412,22 @@ class ViewRecordView(BaseView):
         )
 
         if result:
-            success, message = self.comment_model.delete_comment(comment['id'])
-            if success:
-                self.show_notification(message, 'success')
-                self._populate_comments()
-            else:
-                self.show_notification(message, 'error')
+            self.run_async(
+                self.get_data().delete_comment,
+                self.current_record_id, comment['id'], self.get_session().user_id,
+                cancellable=False,
+                on_success=lambda outcome: self._on_comment_deleted(outcome, comment['id'])
+            )
+
+    def _on_comment_deleted(self, result, comment_id):
+        """Report the outcome of deleting a comment"""
+        success, message = result
+        if success:
+            self.show_notification(message, 'success')
+            self.comment_list.remove_comment(comment_id)
+            self._set_comment_count(max(self.comment_count - 1, 0))
+        else:
+            self.show_notification(message, 'error')
 
     def refresh(self, **kwargs):
         """Load record and comments when view is shown"""
@@ -417,13 +437,20 @@ class ViewRecordView(BaseView):
             return
 
         self.current_record_id = record_id
+        self.current_record = None
+        user_id = self.get_session().user_id
 
-        # Get record
-        self.current_record = self.record_model.read_record(record_id)
-        if not self.current_record:
-            self.show_notification("Record not found", 'error')
-            self.navigate_to('dashboard')
+        # Prefetched (e.g. when selected on the dashboard): show it right away
+        details = self.get_data().peek_record_details(record_id, user_id)
+        if details is not None:
+            self._on_loaded(details)
             return
 
-        # Build UI
-        self._build_record_details()
+        self.show_loading(self.content_frame, "Loading record...")
+
+        # Get record and comments (on a worker thread), then build UI
+        self.run_async(
+            self.get_data().get_record_details, record_id, user_id,
+            key='record',
+            on_success=self._on_loaded
+        )
@@ -1,16 +1,77 @@
 """
 Chart widget for analytics
 Integrates matplotlib for displaying charts in tkinter
+
+matplotlib is imported on the first render, not when this module loads.
+Charts are drawn with the Agg backend on a background thread into a PNG,
+which is then swapped into the widget on the Tk thread, so the window keeps
+responding (and the rest of the page is shown) while charts render. Each
+widget keeps one figure and updates its artists in place when replotted.
 """
+import base64
+import importlib.util
+import io
+import math
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from gui.theme import Theme
 
-try:
-    from matplotlib.figure import Figure
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+# Checked without importing matplotlib
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+
+# A single thread: matplotlib's global state (font cache, rcParams) is not thread-safe
+_renderer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chart-render')
+
+
+class _Figure:
+    """
+    A figure kept for the lifetime of a ChartWidget
+
+    Holds the axes and the artists of the current chart so a new plot with
+    the same labels only changes their data (wedge angles, bar heights, line
+    data) instead of building the chart again. Only used on the render thread.
+    """
+
+    def __init__(self, figsize, dpi):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.figure = Figure(figsize=figsize, dpi=dpi, facecolor=Theme.BG_WHITE)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        # Chart type and labels the artists were created for
+        self.layout = None
+        self.artists = None
+
+    def render(self, layout, build, update) -> bytes:
+        """
+        Bring the chart up to date and encode it as PNG
+
+        Args:
+            layout: Chart type and labels; artists are reused while it is unchanged
+            build: Function creating the chart on the axes, returns its artists
+            update: Function changing existing artists to the new data
+
+        Returns:
+            PNG image data
+        """
+        if layout == self.layout:
+            try:
+                update(self.ax, self.artists)
+            except Exception:
+                # Build from scratch next time rather than reuse half-updated artists
+                self.layout = None
+                raise
+        else:
+            self.ax.clear()
+            self.artists = build(self.ax)
+            self.layout = layout
+        # New values can change tick label widths
+        self.figure.tight_layout()
+
+        buffer = io.BytesIO()
+        self.canvas.print_png(buffer)
+        return buffer.getvalue()
 
 
 class ChartWidget(tk.Frame):
@@ -19,6 +80,10 @@ class ChartWidget(tk.Frame):
     Supports doughnut (pie) and bar charts
     """
 
+    # How often a pending render is checked for completion (ms)
+    POLL_MS = 30
+    DPI = 100
+
     def __init__(self, parent, figsize=(6, 4)):
         """
         Initialize chart widget
@@ -28,6 +93,12 @@ class ChartWidget(tk.Frame):
             figsize: Tuple of (width, height) in inches
         """
         super().__init__(parent, bg=Theme.BG_WHITE)
+        self.figsize = figsize
+        self.image = None
+        self._future = None
+        self._poll_job = None
+        # Created on the render thread by the first plot
+        self._figure = None
 
         if not MATPLOTLIB_AVAILABLE:
             # Show error message if matplotlib not installed
@@ -41,16 +112,79 @@ class ChartWidget(tk.Frame):
             error_label.pack(expand=True)
             return
 
-        # Create matplotlib figure
-        self.figure = Figure(figsize=figsize, dpi=100, facecolor=Theme.BG_WHITE)
-        self.canvas = FigureCanvasTkAgg(self.figure, self)
-        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        # Reserve the chart's size so the layout does not jump when it arrives
+        self.configure(width=int(figsize[0] * self.DPI), height=int(figsize[1] * self.DPI))
+        self.pack_propagate(False)
+
+        self.image_label = tk.Label(
+            self,
+            text="Loading chart...",
+            font=Theme.FONT_BODY,
+            fg=Theme.TEXT_SECONDARY,
+            bg=Theme.BG_WHITE
+        )
+        self.image_label.pack(fill='both', expand=True)
 
     def clear(self):
-        """Clear the current chart"""
+        """Clear the current chart (and drop a render still in progress)"""
         if MATPLOTLIB_AVAILABLE:
-            self.figure.clear()
-            self.canvas.draw()
+            self._cancel_render()
+            self.image = None
+            self.image_label.configure(image='', text='')
+
+    def _render(self, layout, build, update):
+        """
+        Render a chart on the render thread and show it when done
+
+        A render that has not started yet is replaced, so quick successive
+        plots only draw the latest data.
+        """
+        if not MATPLOTLIB_AVAILABLE:
+            return
+
+        self._cancel_render()
+        self._future = _renderer.submit(self._render_figure, layout, build, update)
+        self._poll_job = self.after(self.POLL_MS, self._poll)
+
+    def _render_figure(self, layout, build, update) -> bytes:
+        """Draw into this widget's figure (runs on the render thread)"""
+        if self._figure is None:
+            self._figure = _Figure(self.figsize, self.DPI)
+        return self._figure.render(layout, build, update)
+
+    def _poll(self):
+        """Swap the rendered image in once the render thread has finished"""
+        self._poll_job = None
+        future = self._future
+        if future is None:
+            return
+        if not future.done():
+            self._poll_job = self.after(self.POLL_MS, self._poll)
+            return
+
+        self._future = None
+        try:
+            png = future.result()
+        except Exception as e:
+            self.image_label.configure(image='', text=f"Could not draw chart: {e}", fg=Theme.DANGER)
+            return
+
+        image = tk.PhotoImage(data=base64.b64encode(png).decode('ascii'))
+        self.image_label.configure(image=image, text='')
+        self.image = image
+
+    def _cancel_render(self):
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def destroy(self):
+        """Stop waiting for a render before the widget goes away"""
+        self._cancel_render()
+        super().destroy()
 
     def plot_doughnut(self, labels, sizes, colors, title=""):
         """
@@ -62,12 +196,20 @@ class ChartWidget(tk.Frame):
             colors: List of hex color codes
             title: Chart title
         """
-        if not MATPLOTLIB_AVAILABLE:
-            return
+        labels, sizes, colors = list(labels), list(sizes), list(colors)
 
-        self.clear()
-        ax = self.figure.add_subplot(111)
+        def build(ax):
+            return self._draw_doughnut(ax, labels, sizes, colors, title)
 
+        def update(ax, artists):
+            self._update_doughnut(artists, sizes)
+            ax.set_title(title, fontsize=12, color=Theme.TEXT_PRIMARY, pad=20)
+
+        self._render(('doughnut', tuple(labels), tuple(colors)), build, update)
+
+    @staticmethod
+    def _draw_doughnut(ax, labels, sizes, colors, title):
+        """Draw a doughnut chart on an axes, returns its (wedges, texts, autotexts)"""
         # Create pie chart with hole in center (doughnut)
         wedges, texts, autotexts = ax.pie(
             sizes,
@@ -92,8 +234,31 @@ class ChartWidget(tk.Frame):
             ax.set_title(title, fontsize=12, color=Theme.TEXT_PRIMARY, pad=20)
 
         ax.axis('equal')  # Equal aspect ratio ensures circular shape
-        self.figure.tight_layout()
-        self.canvas.draw()
+        return wedges, texts, autotexts
+
+    @staticmethod
+    def _update_doughnut(artists, sizes):
+        """Move the wedges and their labels of a drawn doughnut to new sizes"""
+        wedges, texts, autotexts = artists
+        total = float(sum(sizes))
+        if total <= 0:
+            raise ValueError("Doughnut chart needs a positive total")
+
+        # Same geometry as Axes.pie: counterclockwise from 90°, labels at
+        # 1.1 × radius, percentages at 0.6 × radius
+        start = 90.0
+        for wedge, text, autotext, size in zip(wedges, texts, autotexts, sizes):
+            end = start + 360.0 * size / total
+            wedge.set_theta1(start)
+            wedge.set_theta2(end)
+
+            middle = math.radians((start + end) / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            text.set_position((1.1 * x, 1.1 * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((0.6 * x, 0.6 * y))
+            autotext.set_text(f'{100.0 * size / total:1.1f}%')
+            start = end
 
     def plot_bar(self, categories, values, color, title="", xlabel="", ylabel=""):
         """
@@ -107,19 +272,28 @@ class ChartWidget(tk.Frame):
             xlabel: X-axis label
             ylabel: Y-axis label
         """
-        if not MATPLOTLIB_AVAILABLE:
-            return
+        categories, values = list(categories), list(values)
+
+        def build(ax):
+            return self._draw_bar(ax, categories, values, color, title, xlabel, ylabel)
 
-        self.clear()
-        ax = self.figure.add_subplot(111)
+        def update(ax, artists):
+            self._update_bar(ax, artists, values)
+            ax.set_title(title, fontsize=12, color=Theme.TEXT_PRIMARY, pad=20)
+
+        self._render(('bar', tuple(categories), color, xlabel, ylabel), build, update)
 
+    @staticmethod
+    def _draw_bar(ax, categories, values, color, title, xlabel, ylabel):
+        """Draw a bar chart on an axes, returns its (bars, value labels)"""
         # Create bar chart
         bars = ax.bar(categories, values, color=color, width=0.6)
 
         # Add value labels on top of bars
+        value_labels = []
         for bar in bars:
             height = bar.get_height()
-            ax.text(
+            value_labels.append(ax.text(
                 bar.get_x() + bar.get_width() / 2.,
                 height,
                 f'{int(height)}',
@@ -127,7 +301,7 @@ class ChartWidget(tk.Frame):
                 va='bottom',
                 fontsize=9,
                 color=Theme.TEXT_PRIMARY
-            )
+            ))
 
         # Style axes
         ax.set_facecolor(Theme.BG_WHITE)
@@ -148,9 +322,22 @@ class ChartWidget(tk.Frame):
 
         # Set y-axis to start at 0
         ax.set_ylim(bottom=0)
-
-        self.figure.tight_layout()
-        self.canvas.draw()
+        return bars, value_labels
+
+    @staticmethod
+    def _update_bar(ax, artists, values):
+        """Set new heights on the bars of a drawn bar chart"""
+        bars, value_labels = artists
+        for bar, label, value in zip(bars, value_labels, values):
+            bar.set_height(value)
+            label.set_y(value)
+            label.set_text(f'{int(value)}')
+
+        # set_ylim(bottom=0) turned autoscaling off; rescale to the new heights
+        ax.set_autoscaley_on(True)
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_ylim(bottom=0)
 
     def plot_line(self, x_data, y_data, color, title="", xlabel="", ylabel=""):
         """
@@ -164,17 +351,25 @@ class ChartWidget(tk.Frame):
             xlabel: X-axis label
             ylabel: Y-axis label
         """
-        if not MATPLOTLIB_AVAILABLE:
-            return
+        x_data, y_data = list(x_data), list(y_data)
+
+        def build(ax):
+            return self._draw_line(ax, x_data, y_data, color, title, xlabel, ylabel)
+
+        def update(ax, artists):
+            self._update_line(ax, artists, y_data, color)
+            ax.set_title(title, fontsize=12, color=Theme.TEXT_PRIMARY, pad=20)
 
-        self.clear()
-        ax = self.figure.add_subplot(111)
+        self._render(('line', tuple(x_data), color, xlabel, ylabel), build, update)
 
+    @staticmethod
+    def _draw_line(ax, x_data, y_data, color, title, xlabel, ylabel):
+        """Draw a line chart on an axes, returns its [line, filled area]"""
         # Create line chart
-        ax.plot(x_data, y_data, color=color, linewidth=2, marker='o', markersize=6)
+        line, = ax.plot(x_data, y_data, color=color, linewidth=2, marker='o', markersize=6)
 
         # Fill area under line
-        ax.fill_between(x_data, y_data, alpha=0.2, color=color)
+        area = ax.fill_between(x_data, y_data, alpha=0.2, color=color)
 
         # Style axes
         ax.set_facecolor(Theme.BG_WHITE)
@@ -194,6 +389,17 @@ class ChartWidget(tk.Frame):
 
         # Add grid
         ax.grid(True, alpha=0.3, color=Theme.BORDER)
+        return [line, area]
 
-        self.figure.tight_layout()
-        self.canvas.draw()
+    @staticmethod
+    def _update_line(ax, artists, y_data, color):
+        """Set new y values on the line of a drawn line chart"""
+        line, area = artists
+        line.set_ydata(y_data)
+
+        # A filled area cannot be reshaped; replace just that artist
+        area.remove()
+        artists[1] = ax.fill_between(line.get_xdata(), y_data, alpha=0.2, color=color)
+
+        ax.relim()
+        ax.autoscale_view()
@@ -0,0 +1,344 @@
+"""
+Comment list widget
+Scrollable list of comments drawn on a Canvas
+
+Only the comments inside the viewport are drawn. Each one uses a slot: a
+fixed group of canvas items (background, author, time, text and the
+Edit/Delete links) that is moved and re-filled as the list scrolls instead
+of being created and destroyed, so a thread of any length costs a handful
+of items and no Tk widgets per comment.
+
+Comments have different heights. Each height is measured once (by laying
+the text out in an off-screen canvas item) and cached per comment, keyed on its
+content and the wrap width; the row offsets are prefix sums of the heights.
+Adding, editing or removing one comment only measures that comment.
+"""
+import bisect
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+from gui.theme import Theme
+
+
+class _Slot:
+    """Canvas items showing one comment, reused for other comments on scroll"""
+
+    __slots__ = ('tag', 'background', 'username', 'timestamp', 'content',
+                 'edit', 'delete', 'comment_id', 'key', 'y')
+
+    def __init__(self, canvas, number):
+        self.tag = f'slot{number}'
+        tags = (self.tag,)
+        self.background = canvas.create_rectangle(0, 0, 0, 0, fill=Theme.BG_LIGHT,
+                                                  outline=Theme.BORDER_DARK, tags=tags)
+        self.username = canvas.create_text(0, 0, anchor='nw', font=Theme.FONT_BODY_BOLD,
+                                           fill=Theme.TEXT_PRIMARY, tags=tags)
+        self.timestamp = canvas.create_text(0, 0, anchor='nw', font=Theme.FONT_SMALL,
+                                            fill=Theme.TEXT_SECONDARY, tags=tags)
+        self.content = canvas.create_text(0, 0, anchor='nw', font=Theme.FONT_BODY,
+                                          fill=Theme.TEXT_PRIMARY, tags=tags)
+        self.edit = canvas.create_text(0, 0, anchor='nw', text="Edit", font=Theme.FONT_BODY_BOLD,
+                                       fill=Theme.INFO, tags=tags + ('action',))
+        self.delete = canvas.create_text(0, 0, anchor='nw', text="Delete", font=Theme.FONT_BODY_BOLD,
+                                         fill=Theme.DANGER, tags=tags + ('action',))
+        # Comment shown, what it was drawn from, and its top
+        self.comment_id = None
+        self.key = None
+        self.y = None
+
+
+class CommentList(tk.Frame):
+    """
+    Virtualized list of comments (newest first)
+    Shows author, time and text, with Edit/Delete links on modifiable comments
+    """
+
+    PAD_X = 15
+    PAD_Y = 10
+    # Space between comments
+    GAP = 10
+    # Space between the header, the text and the links
+    LINE_GAP = 5
+    # Pixels scrolled per mouse wheel notch
+    WHEEL_PIXELS = 60
+
+    def __init__(self, parent, height=480, can_modify=None, on_edit=None, on_delete=None,
+                 empty_text="No comments yet"):
+        """
+        Initialize comment list
+
+        Args:
+            parent: Parent widget
+            height: Largest height of the list in pixels (it shrinks to fit fewer comments)
+            can_modify: Function telling whether a comment gets Edit/Delete links
+            on_edit: Called with the comment when Edit is clicked
+            on_delete: Called with the comment when Delete is clicked
+            empty_text: Text shown when there are no comments
+        """
+        super().__init__(parent, bg=Theme.BG_WHITE)
+        self.max_height = height
+        self.can_modify = can_modify or (lambda comment: False)
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+
+        # Comments in display order, comment ID -> position, and row tops
+        # (offsets[i] is the top of comment i, offsets[-1] the total height)
+        self.comments = []
+        self._positions = {}
+        self.offsets = [0]
+        # Comment ID -> (key it was measured with, height)
+        self._heights = {}
+
+        self._slots = []
+        self._free = []
+        self._shown = {}
+        self._width = 0
+        self._rendering = False
+
+        self.bold_font = tkfont.Font(font=Theme.FONT_BODY_BOLD)
+
+        self.canvas = tk.Canvas(self, bg=Theme.BG_WHITE, highlightthickness=0,
+                                height=height, yscrollincrement=1)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yview)
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        # Lays text out to measure it; kept outside the scroll region (bbox
+        # ignores hidden items)
+        self._measure = self.canvas.create_text(-10000, -10000, anchor='nw', font=Theme.FONT_BODY)
+        self._empty = self.canvas.create_text(0, 0, anchor='n', text=empty_text,
+                                              font=Theme.FONT_BODY, fill=Theme.TEXT_SECONDARY)
+
+        self.canvas.bind('<Configure>', self._on_configure)
+        self.canvas.bind('<MouseWheel>', lambda e: self._on_wheel(-1 if e.delta > 0 else 1))
+        self.canvas.bind('<Button-4>', lambda e: self._on_wheel(-1))
+        self.canvas.bind('<Button-5>', lambda e: self._on_wheel(1))
+        self.canvas.tag_bind('action', '<Enter>', lambda e: self.canvas.configure(cursor='hand2'))
+        self.canvas.tag_bind('action', '<Leave>', lambda e: self.canvas.configure(cursor=''))
+
+        self._layout()
+
+    # ------------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------------
+
+    def set_comments(self, comments):
+        """
+        Replace the comments shown (measurements of known comments are kept)
+
+        Args:
+            comments: List of comments, newest first
+        """
+        self.comments = list(comments)
+        self.canvas.yview_moveto(0)
+        self._reindex()
+
+    def append_comments(self, comments):
+        """Add older comments (e.g. the next page) below the ones shown"""
+        known = self._positions
+        self.comments.extend(comment for comment in comments if comment['id'] not in known)
+        self._reindex()
+
+    def insert_comments(self, comments):
+        """
+        Add new comments in date order, skipping ones already shown
+
+        Used after posting: the first page is read again and merged in, so
+        older pages loaded below stay as they are.
+        """
+        known = set(self._positions)
+        for comment in comments:
+            if comment['id'] in known:
+                continue
+            known.add(comment['id'])
+            # Same order as the thread: created_at, then ID, descending
+            key = (comment['created_at'], comment['id'])
+            index = next((i for i, shown in enumerate(self.comments)
+                          if (shown['created_at'], shown['id']) < key), len(self.comments))
+            self.comments.insert(index, comment)
+        self._reindex()
+
+    def update_comment(self, comment):
+        """Show a changed comment (matched by ID) in place"""
+        index = self._positions.get(comment['id'])
+        if index is None:
+            return
+        self.comments[index] = comment
+        self._reindex()
+
+    def remove_comment(self, comment_id: str):
+        """Remove a comment from the list"""
+        index = self._positions.get(comment_id)
+        if index is None:
+            return
+        del self.comments[index]
+        self._heights.pop(comment_id, None)
+        self._reindex()
+
+    def __len__(self):
+        return len(self.comments)
+
+    # ------------------------------------------------------------------
+    # Measuring and layout
+    # ------------------------------------------------------------------
+
+    def _reindex(self):
+        """Recompute positions and offsets after the comments changed, then redraw"""
+        self._positions = {comment['id']: index for index, comment in enumerate(self.comments)}
+        self._layout()
+
+    def _layout(self):
+        """Compute every row's offset from the (cached) heights and redraw"""
+        if not self._width:
+            # Not laid out yet; measured with the real width on <Configure>
+            return
+        width = self._text_width()
+        offsets = [0]
+        total = 0
+        for comment in self.comments:
+            total += self._height(comment, width) + self.GAP
+            offsets.append(total)
+        self.offsets = offsets
+
+        if self.comments:
+            self.canvas.itemconfigure(self._empty, state='hidden')
+            height = min(self.max_height, total)
+        else:
+            self.canvas.itemconfigure(self._empty, state='normal')
+            self.canvas.coords(self._empty, self._width / 2, 20)
+            height = 60
+        self.canvas.configure(scrollregion=(0, 0, self._width, max(total, height)),
+                              height=height)
+        self._render()
+
+    def _height(self, comment, width) -> int:
+        """Height of a comment's row, measured once per content and width"""
+        modifiable = self.can_modify(comment)
+        key = (comment['content'], modifiable, width)
+        cached = self._heights.get(comment['id'])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        self.canvas.itemconfigure(self._measure, text=comment['content'], width=width)
+        x1, y1, x2, y2 = self.canvas.bbox(self._measure) or (0, 0, 0, 0)
+        height = self.PAD_Y + self.bold_font.metrics('linespace') + self.LINE_GAP + (y2 - y1)
+        if modifiable:
+            height += self.LINE_GAP + self.bold_font.metrics('linespace')
+        height += self.PAD_Y
+
+        self._heights[comment['id']] = (key, height)
+        return height
+
+    def _text_width(self) -> int:
+        return max(self._width - 2 * self.PAD_X, 100)
+
+    def _on_configure(self, event):
+        """Re-wrap the comments when the width changes"""
+        if event.width != self._width:
+            self._width = event.width
+            self._layout()
+        else:
+            self._render()
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+
+    def _on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        self._render()
+
+    def _on_wheel(self, direction):
+        if self.offsets[-1] > self.canvas.winfo_height():
+            self.canvas.yview_scroll(direction * self.WHEEL_PIXELS, 'units')
+
+    def _render(self):
+        """Draw the comments in the viewport, reusing the slots of the others"""
+        if self._rendering:
+            return
+        if not self._width or len(self.offsets) != len(self.comments) + 1:
+            return
+        self._rendering = True
+        try:
+            top = self.canvas.canvasy(0)
+            bottom = top + max(self.canvas.winfo_height(), self.max_height)
+            first = max(bisect.bisect_right(self.offsets, top) - 1, 0)
+            last = min(bisect.bisect_left(self.offsets, bottom), len(self.comments))
+            wanted = {self.comments[i]['id'] for i in range(first, last)}
+
+            # Release slots of comments that left the viewport (or the list)
+            for comment_id in [cid for cid in self._shown if cid not in wanted]:
+                slot = self._shown.pop(comment_id)
+                self.canvas.itemconfigure(slot.tag, state='hidden')
+                slot.comment_id = None
+                slot.key = None
+                self._free.append(slot)
+
+            for index in range(first, last):
+                comment = self.comments[index]
+                slot = self._shown.get(comment['id'])
+                if slot is None:
+                    slot = self._free.pop() if self._free else self._new_slot()
+                    slot.comment_id = comment['id']
+                    self._shown[comment['id']] = slot
+                self._draw(slot, comment, self.offsets[index])
+        finally:
+            self._rendering = False
+
+    def _new_slot(self):
+        slot = _Slot(self.canvas, len(self._slots))
+        self.canvas.tag_bind(slot.edit, '<Button-1>', lambda e: self._on_action(slot, self.on_edit))
+        self.canvas.tag_bind(slot.delete, '<Button-1>', lambda e: self._on_action(slot, self.on_delete))
+        self._slots.append(slot)
+        return slot
+
+    def _draw(self, slot, comment, y):
+        """Fill a slot with a comment at a given top (skipped when unchanged)"""
+        width = self._text_width()
+        modifiable = self.can_modify(comment)
+        key = (comment['content'], comment['username'], comment['created_at'],
+               comment['updated_at'], modifiable, width)
+        if slot.key == key:
+            if slot.y != y:
+                self.canvas.move(slot.tag, 0, y - slot.y)
+                slot.y = y
+            return
+
+        canvas = self.canvas
+        height = self.offsets[self._positions[comment['id']] + 1] - y - self.GAP
+        x = self.PAD_X
+        line = self.bold_font.metrics('linespace')
+
+        canvas.coords(slot.background, 0, y, self._width - 1, y + height)
+        canvas.itemconfigure(slot.username, text=comment['username'])
+        canvas.coords(slot.username, x, y + self.PAD_Y)
+
+        timestamp = comment['created_at']
+        if comment['updated_at'] != comment['created_at']:
+            timestamp += " (edited)"
+        canvas.itemconfigure(slot.timestamp, text=timestamp)
+        name_width = self.bold_font.measure(comment['username'])
+        canvas.coords(slot.timestamp, x + name_width + 10, y + self.PAD_Y + 2)
+
+        content_y = y + self.PAD_Y + line + self.LINE_GAP
+        canvas.itemconfigure(slot.content, text=comment['content'], width=width)
+        canvas.coords(slot.content, x, content_y)
+        canvas.itemconfigure(slot.tag, state='normal')
+
+        if modifiable:
+            links_y = y + height - self.PAD_Y - line
+            canvas.coords(slot.edit, x, links_y)
+            canvas.coords(slot.delete, x + self.bold_font.measure("Edit") + 15, links_y)
+        else:
+            canvas.itemconfigure(slot.edit, state='hidden')
+            canvas.itemconfigure(slot.delete, state='hidden')
+
+        slot.key = key
+        slot.y = y
+
+    def _on_action(self, slot, callback):
+        """Run an Edit/Delete callback for the comment a slot shows"""
+        index = self._positions.get(slot.comment_id)
+        if callback is not None and index is not None:
+            callback(self.comments[index])
@@ -1,7 +1,25 @@
 """
 Data table widget
 Wrapper around ttk.Treeview for displaying records
+
+In virtual mode the rows stay in a Python list and the Treeview only holds
+a pool of items for the rows currently on screen. Scrolling re-fills the
+same items with other rows instead of inserting and deleting them, so
+populating is instant and Tcl memory stays proportional to the viewport
+however many rows there are. Selection is tracked by row index in Python.
+
+update_rows() refreshes the table in place: rows are matched by a key
+column (the record ID) and only changed items are touched, keeping the
+selection and scroll position.
+
+Clicking a heading (sortable=True) sorts and set_filter() filters the rows
+in memory, without another query. The lowercase search text of every row
+(and a key -> row lookup) is built in small steps while the app is idle
+after the data loads, so filtering only has to scan prepared strings.
+Per-column sort orders are built on first use. All of these are kept until
+the data changes.
 """
+import time
 import tkinter as tk
 from tkinter import ttk
 from gui.theme import Theme
@@ -13,7 +31,20 @@ class DataTable(tk.Frame):
     Wraps ttk.Treeview with convenient methods
     """
 
-    def __init__(self, parent, columns, show_scrollbar=True, height=15):
+    # Rows moved per mouse wheel notch (virtual mode)
+    WHEEL_ROWS = 3
+
+    # Typing pause before the filter is applied
+    FILTER_DELAY_MS = 150
+
+    # Separates columns in the search text so a match never spans two columns
+    SEARCH_SEPARATOR = '\x00'
+
+    # Time spent building the search index per idle step (ms)
+    INDEX_BUDGET_MS = 8
+
+    def __init__(self, parent, columns, show_scrollbar=True, height=15, selectmode='browse',
+                 virtual=False, key_column=0, sortable=False):
         """
         Initialize data table
 
@@ -22,9 +53,48 @@ class DataTable(tk.Frame):
             columns: List of column definitions [(id, heading, width), ...]
             show_scrollbar: Whether to show vertical scrollbar
             height: Number of rows to display
+            selectmode: 'browse' for single selection, 'extended' for multi-select
+                        (Shift/Ctrl-click)
+            virtual: Only materialize the visible rows (for very large data sets)
+            key_column: Index of the column identifying a row (used by update_rows)
+            sortable: Sort by a column when its heading is clicked
         """
         super().__init__(parent, bg=Theme.BG_WHITE)
         self.columns = columns
+        self.virtual = virtual
+        self.selectmode = selectmode
+        self.key_column = key_column
+
+        # In-memory sort and filter: all rows as given, the active sort and
+        # filter, and caches built on first use
+        self.data = []
+        self.sort_column = None
+        self.sort_descending = False
+        self.filter_text = ''
+        self._sort_orders = {}
+        self._search_text = []
+        self._key_index = {}
+        self._index_job = None
+        self._matches = None
+        self._pending_filter = ''
+        self._filter_job = None
+
+        # Python-side copy of what the Treeview shows, so diffs need no Tk reads:
+        # item IDs in display order, and item ID -> (values, tag)
+        self._items = []
+        self._shown = {}
+
+        # Virtual mode state: shown rows, first visible row, selected row indices
+        self.rows = []
+        self.offset = 0
+        self.visible = height
+        self.selected = set()
+        self.focus_index = None
+        self.anchor_index = None
+        self._pool = []
+        self._detached = set()
+        self._selection_callbacks = []
+        self.scrollbar = None
 
         # Create treeview
         column_ids = [col[0] for col in columns]
@@ -32,13 +102,17 @@ class DataTable(tk.Frame):
             self,
             columns=column_ids,
             show='headings',
-            selectmode='browse',
+            selectmode=selectmode,
             height=height
         )
 
         # Configure columns
-        for col_id, col_heading, col_width in columns:
-            self.tree.heading(col_id, text=col_heading)
+        for index, (col_id, col_heading, col_width) in enumerate(columns):
+            if sortable:
+                self.tree.heading(col_id, text=col_heading,
+                                  command=lambda c=index: self.sort_by(c))
+            else:
+                self.tree.heading(col_id, text=col_heading)
             self.tree.column(col_id, width=col_width, anchor='w')
 
         # Pack treeview
@@ -46,37 +120,339 @@ class DataTable(tk.Frame):
 
         # Add scrollbar if requested
         if show_scrollbar:
-            scrollbar = ttk.Scrollbar(
+            self.scrollbar = ttk.Scrollbar(
                 self,
                 orient='vertical',
-                command=self.tree.yview
+                command=self._on_scrollbar if virtual else self.tree.yview
             )
-            scrollbar.pack(side='right', fill='y')
-            self.tree.configure(yscrollcommand=scrollbar.set)
+            self.scrollbar.pack(side='right', fill='y')
+            if not virtual:
+                self.tree.configure(yscrollcommand=self.scrollbar.set)
 
         # Zebra striping (alternating row colors)
         self.tree.tag_configure('oddrow', background=Theme.BG_WHITE)
         self.tree.tag_configure('evenrow', background=Theme.BG_LIGHT)
 
+        if virtual:
+            self._bind_virtual_events()
+
     def set_data(self, rows):
         """
         Populate table with data
 
+        A new data set is shown in the order given (any column sort is
+        cleared); the filter text is kept.
+
         Args:
-            rows: List of tuples matching column structure
+            rows: List of tuples (or tuple-like rows such as Record) matching column structure
         """
-        # Clear existing data
-        self.clear()
+        self._load(rows)
+        if self.sort_column is not None:
+            self.sort_column = None
+            self._update_headings()
+        self._show_rows(self._view_rows())
+
+    def _show_rows(self, rows):
+        """Display rows from scratch"""
+        if self.virtual:
+            self.rows = rows if isinstance(rows, list) else list(rows)
+            self.offset = 0
+            self.selected = set()
+            self.focus_index = self.anchor_index = None
+            self._render()
+            self._notify_selection()
+            return
+
+        # Clear existing data (one Tcl call for all items instead of one per row)
+        self.tree.delete(*self.tree.get_children())
+        self._items = []
+        self._shown = {}
 
         # Insert new data
         for i, row in enumerate(rows):
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            self.tree.insert('', 'end', values=row, tags=(tag,))
+            tag = self._stripe(i)
+            values = tuple(row)
+            item = self.tree.insert('', 'end', values=values, tags=(tag,))
+            self._items.append(item)
+            self._shown[item] = (values, tag)
+
+    def update_rows(self, rows):
+        """
+        Replace the data, touching only rows that were added, removed, changed or moved
+
+        Rows are matched on key_column. Selection and scroll position are
+        kept for rows that are still present. Changing, adding or removing a
+        single row costs a constant number of Tk calls (virtual mode; in
+        normal mode rows below an insert or delete may need a new stripe).
+
+        Args:
+            rows: List of tuple-like rows matching column structure
+        """
+        self._load(rows)
+        rows = self._view_rows()
+        if self.virtual:
+            self._update_virtual(rows)
+        else:
+            self._update_items(rows)
+
+    def destroy(self):
+        """Cancel pending indexing and filtering before the widget goes away"""
+        for job in (self._index_job, self._filter_job):
+            if job is not None:
+                self.after_cancel(job)
+        self._index_job = self._filter_job = None
+        super().destroy()
+
+    def _load(self, rows):
+        """Store a new data set, drop the caches built from the old one and start indexing"""
+        self.data = rows if isinstance(rows, list) else list(rows)
+        self._sort_orders = {}
+        self._search_text = []
+        self._key_index = {}
+        self._matches = None
+        if self._index_job is None and self.data:
+            self._index_job = self.after_idle(self._index_step)
+
+    def _index_step(self):
+        """Index rows for searching until this step's time budget is spent"""
+        self._index_job = None
+        deadline = time.perf_counter() + self.INDEX_BUDGET_MS / 1000
+        while len(self._search_text) < len(self.data):
+            self._index_rows(200)
+            if time.perf_counter() >= deadline:
+                # Let Tk handle events, then carry on
+                self._index_job = self.after(1, self._index_step)
+                return
+
+    def _index_rows(self, count):
+        """Add the search text and key lookup entries of the next rows"""
+        start = len(self._search_text)
+        separator = self.SEARCH_SEPARATOR
+        key_column = self.key_column
+        for i, row in enumerate(self.data[start:start + count], start):
+            values = tuple(row)
+            self._search_text.append(separator.join(map(str, values)).lower())
+            self._key_index[values[key_column]] = i
+
+    def _finish_index(self):
+        """Index the remaining rows now (filtering cannot wait for idle time)"""
+        remaining = len(self.data) - len(self._search_text)
+        if remaining:
+            self._index_rows(remaining)
+
+    def sort_by(self, column):
+        """
+        Sort the rows by a column in memory (clicking again reverses the order)
+
+        Args:
+            column: Column index
+        """
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self._update_headings()
+        self._show_view()
+
+    def set_filter(self, text, immediate=False):
+        """
+        Show only rows containing text (case-insensitive, in any column)
+
+        Applied after a short pause so typing stays responsive.
+
+        Args:
+            text: Search text; empty shows every row
+            immediate: Apply now instead of after the typing pause
+        """
+        self._pending_filter = text.strip().lower()
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+            self._filter_job = None
+        if immediate:
+            self._apply_filter()
+        else:
+            self._filter_job = self.after(self.FILTER_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        if self._pending_filter == self.filter_text:
+            return
+        self.filter_text = self._pending_filter
+        self._show_view()
+
+    def _show_view(self):
+        """Show the data re-sorted or re-filtered, from the top, keeping the selection"""
+        indices = self._view_indices()
+        rows = self.data if indices is None else [self.data[i] for i in indices]
+        if not self.virtual:
+            self._update_items(rows)
+            return
+
+        # data index -> position among the shown rows, built once for all selected keys
+        shown_at = None
+        if self.selected and indices is not None:
+            shown_at = {index: position for position, index in enumerate(indices)}
+
+        def locate(key):
+            # key -> data index -> position among the shown rows
+            index = self._key_index.get(key)
+            if index is None or shown_at is None:
+                return index
+            return shown_at.get(index)
+
+        if self.selected:
+            self._finish_index()
+        self._update_virtual(rows, keep_offset=False, locate=locate)
+
+    def _update_headings(self):
+        """Mark the sorted column's heading with the sort direction"""
+        for index, (col_id, col_heading, _) in enumerate(self.columns):
+            if index == self.sort_column:
+                col_heading += ' ▼' if self.sort_descending else ' ▲'
+            self.tree.heading(col_id, text=col_heading)
+
+    def _view_rows(self):
+        """Get the rows to show: data filtered and sorted with the cached indexes"""
+        indices = self._view_indices()
+        return self.data if indices is None else [self.data[i] for i in indices]
+
+    def _view_indices(self):
+        """Get the data indices of the rows to show, in order (None for all, unsorted)"""
+        matches = self._match(self.filter_text) if self.filter_text else None
+        if self.sort_column is None:
+            return matches
+
+        order = self._sort_order(self.sort_column, self.sort_descending)
+        if matches is None:
+            return order
+        keep = bytearray(len(self.data))
+        for i in matches:
+            keep[i] = 1
+        return [i for i in order if keep[i]]
+
+    def _match(self, text):
+        """Get the indices of rows containing text, narrowing the last result when possible"""
+        self._finish_index()
+        search_text = self._search_text
+
+        # Typing one more character only needs to look at the previous matches
+        if self._matches is not None and text.startswith(self._matches[0]):
+            candidates = self._matches[1]
+        else:
+            candidates = range(len(search_text))
+        matches = [i for i in candidates if text in search_text[i]]
+        self._matches = (text, matches)
+        return matches
+
+    def _sort_order(self, column, descending):
+        """Get row indices in column order (sorted once per column; descending is the reverse)"""
+        order = self._sort_orders.get((column, descending))
+        if order is None:
+            ascending = self._sort_orders.get((column, False))
+            if ascending is None:
+                keys = [self._sort_key(row[column]) for row in self.data]
+                ascending = sorted(range(len(keys)), key=keys.__getitem__)
+                self._sort_orders[(column, False)] = ascending
+            order = ascending[::-1] if descending else ascending
+            self._sort_orders[(column, descending)] = order
+        return order
+
+    @staticmethod
+    def _sort_key(value):
+        """Numbers sort numerically, everything else as case-insensitive text"""
+        if isinstance(value, (int, float)):
+            return (0, value, '')
+        return (1, 0, str(value).lower())
+
+    def _key(self, row):
+        return row[self.key_column]
+
+    @staticmethod
+    def _stripe(index):
+        return 'evenrow' if index % 2 == 0 else 'oddrow'
+
+    def _update_items(self, rows):
+        """Keyed diff against the Treeview items (normal mode)"""
+        current = {self._key(self._shown[item][0]): item for item in self._items}
+        new_keys = {self._key(row) for row in rows}
+
+        gone = [item for key, item in current.items() if key not in new_keys]
+        if gone:
+            self.tree.delete(*gone)
+            for item in gone:
+                del self._shown[item]
+            self._items = [item for item in self._items if item in self._shown]
+
+        for i, row in enumerate(rows):
+            values = tuple(row)
+            tag = self._stripe(i)
+            item = current.get(self._key(row))
+
+            if item is None:
+                item = self.tree.insert('', i, values=values, tags=(tag,))
+                self._items.insert(i, item)
+                self._shown[item] = (values, tag)
+                continue
+
+            if i >= len(self._items) or self._items[i] != item:
+                self.tree.move(item, '', i)
+                self._items.remove(item)
+                self._items.insert(i, item)
+
+            if self._shown[item] != (values, tag):
+                self.tree.item(item, values=values, tags=(tag,))
+                self._shown[item] = (values, tag)
+
+    def _update_virtual(self, rows, keep_offset=True, locate=None):
+        """
+        Swap in new rows, carrying selection and scroll position over by key (virtual mode)
+
+        Args:
+            rows: Rows to show
+            keep_offset: Keep the top visible row in view (otherwise start at the top)
+            locate: Function giving a key's position in rows (default: scan rows)
+        """
+        old_rows = self.rows
+
+        def key_at(index):
+            return self._key(old_rows[index]) if index is not None and index < len(old_rows) else None
+
+        selected_keys = {key_at(index) for index in self.selected}
+        focus_key = key_at(self.focus_index)
+        anchor_key = key_at(self.anchor_index)
+        top_key = key_at(self.offset) if keep_offset else None
+
+        self.rows = rows
+        # Only look up the rows that are needed (nothing at all without a selection)
+        wanted = (selected_keys | {focus_key, anchor_key, top_key}) - {None}
+        positions = {}
+        if wanted and locate is not None:
+            positions = {key: locate(key) for key in wanted}
+            positions = {key: i for key, i in positions.items() if i is not None}
+        elif wanted:
+            key_column = self.key_column
+            positions = {row[key_column]: i for i, row in enumerate(rows) if row[key_column] in wanted}
+        selected = {positions[key] for key in selected_keys if key in positions}
+        self.focus_index = positions.get(focus_key)
+        self.anchor_index = positions.get(anchor_key)
+        self.offset = positions.get(top_key, self.offset if keep_offset else 0)
+
+        changed = selected != self.selected or len(selected) != len(selected_keys)
+        self.selected = selected
+        self._render()
+        if changed:
+            self._notify_selection()
 
     def clear(self):
         """Clear all data from table"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.set_data([])
+
+    def get_selection_count(self):
+        """Get the number of selected rows"""
+        if self.virtual:
+            return len(self.selected)
+        return len(self.tree.selection())
 
     def get_selected(self):
         """
@@ -85,6 +461,11 @@ class DataTable(tk.Frame):
         Returns:
             Tuple of selected row values, or None if no selection
         """
+        if self.virtual:
+            if not self.selected:
+                return None
+            return list(self.rows[min(self.selected)])
+
         selection = self.tree.selection()
         if not selection:
             return None
@@ -92,6 +473,29 @@ class DataTable(tk.Frame):
         item = selection[0]
         return self.tree.item(item)['values']
 
+    def get_selected_rows(self):
+        """
+        Get data of every selected row (for multi-select tables)
+
+        Returns:
+            List of row value lists, in table order
+        """
+        if self.virtual:
+            return [list(self.rows[index]) for index in sorted(self.selected)]
+        return [self.tree.item(item)['values'] for item in self.tree.selection()]
+
+    def get_selected_ids(self, id_column=0):
+        """
+        Get IDs of every selected row
+
+        Args:
+            id_column: Index of ID column (default 0)
+
+        Returns:
+            List of ID values
+        """
+        return [row[id_column] for row in self.get_selected_rows()]
+
     def get_selected_id(self, id_column=0):
         """
         Get ID of selected row
@@ -128,6 +532,9 @@ class DataTable(tk.Frame):
         Args:
             callback: Function to call when selection changes
         """
+        if self.virtual:
+            self._selection_callbacks.append(callback)
+            return
         self.tree.bind('<<TreeviewSelect>>', lambda e: callback())
 
     def get_all_rows(self):
@@ -137,6 +544,9 @@ class DataTable(tk.Frame):
         Returns:
             List of tuples containing row values
         """
+        if self.virtual:
+            return [list(row) for row in self.rows]
+
         rows = []
         for item in self.tree.get_children():
             rows.append(self.tree.item(item)['values'])
@@ -151,3 +561,162 @@ class DataTable(tk.Frame):
         """
         for col_id, width in widths.items():
             self.tree.column(col_id, width=width)
+
+    # --- Virtual mode ---------------------------------------------------
+
+    def _bind_virtual_events(self):
+        """Replace the Treeview's own scrolling and selection with row-index versions"""
+        tree = self.tree
+        tree.bind('<Configure>', lambda e: self._fit_pool())
+        tree.bind('<MouseWheel>', lambda e: self._scroll(-self.WHEEL_ROWS if e.delta > 0 else self.WHEEL_ROWS))
+        tree.bind('<Button-4>', lambda e: self._scroll(-self.WHEEL_ROWS))
+        tree.bind('<Button-5>', lambda e: self._scroll(self.WHEEL_ROWS))
+        tree.bind('<Button-1>', self._on_click)
+        tree.bind('<Shift-Button-1>', lambda e: self._on_click(e, extend=True))
+        tree.bind('<Control-Button-1>', lambda e: self._on_click(e, toggle=True))
+        for key, step in (('Up', -1), ('Down', 1), ('Prior', 'page_up'), ('Next', 'page_down'),
+                          ('Home', 'home'), ('End', 'end')):
+            tree.bind(f'<{key}>', lambda e, s=step: self._on_key(s))
+            tree.bind(f'<Shift-{key}>', lambda e, s=step: self._on_key(s, extend=True))
+        self._resize_pool(self.visible)
+        self._render()
+
+    def _resize_pool(self, size):
+        """Grow or shrink the set of recycled Treeview items"""
+        while len(self._pool) < size:
+            self._pool.append(self.tree.insert('', 'end', values=()))
+        while len(self._pool) > size:
+            item = self._pool.pop()
+            self._detached.discard(item)
+            self._shown.pop(item, None)
+            self.tree.delete(item)
+
+    def _fit_pool(self):
+        """Size the pool to the rows that fit after the widget is resized"""
+        shown = [item for item in self._pool if item not in self._detached]
+        bbox = self.tree.bbox(shown[0]) if shown else None
+        if not bbox:
+            return
+        y, row_height = bbox[1], bbox[3]
+        visible = max(1, (self.tree.winfo_height() - y) // max(row_height, 1))
+        if visible != self.visible:
+            self.visible = visible
+            self._resize_pool(visible)
+            self._clamp_offset()
+            self._render()
+
+    def _clamp_offset(self):
+        self.offset = max(0, min(self.offset, len(self.rows) - self.visible))
+
+    def _render(self):
+        """Fill the pooled items with the rows of the current window"""
+        self._clamp_offset()
+        selected_items = []
+        focus_item = None
+        for slot, item in enumerate(self._pool):
+            index = self.offset + slot
+            if index < len(self.rows):
+                if item in self._detached:
+                    self.tree.move(item, '', slot)
+                    self._detached.discard(item)
+                # Only items whose row or stripe changed are sent to Tk
+                shown = (tuple(self.rows[index]), self._stripe(index))
+                if self._shown.get(item) != shown:
+                    self.tree.item(item, values=shown[0], tags=(shown[1],))
+                    self._shown[item] = shown
+                if index in self.selected:
+                    selected_items.append(item)
+                if index == self.focus_index:
+                    focus_item = item
+            else:
+                # Past the last row: hide the item rather than show a blank line
+                if item not in self._detached:
+                    self.tree.detach(item)
+                    self._detached.add(item)
+
+        self.tree.selection_set(selected_items)
+        if focus_item:
+            self.tree.focus(focus_item)
+
+        if self.scrollbar is not None:
+            total = max(len(self.rows), 1)
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible) / total))
+
+    def _scroll(self, rows):
+        """Move the window by a number of rows"""
+        self.offset += rows
+        self._render()
+        return 'break'
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Handle scrollbar drags, arrows and trough clicks"""
+        if action == 'moveto':
+            self.offset = int(float(amount) * len(self.rows))
+            self._render()
+        elif action == 'scroll':
+            step = self.visible if unit == 'pages' else 1
+            self._scroll(int(amount) * step)
+
+    def _row_at(self, y):
+        """Get the row index under a y coordinate, or None"""
+        item = self.tree.identify_row(y)
+        if not item or item not in self._pool:
+            return None
+        index = self.offset + self._pool.index(item)
+        return index if index < len(self.rows) else None
+
+    def _on_click(self, event, extend=False, toggle=False):
+        """Select rows by index (the Treeview items are reused for other rows)"""
+        if self.tree.identify_region(event.x, event.y) != 'cell':
+            return None
+        index = self._row_at(event.y)
+        if index is None:
+            return 'break'
+        self.tree.focus_set()
+        self._select(index, extend=extend, toggle=toggle)
+        return 'break'
+
+    def _on_key(self, step, extend=False):
+        """Move the focused row with the keyboard"""
+        if not self.rows:
+            return 'break'
+        current = self.focus_index if self.focus_index is not None else self.offset - 1
+        if step == 'page_up':
+            index = current - self.visible
+        elif step == 'page_down':
+            index = current + self.visible
+        elif step == 'home':
+            index = 0
+        elif step == 'end':
+            index = len(self.rows) - 1
+        else:
+            index = current + step
+        index = max(0, min(index, len(self.rows) - 1))
+
+        # Keep the focused row on screen
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible:
+            self.offset = index - self.visible + 1
+        self._select(index, extend=extend)
+        return 'break'
+
+    def _select(self, index, extend=False, toggle=False):
+        """Update the selection after a click or key press"""
+        multiple = self.selectmode == 'extended'
+        if multiple and extend and self.anchor_index is not None:
+            low, high = sorted((self.anchor_index, index))
+            self.selected = set(range(low, high + 1))
+        elif multiple and toggle:
+            self.selected ^= {index}
+            self.anchor_index = index
+        else:
+            self.selected = {index}
+            self.anchor_index = index
+        self.focus_index = index
+        self._render()
+        self._notify_selection()
+
+    def _notify_selection(self):
+        for callback in self._selection_callbacks:
+            callback()
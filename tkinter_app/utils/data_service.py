@@ -0,0 +1,773 @@
+"""
+Data service for the desktop views
+Sits between the views and the models, caching what the views read most
+
+A record's details (the record, its first page of comments and the comment
+count) are cached per record ID. Writes go through the service, which drops
+the cached entries they affect, so a view never shows data older than the
+user's own changes. Entries also expire after MAX_AGE seconds to pick up
+changes made elsewhere (e.g. comments from other users on the web app).
+
+Reads block, so views call them on worker threads (BaseView.run_async);
+peek_record_details() only looks at the cache and is safe on the Tk thread.
+prefetch() loads a record's details in the background, so the view can
+show them immediately when the user opens the record.
+
+With a LocalStore, the user's records and comments are also kept on disk:
+once a user has been synced, reads come from the store instead of MongoDB,
+and sync() runs in the background every SYNC_INTERVAL_MS to replay writes
+made offline and pull what changed on the server since the last sync
+(updated_at watermarks). Writes go to MongoDB first and then to the store;
+when MongoDB cannot be reached they are applied to the store and queued in
+its outbox, to be replayed by the next successful sync.
+"""
+import sys
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Callable, List, Optional
+
+from bson import ObjectId
+
+# Add parent directory to path for models import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from models import Comment, Database, RecordModel, CommentModel, UserModel
+
+
+class DataService:
+    """Cached record and comment access shared by the desktop views (thread-safe)"""
+
+    # Records whose details are kept (least recently used are dropped first)
+    MAX_ENTRIES = 128
+
+    # Seconds before a cached entry is read again from the database
+    MAX_AGE = 60
+
+    # Longest wait for a load of the same record already in progress (seconds)
+    WAIT_TIMEOUT = 10
+
+    # Time between background syncs while logged in
+    SYNC_INTERVAL_MS = 30000
+
+    # Changes pulled per query, and queued writes replayed per batch
+    SYNC_PAGE = 1000
+    OUTBOX_BATCH = 200
+
+    # Queued writes whose targets are records (the others target comments)
+    RECORD_OPS = ('create_record', 'update_record', 'set_record_fields', 'delete_record')
+
+    # Pulls re-read this far behind the watermark: updated_at comes from the
+    # writing client's clock, so a slightly slow clock must not hide a change
+    SYNC_OVERLAP = timedelta(minutes=5)
+
+    # Every this many syncs the ID lists are compared to find deletions
+    RECONCILE_EVERY = 10
+
+    OFFLINE_MESSAGE = "Saved offline, will sync when connected!"
+
+    def __init__(self, tasks=None, store=None):
+        """
+        Initialize data service
+
+        Args:
+            tasks: TaskRunner used by prefetch() and the background sync;
+                   without one neither runs
+            store: LocalStore to read from and sync, or None to always use MongoDB
+        """
+        self.tasks = tasks
+        self.store = store
+        self.record_model = RecordModel()
+        self.comment_model = CommentModel()
+        self.user_model = UserModel()
+        self._lock = threading.Lock()
+        # record_id -> (loaded at, user_id, (record, comments, cursor, count))
+        self._details = OrderedDict()
+        # record_id -> generation, bumped on every invalidation (and the epoch
+        # on clear); a read that started before one must not store its result
+        self._generations = {}
+        self._epoch = 0
+        # record_id -> Event set when the details being loaded are stored
+        self._loading = {}
+
+        # Background sync of the logged-in user (see start_sync)
+        self._sync_lock = threading.Lock()
+        self._sync_user = None
+        self._sync_job = None
+        self._on_synced = None
+        self._syncs = 0
+        # False after MongoDB stopped answering; writes then go to the outbox
+        self.online = True
+
+    def _local(self, user_id: Optional[str]) -> bool:
+        """Check whether a user's reads are served by the local store"""
+        return self.store is not None and user_id is not None and self.store.has_synced(user_id)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_record_details(self, record_id: str, user_id: str) -> Optional[tuple]:
+        """
+        Get a record with its first page of comments and the comment count
+
+        Args:
+            record_id: Record's ObjectId as string
+            user_id: Current user's ID (only their own records are returned)
+
+        Returns:
+            (record, comments, next_cursor, comment_count) or None if not found
+        """
+        details = self.peek_record_details(record_id, user_id)
+        if details is not None:
+            return details
+
+        # Opened while a prefetch of it is running: wait for that instead of
+        # running the same queries again
+        with self._lock:
+            pending = self._loading.get(record_id)
+            if pending is None:
+                loaded = self._loading[record_id] = threading.Event()
+        if pending is not None:
+            pending.wait(self.WAIT_TIMEOUT)
+            details = self.peek_record_details(record_id, user_id)
+            if details is not None:
+                return details
+            return self._load_details(record_id, user_id)
+
+        try:
+            return self._load_details(record_id, user_id)
+        finally:
+            with self._lock:
+                del self._loading[record_id]
+            loaded.set()
+
+    def _load_details(self, record_id: str, user_id: str) -> Optional[tuple]:
+        """Read a record's details from the database and cache them"""
+        generation = self._generation(record_id)
+        if self._local(user_id):
+            record = self.store.read_record(record_id, user_id)
+            if not record:
+                return None
+            comments, cursor = self.store.list_comments(record_id)
+            count = self.store.count_comments(record_id)
+        else:
+            record = self.record_model.read_record(record_id, user_id)
+            if not record:
+                return None
+            comments, cursor = self.comment_model.list_comments(record_id)
+            count = self.comment_model.get_comment_count_by_record(record_id)
+
+        details = (record, comments, cursor, count)
+        self._store(record_id, user_id, details, generation)
+        return details
+
+    def peek_record_details(self, record_id: str, user_id: str) -> Optional[tuple]:
+        """
+        Get cached record details without querying the database
+
+        Returns:
+            Same as get_record_details, or None if not cached (or expired)
+        """
+        with self._lock:
+            entry = self._fresh_entry(record_id)
+            if entry is None or entry[1] != user_id:
+                return None
+            self._details.move_to_end(record_id)
+            return entry[2]
+
+    def get_record(self, record_id: str, user_id: str):
+        """
+        Get a single record (from the cached details when available)
+
+        Returns:
+            Record or None if not found
+        """
+        details = self.peek_record_details(record_id, user_id)
+        if details is not None:
+            return details[0]
+        if self._local(user_id):
+            return self.store.read_record(record_id, user_id)
+        return self.record_model.read_record(record_id, user_id)
+
+    def list_comments(self, record_id: str, after: Optional[str] = None):
+        """
+        Get a page of comments on a record
+
+        The first page and the total count come from the cached details when
+        available; later pages are always read from the local store (once
+        the logged-in user is synced) or the database.
+
+        Returns:
+            (comments, next_cursor, comment_count); comment_count is None for later pages
+        """
+        local = self._local(self._sync_user_id())
+        if after:
+            source = self.store if local else self.comment_model
+            comments, cursor = source.list_comments(record_id, after=after)
+            return comments, cursor, None
+
+        with self._lock:
+            entry = self._fresh_entry(record_id)
+        if entry is not None:
+            _, comments, cursor, count = entry[2]
+            return comments, cursor, count
+
+        generation = self._generation(record_id)
+        if local:
+            comments, cursor = self.store.list_comments(record_id)
+            count = self.store.count_comments(record_id)
+        else:
+            comments, cursor = self.comment_model.list_comments(record_id)
+            count = self.comment_model.get_comment_count_by_record(record_id)
+        self._update_comments(record_id, (comments, cursor, count), generation)
+        return comments, cursor, count
+
+    def list_records(self, user_id: str, **options):
+        """
+        List a user's records (not cached in memory: the listing changes with every write)
+
+        Args:
+            user_id: Owner of the records
+            **options: Filters, sort and paging of RecordModel.list_records
+
+        Returns:
+            Same as RecordModel.list_records
+        """
+        if self._local(user_id):
+            return self.store.list_records(user_id, **options)
+        return self.record_model.list_records(user_id, **options)
+
+    def prefetch(self, record_id: str, user_id: str):
+        """
+        Load a record's details in the background if they are not cached
+
+        A newer prefetch replaces an older one that has not started yet.
+        """
+        if self.tasks is None or self.peek_record_details(record_id, user_id) is not None:
+            return
+        self.tasks.submit(self, self.get_record_details, record_id, user_id,
+                          key='prefetch', on_error=lambda e: None)
+
+    # ------------------------------------------------------------------
+    # Writes (each drops the cached data it changes)
+    # ------------------------------------------------------------------
+
+    def create_record(self, user_id: str, title: str, description: str, category: str) -> tuple[bool, str]:
+        """Create a record (nothing cached is affected)"""
+        if not self._local(user_id):
+            return self.record_model.create_record(user_id, title, description, category)
+
+        # The ID is chosen here, so the record is stored (and replayed) as is
+        record_id = str(ObjectId())
+        fields = {'title': title, 'description': description, 'category': category}
+        now = datetime.utcnow()
+
+        def apply():
+            self.store.put_record(user_id, record_id, {**fields, 'status': 'Active',
+                                                       'date_added': now, 'updated_at': now})
+
+        return self._write(
+            user_id, 'create_record', [record_id], fields,
+            lambda: self.record_model.create_record(user_id, title, description, category, record_id),
+            apply
+        )
+
+    def update_record(self, record_id: str, title: str, description: str,
+                      category: str, status: str, user_id: str) -> tuple[bool, str]:
+        """Update a record and drop its cached details"""
+        fields = {'title': title, 'description': description, 'category': category, 'status': status}
+        try:
+            return self._write(
+                user_id, 'update_record', [record_id], fields,
+                lambda: self.record_model.update_record(record_id, title, description, category, status, user_id),
+                lambda: self._update_local(user_id, [record_id], fields)
+            )
+        finally:
+            self.invalidate(record_id)
+
+    def delete_record(self, record_id: str, user_id: str) -> tuple[bool, str]:
+        """Delete a record and drop its cached details"""
+        try:
+            return self._write(
+                user_id, 'delete_record', [record_id], {},
+                lambda: self.record_model.delete_record(record_id, user_id)[:2],
+                lambda: None if self.store.delete_records(user_id, [record_id]) else "Record not found!"
+            )
+        finally:
+            self.invalidate(record_id)
+
+    def bulk_update_records(self, record_ids: List[str], user_id: str, **fields) -> tuple[bool, str]:
+        """Update several records and drop their cached details"""
+        fields = {name: value for name, value in fields.items() if value is not None}
+        try:
+            return self._write(
+                user_id, 'set_record_fields', record_ids, fields,
+                lambda: self.record_model.bulk_update_records(record_ids, user_id, **fields),
+                lambda: self._update_local(user_id, record_ids, fields)
+            )
+        finally:
+            self.invalidate(*record_ids)
+
+    def bulk_delete_records(self, record_ids: List[str], user_id: str) -> tuple[bool, str]:
+        """Delete several records and drop their cached details"""
+        try:
+            return self._write(
+                user_id, 'delete_record', record_ids, {},
+                lambda: self.record_model.bulk_delete_records(record_ids, user_id)[:2],
+                lambda: None if self.store.delete_records(user_id, record_ids) else "No matching records found!"
+            )
+        finally:
+            self.invalidate(*record_ids)
+
+    def create_comment(self, record_id: str, user_id: str, content: str) -> tuple[bool, str]:
+        """Add a comment to a record and drop the record's cached comments"""
+        try:
+            if not self._local(user_id):
+                return self.comment_model.create_comment(record_id, user_id, content)
+
+            comment_id = str(ObjectId())
+            now = datetime.utcnow()
+            comment = Comment(ObjectId(comment_id), ObjectId(record_id), ObjectId(user_id),
+                              self._sync_user[1] if self._sync_user else 'Unknown', content, now, now)
+            return self._write(
+                user_id, 'create_comment', [comment_id], {'record_id': record_id, 'content': content},
+                lambda: self.comment_model.create_comment(record_id, user_id, content, comment_id),
+                lambda: self.store.put_comment(comment)
+            )
+        finally:
+            self.invalidate(record_id)
+
+    def update_comment(self, record_id: str, comment_id: str, content: str, user_id: str) -> tuple[bool, str]:
+        """Edit a comment on a record and drop the record's cached comments"""
+        def apply():
+            comment = self.store.get_comment(comment_id)
+            if comment is None:
+                return "Comment not found!"
+            if comment.user_id != user_id:
+                return "You can only edit your own comments!"
+            self.store.put_comment(comment.edited(content, datetime.utcnow()))
+
+        try:
+            return self._write(
+                user_id, 'update_comment', [comment_id], {'record_id': record_id, 'content': content},
+                lambda: self.comment_model.update_comment(comment_id, content, user_id),
+                apply
+            )
+        finally:
+            self.invalidate(record_id)
+
+    def delete_comment(self, record_id: str, comment_id: str, user_id: str) -> tuple[bool, str]:
+        """Delete a comment on a record and drop the record's cached comments"""
+        def apply():
+            comment = self.store.get_comment(comment_id)
+            if comment is None:
+                return "Comment not found!"
+            if comment.user_id != user_id:
+                return "You can only delete your own comments!"
+            self.store.delete_comment(comment_id)
+
+        try:
+            return self._write(
+                user_id, 'delete_comment', [comment_id], {'record_id': record_id},
+                lambda: self.comment_model.delete_comment(comment_id, user_id),
+                apply
+            )
+        finally:
+            self.invalidate(record_id)
+
+    def _write(self, user_id: str, op: str, targets: List[str], payload: dict,
+               write: Callable, apply: Callable) -> tuple[bool, str]:
+        """
+        Write to MongoDB and then the local store, or only locally while offline
+
+        Args:
+            user_id: User making the write
+            op: Outbox operation replayed by _replay
+            targets: IDs of the records or comments written (one queued write each)
+            payload: Arguments queued with the write
+            write: Makes the write in MongoDB, returning (success, message)
+            apply: Makes the write in the local store, returning an error
+                   message if it is refused (checked only while offline)
+
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        if not self._local(user_id):
+            return write()
+
+        if self.online:
+            success, message = write()
+            if success:
+                apply()
+                return success, message
+            # Refused by the server, or failed while it is still reachable
+            if not message.startswith('Error:') or self._ping():
+                return success, message
+
+        error = apply()
+        if error:
+            return False, error
+        for target in targets:
+            self.store.enqueue(user_id, op, target, payload)
+        return True, self.OFFLINE_MESSAGE
+
+    def _update_local(self, user_id: str, record_ids: List[str], fields: dict) -> Optional[str]:
+        """Apply a record update to the local store (same validation as RecordModel)"""
+        if fields.get('status', 'Active') not in RecordModel.STATUSES:
+            return "Invalid status!"
+        if fields.get('category', 'General') not in RecordModel.CATEGORIES:
+            return "Invalid category!"
+        if not self.store.update_records(user_id, record_ids, {**fields, 'updated_at': datetime.utcnow()}):
+            return "Record not found!"
+        return None
+
+    # ------------------------------------------------------------------
+    # Sign-in
+    # ------------------------------------------------------------------
+
+    def authenticate(self, username: str, password: str) -> tuple[bool, Optional[str], str]:
+        """
+        Check credentials with MongoDB, or with the local store while it is unreachable
+
+        A password the server accepts is remembered (salted and hashed) in
+        the local store. When the server cannot be asked, a user whose data
+        has been synced before signs in against that copy and works from
+        the local store; a password the server rejects is forgotten.
+
+        Returns:
+            Same as UserModel.authenticate_user
+        """
+        success, user_id, message = self.user_model.authenticate_user(username, password)
+        if self.store is None:
+            return success, user_id, message
+
+        if success:
+            self.store.save_credentials(username, user_id, password)
+            self.online = True
+        elif not message.startswith('Error:'):
+            self.store.forget_credentials(username)
+        else:
+            user_id = self.store.check_credentials(username, password)
+            if user_id is not None and self.store.has_synced(user_id):
+                self.online = False
+                return True, user_id, "Signed in offline, changes will sync when connected!"
+        return success, user_id, message
+
+    # ------------------------------------------------------------------
+    # Sync with MongoDB (only with a local store)
+    # ------------------------------------------------------------------
+
+    def start_sync(self, user_id: str, username: str, on_synced: Optional[Callable[[dict], None]] = None):
+        """
+        Sync a user's data now, then every SYNC_INTERVAL_MS until stop_sync()
+
+        Args:
+            user_id: Logged-in user
+            username: Their username (shown on comments written offline)
+            on_synced: Called on the Tk thread with the result of each sync()
+        """
+        if self.store is None or self.tasks is None:
+            return
+        self.stop_sync()
+        self._sync_user = (user_id, username)
+        self._on_synced = on_synced
+        self._syncs = 0
+        self._run_sync()
+
+    def stop_sync(self):
+        """Stop the background sync (a sync in progress still finishes)"""
+        if self._sync_job is not None:
+            self.tasks.root.after_cancel(self._sync_job)
+            self._sync_job = None
+        self._sync_user = None
+
+    def _sync_user_id(self) -> Optional[str]:
+        return self._sync_user[0] if self._sync_user else None
+
+    def _run_sync(self):
+        self._sync_job = None
+        if self._sync_user is not None:
+            self.tasks.submit(self, self.sync, self._sync_user[0], key='sync',
+                              on_success=self._on_sync_done, on_error=self._on_sync_failed)
+
+    def _on_sync_done(self, result: dict):
+        self._schedule_sync()
+        if self._on_synced is not None:
+            self._on_synced(result)
+
+    def _on_sync_failed(self, error: Exception):
+        print(f"Error syncing local data: {error}")
+        self._schedule_sync()
+
+    def _schedule_sync(self):
+        if self._sync_user is not None and self._sync_job is None:
+            self._sync_job = self.tasks.root.after(self.SYNC_INTERVAL_MS, self._run_sync)
+
+    def sync(self, user_id: str) -> dict:
+        """
+        Replay queued writes, then pull what changed since the last sync
+
+        Blocks (runs on a worker thread); only one sync runs at a time.
+        Pulled rows replace local ones unless they have queued writes, so
+        nothing the user changed offline is lost before it is replayed.
+
+        Args:
+            user_id: User to sync
+
+        Returns:
+            Dictionary with 'online' (bool), 'pushed' (writes replayed),
+            'rejected' (messages of writes the server refused), 'changed'
+            (local records and comments added, changed or removed) and
+            'pending' (writes still queued)
+        """
+        result = {'online': False, 'pushed': 0, 'rejected': [], 'changed': 0, 'pending': 0}
+        with self._sync_lock:
+            try:
+                if self._ping() and self._push(user_id, result):
+                    self._pull(user_id, result)
+                    self._syncs += 1
+            except Exception as e:
+                print(f"Error syncing local data: {e}")
+                self._ping()
+            result['online'] = self.online
+            result['pending'] = self.store.count_pending(user_id)
+
+        if result['changed'] or result['pushed']:
+            self._drop_cached()
+        return result
+
+    def _ping(self) -> bool:
+        """Check whether MongoDB can be reached (updates `online`)"""
+        try:
+            Database().client.admin.command('ping')
+            self.online = True
+        except Exception:
+            self.online = False
+        return self.online
+
+    def _push(self, user_id: str, result: dict) -> bool:
+        """
+        Replay a user's queued writes in order, OUTBOX_BATCH at a time
+
+        Consecutive status/category changes with the same values, and
+        consecutive deletes, go to MongoDB as one bulk call.
+
+        Returns:
+            False if MongoDB stopped answering (the rest stays queued)
+        """
+        while True:
+            ops = self.store.pending_ops(user_id, self.OUTBOX_BATCH)
+            if not ops:
+                return True
+            batched = ('set_record_fields', 'delete_record')
+            for _, group in groupby(ops, key=lambda o: (o.op, o.payload) if o.op in batched else o.seq):
+                group = list(group)
+                success, message = self._replay(user_id, group)
+                if not success and message.startswith('Error:') and not self._ping():
+                    return False
+                # Refused writes (e.g. the record was deleted elsewhere) are dropped
+                self.store.complete(op.seq for op in group)
+                if success:
+                    result['pushed'] += len(group)
+                else:
+                    result['rejected'].append(message)
+                    self._restore(user_id, group)
+
+    def _restore(self, user_id: str, group: list):
+        """
+        Replace the local copies of refused writes' targets with the server's
+
+        The store was changed optimistically when the write was queued;
+        without this the change would stay until the target changed again
+        on the server. If MongoDB cannot be read, the watermarks are reset
+        so the pull that follows reads everything.
+        """
+        op, targets = group[0].op, [o.target for o in group]
+        try:
+            if op in self.RECORD_OPS:
+                docs = self.record_model.get_records_by_ids(user_id, targets)
+                found = [str(doc['_id']) for doc in docs]
+                self.store.delete_records(user_id, [target for target in targets if target not in found])
+                self.store.put_records(user_id, docs)
+                if op == 'delete_record':
+                    # The local delete also removed their comments
+                    for comments in self._pages(self.comment_model.list_changed_comments, found, None):
+                        self.store.put_comments(comments)
+            else:
+                comments = self.comment_model.get_comments_by_ids(targets)
+                found = {comment.id for comment in comments}
+                for target in targets:
+                    if target not in found:
+                        self.store.delete_comment(target)
+                self.store.put_comments(comments)
+            records = targets if op in self.RECORD_OPS else {o.payload['record_id'] for o in group}
+            self.invalidate(*records)
+
+        except Exception as e:
+            print(f"⚠ Could not restore refused changes, pulling everything: {e}")
+            self.store.set_watermark(user_id, 'records_since', None)
+            self.store.set_watermark(user_id, 'comments_since', None)
+
+    def _replay(self, user_id: str, group: list) -> tuple[bool, str]:
+        """Make queued writes of one kind in MongoDB"""
+        op, target, payload = group[0].op, group[0].target, group[0].payload
+        if op == 'create_record':
+            return self.record_model.create_record(user_id, payload['title'], payload['description'],
+                                                   payload['category'], record_id=target)
+        if op == 'update_record':
+            return self.record_model.update_record(target, payload['title'], payload['description'],
+                                                   payload['category'], payload['status'], user_id)
+        if op == 'set_record_fields':
+            return self.record_model.bulk_update_records([o.target for o in group], user_id, **payload)
+        if op == 'delete_record':
+            return self.record_model.bulk_delete_records([o.target for o in group], user_id)[:2]
+        if op == 'create_comment':
+            return self.comment_model.create_comment(payload['record_id'], user_id, payload['content'],
+                                                     comment_id=target)
+        if op == 'update_comment':
+            return self.comment_model.update_comment(target, payload['content'], user_id)
+        if op == 'delete_comment':
+            return self.comment_model.delete_comment(target, user_id)
+        return False, f"Unknown queued write: {op}!"
+
+    def _pull(self, user_id: str, result: dict):
+        """
+        Pull records and comments changed since the watermarks into the store
+
+        The first sync pulls everything and sets the watermarks to when it
+        started; later ones read from SYNC_OVERLAP before the newest
+        updated_at seen. Comments of records new to the store are pulled in
+        full. Deletions are found by comparing ID lists on the first sync
+        of a session and every RECONCILE_EVERY syncs.
+        """
+        store = self.store
+        started = datetime.utcnow()
+        known = store.record_ids(user_id)
+
+        # Records
+        since = store.get_watermark(user_id, 'records_since')
+        newest = since
+        known_set = set(known)
+        new_ids = []
+        for docs in self._pages(self.record_model.list_changed_records, user_id,
+                                since - self.SYNC_OVERLAP if since else None):
+            result['changed'] += store.put_records(user_id, docs)
+            new_ids += [str(doc['_id']) for doc in docs if str(doc['_id']) not in known_set]
+            newest = self._newest(newest, (doc.get('updated_at') for doc in docs))
+        records_since = newest if since else started
+
+        # Comments on those records
+        since = store.get_watermark(user_id, 'comments_since')
+        newest = since
+        if since is None:
+            passes = [(known + new_ids, None)]
+        else:
+            passes = [(known, since - self.SYNC_OVERLAP), (new_ids, None)]
+        for record_ids, pass_since in passes:
+            for chunk in self._chunks(record_ids):
+                for comments in self._pages(self.comment_model.list_changed_comments, chunk, pass_since):
+                    result['changed'] += store.put_comments(comments)
+                    if pass_since is not None:
+                        newest = self._newest(newest, (comment.updated for comment in comments))
+        comments_since = newest if since else started
+
+        # Deletions
+        if self._syncs % self.RECONCILE_EVERY == 0 or result['rejected']:
+            record_ids = self.record_model.list_record_ids(user_id)
+            result['changed'] += store.retain_records(user_id, record_ids)
+            comment_ids = []
+            for chunk in self._chunks(record_ids):
+                comment_ids += self.comment_model.list_comment_ids(chunk)
+            result['changed'] += store.retain_comments(record_ids, comment_ids)
+
+        store.set_watermark(user_id, 'records_since', records_since)
+        store.set_watermark(user_id, 'comments_since', comments_since)
+        store.set_watermark(user_id, 'synced_at', started)
+
+    def _pages(self, fetch: Callable, key, since: Optional[datetime]):
+        """Yield every page of a list_changed_* query"""
+        after = None
+        while True:
+            rows, after = fetch(key, since, after, self.SYNC_PAGE)
+            yield rows
+            if not after:
+                return
+
+    @staticmethod
+    def _newest(current: Optional[datetime], values) -> Optional[datetime]:
+        return max([value for value in values if value is not None] + ([current] if current else []),
+                   default=None)
+
+    @staticmethod
+    def _chunks(ids: List[str], size: int = 1000):
+        return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+    def close(self):
+        """Stop syncing and close the local store (on exit)"""
+        self.stop_sync()
+        if self.store is not None:
+            self.store.close()
+
+    # ------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------
+
+    def invalidate(self, *record_ids: str):
+        """Drop the cached details of records (reads in progress are not stored)"""
+        with self._lock:
+            for record_id in record_ids:
+                self._generations[record_id] = self._generations.get(record_id, 0) + 1
+                self._details.pop(record_id, None)
+
+    def clear(self):
+        """
+        Drop everything cached in memory, stop syncing and cancel pending
+        prefetches (e.g. on logout); the local store is kept for the next login
+        """
+        self.stop_sync()
+        if self.tasks is not None:
+            self.tasks.cancel(self)
+        self._drop_cached()
+
+    def _drop_cached(self):
+        """Drop every cached entry (reads in progress are not stored)"""
+        with self._lock:
+            self._epoch += 1
+            self._generations.clear()
+            self._details.clear()
+
+    def _generation(self, record_id: str) -> tuple:
+        with self._lock:
+            return self._epoch, self._generations.get(record_id, 0)
+
+    def _fresh_entry(self, record_id: str):
+        """Get a cache entry unless it has expired (call with the lock held)"""
+        entry = self._details.get(record_id)
+        if entry is not None and time.monotonic() - entry[0] > self.MAX_AGE:
+            del self._details[record_id]
+            return None
+        return entry
+
+    def _store(self, record_id: str, user_id: str, details: tuple, generation: tuple):
+        """Cache details read at a generation, unless invalidated since"""
+        with self._lock:
+            if (self._epoch, self._generations.get(record_id, 0)) != generation:
+                return
+            self._details[record_id] = (time.monotonic(), user_id, details)
+            self._details.move_to_end(record_id)
+            while len(self._details) > self.MAX_ENTRIES:
+                self._details.popitem(last=False)
+
+    def _update_comments(self, record_id: str, page: tuple, generation: tuple):
+        """Put a freshly read first page of comments into cached details"""
+        with self._lock:
+            if (self._epoch, self._generations.get(record_id, 0)) != generation:
+                return
+            entry = self._details.get(record_id)
+            if entry is not None:
+                loaded_at, user_id, details = entry
+                self._details[record_id] = (loaded_at, user_id, (details[0], *page))
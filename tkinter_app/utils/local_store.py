@@ -0,0 +1,611 @@
+"""
+Local SQLite copy of the user's records and comments
+Lets the desktop views render without waiting for (or having) MongoDB
+
+The store holds the records of every user who has logged in on this
+machine, the comments on those records, the sync watermarks per user, an
+outbox of writes made while offline and a salted password hash per user so
+they can sign in while MongoDB is unreachable. DataService keeps it up to date and
+decides when to read from it; the store itself never talks to MongoDB.
+
+Dates are stored as fixed-width 'YYYY-MM-DD HH:MM:SS.ffffff' text and IDs
+as 24-character hex, so both sort in SQL the same way they do in MongoDB.
+Rows are read back as the Record and Comment value objects the models
+return, so views cannot tell where their data came from.
+"""
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+
+from models import Comment, Record, RecordModel
+from models.pagination import decode_cursor, encode_cursor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    date_added TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS records_by_date ON records (user_id, date_added, id);
+CREATE INDEX IF NOT EXISTS records_by_title ON records (user_id, title, id);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id TEXT PRIMARY KEY,
+    record_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comments_by_thread ON comments (record_id, created_at, id);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (user_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    op TEXT NOT NULL,
+    target TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_by_target ON outbox (target);
+
+CREATE TABLE IF NOT EXISTS credentials (
+    username TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    salt TEXT NOT NULL,
+    hash TEXT NOT NULL
+);
+"""
+
+# PBKDF2 rounds for the offline sign-in hash (the file lives in the user's home)
+PASSWORD_ITERATIONS = 200000
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+# Local equivalents of RecordModel.SORTS (same order, so keyset pages match)
+SORTS = {
+    'newest': ('date_added', 'DESC'),
+    'oldest': ('date_added', 'ASC'),
+    'title': ('title', 'ASC')
+}
+
+# Record columns written by a pull or a local write
+RECORD_FIELDS = ('title', 'description', 'category', 'status', 'date_added', 'updated_at')
+
+
+def default_path() -> str:
+    """Cache file location (DESKTOP_CACHE_PATH overrides the per-user default)"""
+    return os.getenv('DESKTOP_CACHE_PATH') or os.path.join(
+        os.path.expanduser('~'), '.smart_records', 'cache.sqlite3'
+    )
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime(DATE_FORMAT) if value is not None else None
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, DATE_FORMAT) if value is not None else None
+
+
+class OutboxOp:
+    """A write queued while offline"""
+
+    __slots__ = ('seq', 'op', 'target', 'payload')
+
+    def __init__(self, seq: int, op: str, target: str, payload: dict):
+        self.seq = seq
+        self.op = op
+        self.target = target
+        self.payload = payload
+
+    def __repr__(self):
+        return f"OutboxOp({self.seq}, {self.op!r}, {self.target!r})"
+
+
+class LocalStore:
+    """SQLite cache of records, comments and queued writes (thread-safe)"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the local store
+
+        Args:
+            path: Database file, or ':memory:' (default: default_path())
+        """
+        self.path = path or default_path()
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # One connection shared by the worker threads, serialized by the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database file"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Sync state
+    # ------------------------------------------------------------------
+
+    def get_state(self, user_id: str, name: str) -> Optional[str]:
+        """Get a sync state value of a user (None if never set)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM sync_state WHERE user_id = ? AND name = ?', (user_id, name)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, user_id: str, name: str, value: Optional[str]):
+        """Set a sync state value of a user"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state (user_id, name, value) VALUES (?, ?, ?)',
+                (user_id, name, value)
+            )
+
+    def get_watermark(self, user_id: str, name: str) -> Optional[datetime]:
+        """Get a sync watermark (newest updated_at pulled) of a user"""
+        return _to_datetime(self.get_state(user_id, name))
+
+    def set_watermark(self, user_id: str, name: str, value: Optional[datetime]):
+        """Set a sync watermark of a user"""
+        self.set_state(user_id, name, _to_text(value))
+
+    def has_synced(self, user_id: str) -> bool:
+        """Check whether a user's data has been pulled completely at least once"""
+        return self.get_state(user_id, 'synced_at') is not None
+
+    # ------------------------------------------------------------------
+    # Offline sign-in
+    # ------------------------------------------------------------------
+
+    def save_credentials(self, username: str, user_id: str, password: str):
+        """Remember a password the server accepted, as a salted hash"""
+        salt = os.urandom(16)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO credentials (username, user_id, salt, hash) VALUES (?, ?, ?, ?)',
+                (username, user_id, salt.hex(), self._hash_password(password, salt))
+            )
+
+    def check_credentials(self, username: str, password: str) -> Optional[str]:
+        """
+        Check a password against the one last accepted by the server
+
+        Returns:
+            The user's ID, or None if unknown or wrong
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT user_id, salt, hash FROM credentials WHERE username = ?', (username,)
+            ).fetchone()
+        if row is None:
+            return None
+        user_id, salt, expected = row
+        if not hmac.compare_digest(self._hash_password(password, bytes.fromhex(salt)), expected):
+            return None
+        return user_id
+
+    def forget_credentials(self, username: str):
+        """Drop a remembered password (e.g. the server no longer accepts it)"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM credentials WHERE username = ?', (username,))
+
+    @staticmethod
+    def _hash_password(password: str, salt: bytes) -> str:
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PASSWORD_ITERATIONS).hex()
+
+    # ------------------------------------------------------------------
+    # Pulled changes
+    # ------------------------------------------------------------------
+
+    def put_records(self, user_id: str, docs: Iterable[dict]) -> int:
+        """
+        Store records pulled from MongoDB
+
+        Records with queued local writes are skipped: the server copy is
+        older than what the user sees and will be replaced when the writes
+        are replayed.
+
+        Args:
+            user_id: Owner of the records
+            docs: Record documents (as returned by list_changed_records)
+
+        Returns:
+            Number of records that were new or different
+        """
+        rows = [(str(doc['_id']), user_id, doc['title'], doc['description'], doc['category'],
+                 doc['status'], _to_text(doc['date_added']), _to_text(doc.get('updated_at')))
+                for doc in docs]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT INTO records (id, user_id, title, description, category, status, date_added, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (id) DO UPDATE SET title = excluded.title, description = excluded.description, '
+                'category = excluded.category, status = excluded.status, date_added = excluded.date_added, '
+                'updated_at = excluded.updated_at '
+                'WHERE excluded.updated_at IS NOT records.updated_at '
+                'AND id NOT IN (SELECT target FROM outbox)',
+                rows
+            )
+            return self._conn.total_changes - before
+
+    def put_comments(self, comments: Iterable[Comment]) -> int:
+        """
+        Store comments pulled from MongoDB (skipping those with queued local writes)
+
+        Returns:
+            Number of comments that were new or different
+        """
+        rows = [(comment.id, comment.record_id, comment.user_id, comment.username, comment.content,
+                 _to_text(comment.created), _to_text(comment.updated))
+                for comment in comments]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT INTO comments (id, record_id, user_id, username, content, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (id) DO UPDATE SET username = excluded.username, content = excluded.content, '
+                'updated_at = excluded.updated_at '
+                'WHERE (excluded.updated_at IS NOT comments.updated_at OR excluded.username IS NOT comments.username) '
+                'AND id NOT IN (SELECT target FROM outbox)',
+                rows
+            )
+            return self._conn.total_changes - before
+
+    def record_ids(self, user_id: str) -> List[str]:
+        """Get the IDs of a user's stored records"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                'SELECT id FROM records WHERE user_id = ?', (user_id,))]
+
+    def retain_records(self, user_id: str, record_ids: Iterable[str]) -> int:
+        """
+        Remove a user's records (and their comments) that are not in record_ids
+
+        Deletions are not visible through the updated_at watermark, so sync
+        periodically compares the full ID lists. Records created offline and
+        not replayed yet are kept.
+
+        Returns:
+            Number of records removed
+        """
+        keep = set(record_ids)
+        with self._lock, self._conn:
+            pending = self._pending_targets()
+            gone = [row[0] for row in self._conn.execute(
+                'SELECT id FROM records WHERE user_id = ?', (user_id,))
+                if row[0] not in keep and row[0] not in pending]
+            self._delete_records(gone)
+        return len(gone)
+
+    def retain_comments(self, record_ids: List[str], comment_ids: Iterable[str]) -> int:
+        """
+        Remove comments on the given records that are not in comment_ids
+
+        Returns:
+            Number of comments removed
+        """
+        keep = set(comment_ids)
+        removed = 0
+        with self._lock, self._conn:
+            pending = self._pending_targets()
+            for chunk in self._chunks(record_ids):
+                gone = [(row[0],) for row in self._conn.execute(
+                    f'SELECT id FROM comments WHERE record_id IN ({self._marks(chunk)})', chunk)
+                    if row[0] not in keep and row[0] not in pending]
+                self._conn.executemany('DELETE FROM comments WHERE id = ?', gone)
+                removed += len(gone)
+        return removed
+
+    # ------------------------------------------------------------------
+    # Local writes (online write-through, or offline edits)
+    # ------------------------------------------------------------------
+
+    def put_record(self, user_id: str, record_id: str, fields: Dict):
+        """Insert or replace one of the user's records"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO records (id, user_id, title, description, category, status, date_added, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (record_id, user_id, fields['title'], fields['description'], fields['category'],
+                 fields['status'], _to_text(fields['date_added']), _to_text(fields['updated_at']))
+            )
+
+    def update_records(self, user_id: str, record_ids: List[str], fields: Dict) -> int:
+        """
+        Change fields of some of the user's records
+
+        Args:
+            user_id: Owner of the records (others are not touched)
+            record_ids: Record IDs
+            fields: Columns of RECORD_FIELDS to set
+
+        Returns:
+            Number of records updated
+        """
+        values = {name: _to_text(value) if isinstance(value, datetime) else value
+                  for name, value in fields.items() if name in RECORD_FIELDS}
+        assignments = ', '.join(f'{name} = ?' for name in values)
+        updated = 0
+        with self._lock, self._conn:
+            for chunk in self._chunks(record_ids):
+                updated += self._conn.execute(
+                    f'UPDATE records SET {assignments} WHERE user_id = ? AND id IN ({self._marks(chunk)})',
+                    (*values.values(), user_id, *chunk)
+                ).rowcount
+        return updated
+
+    def delete_records(self, user_id: str, record_ids: List[str]) -> int:
+        """
+        Delete some of the user's records and their comments
+
+        Returns:
+            Number of records deleted
+        """
+        with self._lock, self._conn:
+            owned = []
+            for chunk in self._chunks(record_ids):
+                owned += [row[0] for row in self._conn.execute(
+                    f'SELECT id FROM records WHERE user_id = ? AND id IN ({self._marks(chunk)})',
+                    (user_id, *chunk))]
+            self._delete_records(owned)
+        return len(owned)
+
+    def put_comment(self, comment: Comment):
+        """Insert or replace a comment"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO comments (id, record_id, user_id, username, content, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (comment.id, comment.record_id, comment.user_id, comment.username, comment.content,
+                 _to_text(comment.created), _to_text(comment.updated))
+            )
+
+    def get_comment(self, comment_id: str) -> Optional[Comment]:
+        """Get a stored comment by ID"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, record_id, user_id, username, content, created_at, updated_at '
+                'FROM comments WHERE id = ?', (comment_id,)
+            ).fetchone()
+        return self._comment(row) if row else None
+
+    def delete_comment(self, comment_id: str) -> bool:
+        """Delete a stored comment"""
+        with self._lock, self._conn:
+            return self._conn.execute('DELETE FROM comments WHERE id = ?', (comment_id,)).rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Reads (same results as the RecordModel / CommentModel methods)
+    # ------------------------------------------------------------------
+
+    def list_records(self, user_id: str, status: Optional[str] = None,
+                     category: Optional[str] = None, date_from: Optional[datetime] = None,
+                     date_to: Optional[datetime] = None, sort: str = 'newest',
+                     after: Optional[str] = None,
+                     limit: Optional[int] = 50) -> tuple[List[Record], Optional[str], int]:
+        """
+        List a user's stored records, like RecordModel.list_records
+
+        Returns:
+            Tuple of (rows: list of Record, next_cursor: str or None, bytes: always 0)
+        """
+        sort_key = sort if sort in SORTS else 'newest'
+        column, direction = SORTS[sort_key]
+        tag = f'local_{sort_key}'
+
+        conditions, params = ['user_id = ?'], [user_id]
+        if status:
+            conditions.append('status = ?')
+            params.append(status)
+        if category:
+            conditions.append('category = ?')
+            params.append(category)
+        if date_from:
+            conditions.append('date_added >= ?')
+            params.append(_to_text(date_from))
+        if date_to:
+            conditions.append('date_added < ?')
+            params.append(_to_text(date_to))
+
+        last_key = decode_cursor(after, tag, (str, str))
+        if last_key is not None:
+            conditions.append(f'({column}, id) {">" if direction == "ASC" else "<"} (?, ?)')
+            params += last_key
+
+        sql = (f'SELECT id, title, substr(description, 1, {RecordModel.PREVIEW_CHARS}), category, '
+               f'date_added, status, length(description) > {RecordModel.PREVIEW_CHARS}, {column} '
+               f'FROM records WHERE {" AND ".join(conditions)} '
+               f'ORDER BY {column} {direction}, id {direction}')
+        if limit:
+            # One extra row tells whether there is a next page
+            sql += f' LIMIT {int(limit) + 1}'
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(tag, [rows[-1][7], rows[-1][0]])
+        return [Record(ObjectId(row[0]), row[1], row[2], row[3], _to_datetime(row[4]), row[5], bool(row[6]))
+                for row in rows], next_cursor, 0
+
+    def read_record(self, record_id: str, user_id: str) -> Optional[Record]:
+        """Get one of the user's stored records with its full description"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, title, description, category, date_added, status '
+                'FROM records WHERE id = ? AND user_id = ?', (record_id, user_id)
+            ).fetchone()
+        if row is None:
+            return None
+        return Record(ObjectId(row[0]), row[1], row[2], row[3], _to_datetime(row[4]), row[5])
+
+    def list_comments(self, record_id: str, after: Optional[str] = None,
+                      limit: int = 20) -> tuple[List[Comment], Optional[str]]:
+        """
+        Get one page of a record's stored comments, newest first, like CommentModel.list_comments
+
+        Returns:
+            Tuple of (comments: list of Comment, next_cursor: str or None)
+        """
+        sql = ('SELECT id, record_id, user_id, username, content, created_at, updated_at '
+               'FROM comments WHERE record_id = ?')
+        params = [record_id]
+        last_key = decode_cursor(after, 'local_comments', (str, str))
+        if last_key is not None:
+            sql += ' AND (created_at, id) < (?, ?)'
+            params += last_key
+        sql += f' ORDER BY created_at DESC, id DESC LIMIT {int(limit) + 1}'
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor('local_comments', [rows[-1][5], rows[-1][0]])
+        return [self._comment(row) for row in rows], next_cursor
+
+    def count_comments(self, record_id: str) -> int:
+        """Count a record's stored comments"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM comments WHERE record_id = ?', (record_id,)
+            ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Outbox
+    # ------------------------------------------------------------------
+
+    def enqueue(self, user_id: str, op: str, target: str, payload: Optional[dict] = None):
+        """
+        Queue a write made offline, folding it into writes already queued
+
+        A full update replaces the queued updates of the same target, a
+        partial one (set_record_fields) is merged into a queued update, an
+        edit of a comment created offline goes into its create, and deleting
+        something created offline drops its queued writes instead of
+        queueing the delete.
+
+        Args:
+            user_id: User who made the write
+            op: One of DataService's outbox operations
+            target: ID of the record or comment written
+            payload: Arguments of the write
+        """
+        payload = payload or {}
+        with self._lock, self._conn:
+            queued = {row[1]: row[0] for row in self._conn.execute(
+                'SELECT seq, op FROM outbox WHERE target = ? ORDER BY seq', (target,))}
+
+            merge_into = {
+                'set_record_fields': ('update_record', 'set_record_fields'),
+                'update_comment': ('create_comment',)
+            }.get(op, ())
+            for queued_op in merge_into:
+                if queued_op in queued:
+                    self._conn.execute(
+                        'UPDATE outbox SET payload = json_patch(payload, ?) WHERE seq = ?',
+                        (json.dumps(payload), queued[queued_op]))
+                    return
+
+            if op in ('update_record', 'update_comment'):
+                replaced = ('update_record', 'set_record_fields') if op == 'update_record' else (op,)
+                self._conn.executemany('DELETE FROM outbox WHERE seq = ?',
+                                       [(queued[name],) for name in replaced if name in queued])
+
+            elif op in ('delete_record', 'delete_comment'):
+                created = 'create_record' in queued or 'create_comment' in queued
+                self._conn.execute('DELETE FROM outbox WHERE target = ?', (target,))
+                if op == 'delete_record':
+                    # Queued comment writes on the record are moot too
+                    self._conn.execute(
+                        "DELETE FROM outbox WHERE op LIKE '%_comment' "
+                        "AND json_extract(payload, '$.record_id') = ?", (target,))
+                if created:
+                    return
+
+            self._conn.execute(
+                'INSERT INTO outbox (user_id, op, target, payload, created_at) VALUES (?, ?, ?, ?, ?)',
+                (user_id, op, target, json.dumps(payload), _to_text(datetime.utcnow()))
+            )
+
+    def pending_ops(self, user_id: str, limit: int) -> List[OutboxOp]:
+        """Get the oldest queued writes of a user"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT seq, op, target, payload FROM outbox WHERE user_id = ? ORDER BY seq LIMIT ?',
+                (user_id, limit)
+            ).fetchall()
+        return [OutboxOp(seq, op, target, json.loads(payload)) for seq, op, target, payload in rows]
+
+    def count_pending(self, user_id: str) -> int:
+        """Count a user's queued writes"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM outbox WHERE user_id = ?', (user_id,)
+            ).fetchone()[0]
+
+    def complete(self, seqs: Iterable[int]):
+        """Remove replayed (or rejected) writes from the outbox"""
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM outbox WHERE seq = ?', [(seq,) for seq in seqs])
+
+    # ------------------------------------------------------------------
+    # Helpers (call with the lock held)
+    # ------------------------------------------------------------------
+
+    def _pending_targets(self) -> set:
+        return {row[0] for row in self._conn.execute('SELECT target FROM outbox')}
+
+    def _delete_records(self, record_ids: List[str]):
+        for chunk in self._chunks(record_ids):
+            marks = self._marks(chunk)
+            self._conn.execute(f'DELETE FROM comments WHERE record_id IN ({marks})', chunk)
+            self._conn.execute(f'DELETE FROM records WHERE id IN ({marks})', chunk)
+
+    @staticmethod
+    def _chunks(ids: List[str], size: int = 500):
+        """Split IDs to stay under SQLite's bound parameter limit"""
+        ids = list(ids)
+        return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+    @staticmethod
+    def _marks(values: list) -> str:
+        return ', '.join('?' * len(values))
+
+    @staticmethod
+    def _comment(row) -> Comment:
+        return Comment(ObjectId(row[0]), ObjectId(row[1]), ObjectId(row[2]), row[3], row[4],
+                       _to_datetime(row[5]), _to_datetime(row[6]))